@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memória por transação
+
+Compara a representação anterior (dataclasses com __dict__ e ids/hashes
+em str), a representação compacta (__slots__, bytes, endereços
+internados) e o armazenamento colunar de blocos confirmados. As três
+primeiras linhas medem só os blocos; as duas últimas medem uma
+Blockchain completa (cadeia + índices por endereço e por id), que é o
+que o nó realmente mantém.
+
+Uso:
+    uv run python benchmarks/memory.py --transactions 100000
+"""
+
+import argparse
+import gc
+import hashlib
+import json
+import sys
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.blockchain_lsd import Block, Blockchain, Transaction  # noqa: E402
+from src.blockchain_lsd.columnar import ColumnarChain  # noqa: E402
+
+
+class UnminedBlockchain(Blockchain):
+    """Blockchain sem Proof of Work (o benchmark mede memória, não mineração)."""
+    DIFFICULTY = ""
+
+
+@dataclass
+class LegacyTransaction:
+    """Transação como era antes (dataclass com __dict__, id em str)."""
+    origem: str
+    destino: str
+    valor: float
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    timestamp: float = field(default_factory=time.time)
+
+
+@dataclass
+class LegacyBlock:
+    """Bloco como era antes (dataclass com __dict__, hashes em str)."""
+    index: int
+    previous_hash: str
+    transactions: list[LegacyTransaction]
+    nonce: int = 0
+    timestamp: float = field(default_factory=time.time)
+    hash: str = ""
+
+
+def make_rows(transactions: int, per_block: int, addresses: int) -> list[str]:
+    """Gera as transações de cada bloco em JSON (como chegam da rede)."""
+    blocks = []
+    for start in range(0, transactions, per_block):
+        blocks.append(json.dumps([
+            {
+                "id": str(uuid.uuid4()),
+                "origem": f"addr{i % addresses}",
+                "destino": f"addr{(i * 7 + 1) % addresses}",
+                "valor": 1.5,
+                "timestamp": time.time(),
+            }
+            for i in range(start, min(start + per_block, transactions))
+        ]))
+    return blocks
+
+
+def fake_hash(height: int) -> str:
+    return hashlib.sha256(str(height).encode()).hexdigest()
+
+
+def build_legacy(rows: list[str]) -> list:
+    return [
+        LegacyBlock(
+            index=height + 1,
+            previous_hash=fake_hash(height),
+            transactions=[LegacyTransaction(**data) for data in json.loads(block_rows)],
+            nonce=height,
+            hash=fake_hash(height + 1),
+        )
+        for height, block_rows in enumerate(rows)
+    ]
+
+
+def build_slots(rows: list[str]) -> list:
+    return [
+        Block(
+            index=height + 1,
+            previous_hash=fake_hash(height),
+            transactions=[Transaction.from_dict(data) for data in json.loads(block_rows)],
+            nonce=height,
+            hash=fake_hash(height + 1),
+        )
+        for height, block_rows in enumerate(rows)
+    ]
+
+
+def build_columnar(rows: list[str]) -> tuple:
+    columns = ColumnarChain(start_height=1)
+    views = [columns.append(block) for block in build_slots(rows)]
+    return columns, views
+
+
+def build_blockchain(rows: list[str], columnar: bool) -> Blockchain:
+    blockchain = UnminedBlockchain(columnar=columnar)
+    for block_rows in rows:
+        last = blockchain.last_block
+        block = Block(
+            index=last.index + 1,
+            previous_hash=last.hash,
+            transactions=[Transaction.from_dict(data) for data in json.loads(block_rows)],
+        )
+        if not blockchain.add_block(block):
+            raise RuntimeError(f"Bloco #{block.index} recusado")
+    return blockchain
+
+
+def measure(build, rows) -> int:
+    """Bytes mantidos pela estrutura construída (decodificando o JSON)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(rows)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memória por transação")
+    parser.add_argument("--transactions", type=int, default=100_000)
+    parser.add_argument("--per-block", type=int, default=100)
+    parser.add_argument("--addresses", type=int, default=1000)
+    args = parser.parse_args()
+    
+    rows = make_rows(args.transactions, args.per_block, args.addresses)
+    print(f"{args.transactions} transações, {args.per_block} por bloco, "
+          f"{args.addresses} endereços\n")
+    print(f"{'Representação':<28}{'Total (MB)':>12}{'Bytes/tx':>12}")
+    
+    baseline = None
+    for name, build in [
+        ("dataclass (anterior)", build_legacy),
+        ("__slots__ + bytes", build_slots),
+        ("colunar", build_columnar),
+        ("Blockchain()", lambda rows: build_blockchain(rows, columnar=False)),
+        ("Blockchain(columnar=True)", lambda rows: build_blockchain(rows, columnar=True)),
+    ]:
+        used = measure(build, rows)
+        baseline = baseline or used
+        print(f"{name:<28}{used / 1e6:>12.1f}{used / args.transactions:>12.0f}"
+              f"   ({used / baseline:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,7 @@ import argparse
 import threading
 import time
 
-from src.blockchain_lsd import Node, Transaction
+from src.blockchain_lsd import Blockchain, BlockHeader, Node, LightNode, RPCServer, Transaction
 
 
 def parse_args():
@@ -34,7 +34,83 @@ def parse_args():
         default=[],
         help="Endereços de nós bootstrap (ex: localhost:5001)"
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--light",
+        nargs="+",
+        metavar="ENDERECO",
+        help="Modo cliente leve: guarda só cabeçalhos e observa estes endereços"
+    )
+    parser.add_argument(
+        "--prune",
+        type=int,
+        metavar="N",
+        help="Modo de poda: mantém só os últimos N blocos completos"
+    )
+    parser.add_argument(
+        "--prune-budget",
+        type=int,
+        metavar="BYTES",
+        help="Orçamento aproximado (estimativa por bloco/transação) para blocos completos na poda"
+    )
+    parser.add_argument(
+        "--archive-dir",
+        help="Diretório para arquivar os blocos podados (recriado a cada início)"
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Guarda os blocos confirmados em colunas compactas (menos memória)"
+    )
+    parser.add_argument(
+        "--snapshot-bootstrap",
+        action="store_true",
+        help="Inicializa a partir de snapshot dos bootstrap (histórico verificado depois)"
+    )
+    parser.add_argument(
+        "--snapshot-key",
+        help="Chave compartilhada para assinar/verificar snapshots"
+    )
+    parser.add_argument(
+        "--mine",
+        action="store_true",
+        help="Minera continuamente em segundo plano"
+    )
+    parser.add_argument(
+        "--mining-threads",
+        type=int,
+        default=1,
+        help="Threads da mineração contínua; sob o GIL não aumentam a taxa de hashes (default: 1)"
+    )
+    parser.add_argument(
+        "--mining-duty-cycle",
+        type=float,
+        default=1.0,
+        help="Fração do tempo gasta minerando, entre 0 e 1 (default: 1.0)"
+    )
+    parser.add_argument(
+        "--max-block-txs",
+        type=int,
+        help="Máximo de transações por bloco minerado (default: todo o pool)"
+    )
+    parser.add_argument(
+        "--rpc-port",
+        type=int,
+        help="Porta da API JSON-RPC local (desativada por padrão)"
+    )
+    parser.add_argument(
+        "--no-rate-limit",
+        action="store_true",
+        help="Desativa os limites de taxa por peer (testes de carga)"
+    )
+    parser.add_argument(
+        "--capture",
+        metavar="ARQUIVO",
+        help="Grava as mensagens recebidas para replay (src.blockchain_lsd.replay)"
+    )
+    args = parser.parse_args()
+    if args.max_block_txs is not None and args.max_block_txs < 1:
+        parser.error("--max-block-txs deve ser pelo menos 1")
+    return args
 
 
 def print_menu():
@@ -49,6 +125,9 @@ def print_menu():
     print("6. Ver peers conectados")
     print("7. Conectar a peer")
     print("8. Sincronizar blockchain")
+    print("9. Mineração contínua (iniciar/parar/status)")
+    print("10. Ver histórico de endereço")
+    print("11. Exportar snapshot")
     print("0. Sair")
     print("=" * 50)
 
@@ -68,6 +147,11 @@ def create_transaction(node: Node):
 
 def show_pending(node: Node):
     print("\n--- Transações Pendentes ---")
+    if isinstance(node, LightNode):
+        for tx in node.unconfirmed.values():
+            print(f"  [{tx.id[:8]}...] {tx.origem} -> {tx.destino}: {tx.valor}")
+        return
+    
     if not node.blockchain.pending_transactions:
         print("Nenhuma transação pendente.")
         return
@@ -96,11 +180,20 @@ def mine_block(node: Node):
 
 def show_blockchain(node: Node):
     print("\n--- Blockchain ---")
+    if isinstance(node, LightNode):
+        print(f"Cliente leve: {len(node.headers)} cabeçalhos")
+        for header in node.headers[-10:]:
+            print(f"  [Bloco #{header.index}] {header.hash[:32]}...")
+        return
+    
     for block in node.blockchain.chain:
         print(f"\n[Bloco #{block.index}]")
         print(f"  Hash: {block.hash[:32]}...")
         print(f"  Previous: {block.previous_hash[:32]}...")
         print(f"  Nonce: {block.nonce}")
+        if isinstance(block, BlockHeader):
+            print("  Transações: (bloco podado)")
+            continue
         print(f"  Transações: {len(block.transactions)}")
         for tx in block.transactions:
             print(f"    - {tx.origem} -> {tx.destino}: {tx.valor}")
@@ -108,10 +201,33 @@ def show_blockchain(node: Node):
 
 def show_balance(node: Node):
     address = input("\nEndereço: ").strip()
-    balance = node.blockchain.get_balance(address)
+    if isinstance(node, LightNode):
+        balance = node.get_balance(address)
+    else:
+        balance = node.blockchain.get_balance(address)
     print(f"Saldo de {address}: {balance}")
 
 
+def show_history(node: Node):
+    address = input("\nEndereço: ").strip()
+    if isinstance(node, LightNode):
+        for height, tx in node.get_history(address):
+            print(f"  [#{height}] {tx.origem} -> {tx.destino}: {tx.valor}")
+        return
+    
+    total = node.blockchain.count_history(address)
+    print(f"\n--- Histórico de {address} ({total} transações) ---")
+    
+    page_size = 20
+    offset = 0
+    while offset < total:
+        for height, position, tx in node.blockchain.get_history(address, offset, page_size):
+            print(f"  [#{height}:{position}] {tx.origem} -> {tx.destino}: {tx.valor}")
+        offset += page_size
+        if offset < total and input("Próxima página? (S/n): ").strip().lower() == "n":
+            break
+
+
 def show_peers(node: Node):
     print("\n--- Peers Conectados ---")
     if not node.peers:
@@ -120,6 +236,7 @@ def show_peers(node: Node):
     
     for peer in node.peers:
         print(f"  - {peer}")
+    print(f"Catálogo passivo: {len(node.peer_manager.passive)} endereços")
 
 
 def connect_peer(node: Node):
@@ -133,15 +250,73 @@ def connect_peer(node: Node):
 def sync_chain(node: Node):
     print("\n🔄 Sincronizando blockchain...")
     node.sync_blockchain()
-    print(f"✓ Blockchain com {len(node.blockchain.chain)} blocos")
+    if isinstance(node, LightNode):
+        print(f"✓ Cliente leve com {len(node.headers)} cabeçalhos")
+    else:
+        print(f"✓ Blockchain com {len(node.blockchain.chain)} blocos")
+
+
+def toggle_mining_service(node: Node, args):
+    service = node.mining_service
+    if not service:
+        node.start_mining_service(
+            threads=args.mining_threads,
+            duty_cycle=args.mining_duty_cycle,
+            max_block_transactions=args.max_block_txs,
+        )
+        print("✓ Mineração contínua iniciada")
+        return
+    
+    stats = service.get_stats()
+    print("\n--- Mineração Contínua ---")
+    print(f"  Threads: {service.threads} | Duty cycle: {service.duty_cycle:.0%}")
+    print(
+        f"  Templates: {stats['templates']} ({stats['mempool_templates']} por transações novas) | "
+        f"Blocos encontrados: {stats['blocks_found']}"
+    )
+    print(f"  Hashes: {stats['hashes']}")
+    print(
+        f"  Trabalho obsoleto: último {stats['stale_work_last'] * 1000:.2f}ms, "
+        f"médio {stats['stale_work_avg'] * 1000:.2f}ms, "
+        f"máximo {stats['stale_work_max'] * 1000:.2f}ms"
+    )
+    if input("Parar mineração contínua? (s/N): ").strip().lower() == "s":
+        node.stop_mining_service()
+        print("✓ Mineração contínua parada")
+
+
+def export_snapshot(node: Node):
+    path = input("\nArquivo de destino: ").strip() or "snapshot.json"
+    try:
+        node.export_snapshot(path)
+        print(f"✓ Snapshot gravado em {path}")
+    except OSError as e:
+        print(f"✗ Erro: {e}")
 
 
 def main():
     args = parse_args()
     
     # Cria e inicia o nó
-    node = Node(host=args.host, port=args.port)
+    if args.light:
+        node = LightNode(host=args.host, port=args.port, addresses=args.light)
+    else:
+        blockchain = Blockchain(
+            prune_keep=args.prune,
+            memory_budget=args.prune_budget,
+            archive_dir=args.archive_dir,
+            columnar=args.columnar,
+        )
+        node = Node(host=args.host, port=args.port, blockchain=blockchain)
+    node.snapshot_key = args.snapshot_key
+    node.rate_limiter.enabled = not args.no_rate_limit
+    node.miner.max_block_transactions = args.max_block_txs
     node.start()
+    if args.capture:
+        if args.light:
+            print("✗ Gravação de mensagens indisponível no modo cliente leve")
+        else:
+            node.start_capture(args.capture)
     
     # Conecta aos nós bootstrap
     for bootstrap in args.bootstrap:
@@ -150,7 +325,23 @@ def main():
     
     # Sincroniza blockchain se tiver peers
     if node.peers:
-        node.sync_blockchain()
+        if not (args.snapshot_bootstrap and node.bootstrap_from_snapshot()):
+            node.sync_blockchain()
+    
+    rpc_server = None
+    if args.rpc_port is not None:
+        if args.light:
+            print("✗ API JSON-RPC indisponível no modo cliente leve")
+        else:
+            rpc_server = RPCServer(node.blockchain, host=args.host, port=args.rpc_port)
+            rpc_server.start()
+    
+    if args.mine:
+        node.start_mining_service(
+            threads=args.mining_threads,
+            duty_cycle=args.mining_duty_cycle,
+            max_block_transactions=args.max_block_txs,
+        )
     
     # Loop principal
     try:
@@ -175,6 +366,12 @@ def main():
                     connect_peer(node)
                 case "8":
                     sync_chain(node)
+                case "9":
+                    toggle_mining_service(node, args)
+                case "10":
+                    show_history(node)
+                case "11":
+                    export_snapshot(node)
                 case "0":
                     print("Encerrando...")
                     break
@@ -185,6 +382,8 @@ def main():
         print("\nInterrompido pelo usuário")
     
     finally:
+        if rpc_server:
+            rpc_server.stop()
         node.stop()
 
 
@@ -3,20 +3,37 @@ Blockchain LSD - Criptomoeda Distribuída Simplificada
 UFPA - Laboratório de Sistemas Distribuídos
 """
 
-from .block import Block
+from .block import Block, BlockHeader, LazyBlock
 from .blockchain import Blockchain
+from .snapshot import LedgerSnapshot, ChainSnapshot
 from .transaction import Transaction
+from .bloom import BloomFilter
+from .events import Event, EventBus, EventType
 from .node import Node
+from .light_client import LightNode
 from .miner import Miner
+from .mining_service import MiningService
 from .protocol import Protocol, MessageType
+from .rpc import RPCServer
 
 __version__ = "0.1.0"
 __all__ = [
     "Block",
+    "BlockHeader",
+    "LazyBlock",
     "Blockchain",
+    "LedgerSnapshot",
+    "ChainSnapshot",
     "Transaction",
+    "BloomFilter",
+    "Event",
+    "EventBus",
+    "EventType",
     "Node",
+    "LightNode",
     "Miner",
+    "MiningService",
     "Protocol",
     "MessageType",
+    "RPCServer",
 ]
@@ -0,0 +1,328 @@
+"""
+Módulo de Análise da Cadeia (colunas NumPy e operações vetorizadas)
+
+Requer numpy (dependência opcional):
+    uv sync --extra analytics
+"""
+
+import threading
+from typing import TYPE_CHECKING
+
+try:
+    import numpy as np
+except ImportError:  # Dependência opcional
+    np = None
+
+from .block import Block
+from .events import Event, EventType, Subscription
+
+if TYPE_CHECKING:
+    from .blockchain import Blockchain
+
+
+class ChainAnalytics:
+    """
+    Transações confirmadas em colunas NumPy para consultas agregadas.
+    
+    Colunas por transação: altura, origem e destino (índices na tabela de
+    endereços), valor e timestamp. As linhas ficam em ordem de altura, então
+    "até a altura H" é apenas um prefixo das colunas e saldos, rich list e
+    fluxos saem de bincount/cumsum sobre todos os endereços de uma vez.
+    
+    As colunas crescem por blocos (append_block) e são cortadas em
+    reorganizações (truncate). attach() acompanha uma Blockchain pelos
+    eventos NEW_BLOCK/REORG.
+    """
+    
+    INITIAL_CAPACITY = 1024
+    
+    def __init__(self):
+        if np is None:
+            raise ImportError("ChainAnalytics requer numpy (uv sync --extra analytics)")
+        
+        self.addresses: list[str] = []
+        self._address_ids: dict[str, int] = {}
+        
+        # Colunas com capacidade extra; apenas [:size] é válido
+        self.size = 0
+        self._heights = np.empty(self.INITIAL_CAPACITY, dtype=np.int64)
+        self._origins = np.empty(self.INITIAL_CAPACITY, dtype=np.int64)
+        self._destinations = np.empty(self.INITIAL_CAPACITY, dtype=np.int64)
+        self._values = np.empty(self.INITIAL_CAPACITY, dtype=np.float64)
+        self._timestamps = np.empty(self.INITIAL_CAPACITY, dtype=np.float64)
+        
+        # Por bloco: linha da primeira transação (mais o fim) e hash
+        self._offsets: list[int] = [0]
+        self._hashes: list[str] = []
+        
+        self._lock = threading.RLock()
+        self._subscription: Subscription | None = None
+    
+    @classmethod
+    def from_blockchain(cls, blockchain: "Blockchain") -> "ChainAnalytics":
+        """Exporta a cadeia inteira para colunas."""
+        analytics = cls()
+        analytics.sync(blockchain)
+        return analytics
+    
+    @property
+    def height(self) -> int:
+        """Altura do último bloco carregado (-1 se vazio)."""
+        return len(self._hashes) - 1
+    
+    # Atualização incremental
+    
+    def append_block(self, block: Block):
+        """Acrescenta as transações do próximo bloco."""
+        if not isinstance(block, Block):
+            raise ValueError(f"Bloco #{block.index} podado: análise requer os corpos dos blocos")
+        self._append_rows(block.index, block.hash, block._transaction_dicts())
+    
+    def _append_rows(self, index: int, block_hash: str, rows: list[dict]):
+        """Acrescenta as transações (dicionários) do bloco index."""
+        with self._lock:
+            if index != self.height + 1:
+                raise ValueError(f"Bloco #{index} fora de ordem (esperado #{self.height + 1})")
+            
+            self._reserve(self.size + len(rows))
+            start, end = self.size, self.size + len(rows)
+            self._heights[start:end] = index
+            self._origins[start:end] = [self._address_id(tx["origem"]) for tx in rows]
+            self._destinations[start:end] = [self._address_id(tx["destino"]) for tx in rows]
+            self._values[start:end] = [tx["valor"] for tx in rows]
+            self._timestamps[start:end] = [tx["timestamp"] for tx in rows]
+            
+            self.size = end
+            self._offsets.append(end)
+            self._hashes.append(block_hash)
+    
+    def truncate(self, height: int):
+        """Descarta os blocos com altura >= height (reorganização)."""
+        with self._lock:
+            height = max(height, 0)
+            if height > self.height:
+                return
+            self.size = self._offsets[height]
+            del self._offsets[height + 1:]
+            del self._hashes[height:]
+    
+    def sync(self, blockchain: "Blockchain"):
+        """
+        Alinha as colunas com a cadeia (corta divergências e acrescenta o que falta).
+        
+        Sob blockchain.lock apenas copia o que falta (transações como
+        dicionários, ou as colunas da cadeia); a conversão para NumPy é
+        feita depois, sem travar a cadeia.
+        """
+        with blockchain.lock, self._lock:
+            chain = blockchain.chain
+            height = min(self.height, len(chain) - 1)
+            while height >= 0 and self._hashes[height] != chain[height].hash:
+                height -= 1
+            self.truncate(height + 1)
+            
+            exported = self._export_columns(blockchain) if self.size == 0 else None
+            if exported is None:
+                missing = chain[self.height + 1:]
+                for block in missing:
+                    if not isinstance(block, Block):
+                        raise ValueError(
+                            f"Bloco #{block.index} podado: análise requer os corpos dos blocos"
+                        )
+                missing = [
+                    (block.index, block.hash, list(block._transaction_dicts())) for block in missing
+                ]
+        
+        with self._lock:
+            # Ignora o que outra chamada concorrente já tiver carregado
+            if exported is not None:
+                if self.size == 0:
+                    self._load_columns(*exported)
+                return
+            for index, block_hash, rows in missing:
+                if index == self.height + 1:
+                    self._append_rows(index, block_hash, rows)
+    
+    def attach(self, blockchain: "Blockchain"):
+        """Acompanha a cadeia pelos eventos (entregues fora da thread de rede)."""
+        self.sync(blockchain)
+        
+        def on_event(event: Event):
+            with self._lock:
+                if event.type == EventType.REORG:
+                    self.truncate(event.data["fork_height"] + 1)
+                    return
+                if (
+                    event.data.index == self.height + 1
+                    and self._hashes
+                    and event.data.previous_hash == self._hashes[-1]
+                ):
+                    self.append_block(event.data)
+                    return
+                index = event.data.index
+                if index <= self.height and self._hashes[index] == event.data.hash:
+                    return  # Já carregado
+            # Eventos perdidos (fila cheia) ou bloco de outro ramo; fora de
+            # _lock, pois sync() trava a cadeia antes das colunas
+            self.sync(blockchain)
+        
+        self._subscription = blockchain.events.subscribe(
+            on_event, types=(EventType.NEW_BLOCK, EventType.REORG)
+        )
+    
+    def detach(self, blockchain: "Blockchain"):
+        """Para de acompanhar a cadeia."""
+        if self._subscription is not None:
+            blockchain.events.unsubscribe(self._subscription)
+            self._subscription = None
+    
+    # Consultas
+    
+    def balances_at(self, height: int | None = None) -> "np.ndarray":
+        """Saldo de todos os endereços (na ordem de addresses) até a altura."""
+        with self._lock:
+            end = self._end(height)
+            count = len(self.addresses)
+            received = np.bincount(self._destinations[:end], self._values[:end], minlength=count)
+            sent = np.bincount(self._origins[:end], self._values[:end], minlength=count)
+        return received - sent
+    
+    def balances(self, height: int | None = None) -> dict[str, float]:
+        """Saldos de todos os endereços até a altura (padrão: topo)."""
+        balances = self.balances_at(height)
+        return {address: float(balance) for address, balance in zip(self.addresses, balances)}
+    
+    def rich_list(self, limit: int = 100, height: int | None = None) -> list[tuple[str, float]]:
+        """Maiores saldos até a altura, em ordem decrescente."""
+        balances = self.balances_at(height)
+        limit = min(limit, len(balances))
+        if limit <= 0:
+            return []
+        
+        top = np.argpartition(-balances, limit - 1)[:limit]
+        top = top[np.argsort(-balances[top], kind="stable")]
+        return [(self.addresses[i], float(balances[i])) for i in top]
+    
+    def balance_history(self, address: str) -> "np.ndarray":
+        """Saldo do endereço ao fim de cada altura (índice = altura)."""
+        with self._lock:
+            heights = self._heights[:self.size]
+            values = self._values[:self.size]
+            address_id = self._address_ids.get(address, -1)
+            delta = (
+                np.where(self._destinations[:self.size] == address_id, values, 0.0)
+                - np.where(self._origins[:self.size] == address_id, values, 0.0)
+            )
+            return np.cumsum(np.bincount(heights, delta, minlength=self.height + 1))
+    
+    def volume(self, start: int = 0, end: int | None = None) -> tuple["np.ndarray", "np.ndarray"]:
+        """Valor total e número de transações por altura em [start, end]."""
+        with self._lock:
+            first, last = self._offsets[max(start, 0)], self._end(end)
+            heights = self._heights[first:last] - start
+            size = max((self.height if end is None else end) - start + 1, 0)
+            values = np.bincount(heights, self._values[first:last], minlength=size)
+            counts = np.bincount(heights, minlength=size)
+        return values, counts
+    
+    def flows(
+        self, start: int = 0, end: int | None = None, limit: int | None = 100
+    ) -> list[tuple[str, str, float, int]]:
+        """
+        Fluxos de valor agregados por par (origem, destino) em [start, end].
+        
+        Returns:
+            (origem, destino, valor total, transações), maior valor primeiro
+        """
+        with self._lock:
+            first, last = self._offsets[max(start, 0)], self._end(end)
+            count = len(self.addresses)
+            pairs = self._origins[first:last] * count + self._destinations[first:last]
+            values = self._values[first:last]
+        
+        keys, inverse = np.unique(pairs, return_inverse=True)
+        totals = np.bincount(inverse, values)
+        counts = np.bincount(inverse)
+        order = np.argsort(-totals, kind="stable")[:limit]
+        return [
+            (self.addresses[keys[i] // count], self.addresses[keys[i] % count],
+             float(totals[i]), int(counts[i]))
+            for i in order
+        ]
+    
+    def memory_usage(self) -> int:
+        """Bytes ocupados pelas colunas (incluindo a capacidade extra)."""
+        return sum(
+            column.nbytes for column in
+            (self._heights, self._origins, self._destinations, self._values, self._timestamps)
+        )
+    
+    # Internos
+    
+    def _end(self, height: int | None) -> int:
+        """Linha final (exclusiva) das transações até a altura (com lock)."""
+        if height is None or height >= self.height:
+            return self.size
+        return self._offsets[max(height + 1, 0)]
+    
+    def _address_id(self, address: str) -> int:
+        """Índice do endereço na tabela (acrescenta se novo)."""
+        address_id = self._address_ids.get(address)
+        if address_id is None:
+            address_id = self._address_ids[address] = len(self.addresses)
+            self.addresses.append(address)
+        return address_id
+    
+    def _reserve(self, size: int):
+        """Garante capacidade para size linhas (dobrando as colunas)."""
+        capacity = len(self._values)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ("_heights", "_origins", "_destinations", "_values", "_timestamps"):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+    
+    @staticmethod
+    def _export_columns(blockchain: "Blockchain") -> tuple | None:
+        """
+        Cópia das colunas do armazenamento colunar da cadeia (chamar com
+        blockchain.lock), ou None se a cadeia não estiver toda em colunas.
+        
+        As colunas são copiadas em vez de lidas com np.frombuffer: enquanto
+        houver uma visão do buffer, a cadeia não consegue crescer o array
+        (BufferError em add_block).
+        """
+        columns = blockchain.columns
+        if columns is None or columns.start_height != 0 or len(columns) != len(blockchain.chain):
+            return None
+        exported = columns.transaction_columns()
+        if exported is None:
+            return None
+        
+        addresses, *arrays = exported
+        hashes = [block.hash for block in blockchain.chain]
+        return list(addresses), hashes, *(np.array(column) for column in arrays)
+    
+    def _load_columns(self, addresses, hashes, offsets, origins, destinations, values, timestamps):
+        """
+        Carga em lote a partir das colunas copiadas da cadeia, sem montar
+        as transações bloco a bloco.
+        """
+        size = int(offsets[-1])
+        self._reserve(size)
+        
+        self.addresses = addresses
+        self._address_ids = {address: i for i, address in enumerate(self.addresses)}
+        self._heights[:size] = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+        self._origins[:size] = origins
+        self._destinations[:size] = destinations
+        self._values[:size] = values
+        self._timestamps[:size] = timestamps
+        
+        self.size = size
+        self._offsets = offsets.tolist()
+        self._hashes = hashes
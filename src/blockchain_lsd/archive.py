@@ -0,0 +1,75 @@
+"""
+Módulo de Arquivo de Blocos em Disco
+"""
+
+import json
+import os
+from array import array
+
+from .block import Block, LazyBlock
+
+
+class BlockArchive:
+    """
+    Arquivo em disco (JSON Lines) com os blocos podados da memória.
+    
+    Mantém em memória apenas o deslocamento de cada bloco no arquivo,
+    permitindo servir faixas antigas da cadeia aos peers. Os blocos são
+    lidos como LazyBlock, então as transações voltam exatamente como
+    foram gravadas (campos extras incluídos) e o hash confere no peer.
+    
+    É um arquivo de trabalho, não persistência: a cadeia em memória sempre
+    recomeça do gênesis (ou de um snapshot), então o arquivo é esvaziado a
+    cada início e preenchido de novo conforme a poda avança.
+    """
+    
+    FILENAME = "blocks.jsonl"
+    
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, self.FILENAME)
+        
+        # A cadeia em memória sempre começa do gênesis: recomeça o arquivo
+        self.reset()
+    
+    def __len__(self) -> int:
+        return len(self._offsets)
+    
+    def reset(self, start_height: int = 0):
+        """
+        Esvazia o arquivo; o próximo bloco gravado terá altura start_height.
+        
+        Nós inicializados por snapshot não têm os blocos anteriores a ele.
+        """
+        self.start_height = start_height
+        self._offsets = array("q")  # altura - start_height -> deslocamento
+        open(self.path, "w").close()
+    
+    def append(self, block: Block):
+        """Grava o próximo bloco no arquivo."""
+        if block.index != self.start_height + len(self._offsets):
+            raise ValueError("Bloco fora de ordem para o arquivo")
+        
+        with open(self.path, "ab") as f:
+            self._offsets.append(f.tell())
+            f.write(block.encode() + b"\n")
+    
+    def get(self, height: int) -> Block | None:
+        """Lê um bloco arquivado pela altura."""
+        position = height - self.start_height
+        if not 0 <= position < len(self._offsets):
+            return None
+        
+        with open(self.path, "rb") as f:
+            f.seek(self._offsets[position])
+            return LazyBlock.from_dict(json.loads(f.readline()))
+    
+    def get_range(self, start: int, end: int) -> list[Block]:
+        """Lê os blocos arquivados com altura em [start, end)."""
+        end = min(end, self.start_height + len(self._offsets))
+        if start < self.start_height or start >= end:
+            return []
+        
+        with open(self.path, "rb") as f:
+            f.seek(self._offsets[start - self.start_height])
+            return [LazyBlock.from_dict(json.loads(f.readline())) for _ in range(start, end)]
@@ -0,0 +1,105 @@
+"""
+Módulo de Controle de Carga (limites de taxa por peer)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from .protocol import MessageType
+
+
+class TokenBucket:
+    """
+    Balde de fichas: permite rajadas de até `burst` mensagens e uma
+    taxa sustentada de `rate` mensagens por segundo.
+    """
+    
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+    
+    def consume(self, amount: float = 1.0) -> float:
+        """
+        Tenta consumir fichas.
+        
+        Returns:
+            0 se permitido, ou quantos segundos esperar até haver fichas
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    Limites de taxa por peer e por tipo de mensagem.
+    
+    Cada peer tem um balde global e um balde por tipo de mensagem. Peers
+    inativos são esquecidos (LRU) para limitar a memória usada. Com
+    enabled=False todas as mensagens são permitidas (ex.: replay).
+    """
+    
+    # Tipo de mensagem -> (taxa por segundo, rajada)
+    DEFAULT_LIMITS: dict[MessageType, tuple[float, float]] = {
+        MessageType.NEW_TRANSACTION: (50, 100),
+        MessageType.NEW_BLOCK: (10, 20),
+        MessageType.REQUEST_CHAIN: (1, 3),
+        MessageType.REQUEST_SNAPSHOT: (0.2, 2),
+        MessageType.REQUEST_BLOCKS: (20, 40),
+        MessageType.REQUEST_HEADERS: (20, 40),
+    }
+    DEFAULT_TYPE_LIMIT = (20, 50)
+    PEER_LIMIT = (100, 200)
+    MAX_TRACKED_PEERS = 1024
+    
+    def __init__(
+        self,
+        limits: dict[MessageType, tuple[float, float]] | None = None,
+        peer_limit: tuple[float, float] | None = None,
+    ):
+        self.limits = dict(self.DEFAULT_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self.peer_limit = peer_limit or self.PEER_LIMIT
+        
+        self._buckets: OrderedDict[str, dict[MessageType | None, TokenBucket]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.enabled = True
+    
+    def check(self, peer: str, message_type: MessageType) -> float:
+        """
+        Registra uma mensagem do peer.
+        
+        Returns:
+            0 se permitida, ou o tempo sugerido de espera (retry_after)
+        """
+        if not self.enabled:
+            return 0.0
+        
+        with self._lock:
+            buckets = self._buckets.get(peer)
+            if buckets is None:
+                buckets = {None: TokenBucket(*self.peer_limit)}
+                self._buckets[peer] = buckets
+                if len(self._buckets) > self.MAX_TRACKED_PEERS:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(peer)
+            
+            bucket = buckets.get(message_type)
+            if bucket is None:
+                limit = self.limits.get(message_type, self.DEFAULT_TYPE_LIMIT)
+                bucket = buckets[message_type] = TokenBucket(*limit)
+            
+            wait = bucket.consume()
+            if wait:
+                return wait
+            return buckets[None].consume()
@@ -5,13 +5,60 @@ Módulo de Blocos
 import hashlib
 import json
 import time
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import Any
 
+from .compact import pack_hash, unpack_hash
+from .merkle import merkle_root
 from .transaction import Transaction
 
 
-@dataclass
+@dataclass(slots=True)
+class BlockHeader:
+    """
+    Cabeçalho de um bloco (sem as transações).
+    
+    Usado por clientes leves, que guardam apenas os cabeçalhos.
+    O merkle_root permite verificar provas de inclusão de transações, mas
+    não entra no hash do bloco: vale apenas o que o nó que o informou
+    declarar. O hash também não pode ser recalculado sem as transações,
+    então is_valid_hash() confere só o prefixo do hash informado.
+    """
+    index: int
+    previous_hash: str
+    nonce: int
+    timestamp: float
+    hash: str
+    merkle_root: str = ""
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Converte cabeçalho para dicionário (serialização JSON)."""
+        return {
+            "index": self.index,
+            "previous_hash": self.previous_hash,
+            "nonce": self.nonce,
+            "timestamp": self.timestamp,
+            "hash": self.hash,
+            "merkle_root": self.merkle_root,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "BlockHeader":
+        """Cria cabeçalho a partir de dicionário."""
+        return cls(
+            index=data["index"],
+            previous_hash=data["previous_hash"],
+            nonce=data["nonce"],
+            timestamp=data["timestamp"],
+            hash=data["hash"],
+            merkle_root=data.get("merkle_root", ""),
+        )
+    
+    def is_valid_hash(self, difficulty: str = "000") -> bool:
+        """Verifica se o hash informado atende à dificuldade (apenas o prefixo)."""
+        return self.hash.startswith(difficulty)
+
+
 class Block:
     """
     Representa um bloco na blockchain.
@@ -23,29 +70,82 @@ class Block:
     - nonce: valor para Proof of Work
     - timestamp: momento da criação
     - hash: hash do bloco atual (SHA-256)
+    
+    Representação compacta: classe com __slots__ (sem __dict__) e hashes
+    guardados em 32 bytes.
+    
+    Blocos confirmados são congelados (freeze): não mudam mais, então o
+    hash já verificado e a serialização JSON ficam em cache.
     """
-    index: int
-    previous_hash: str
-    transactions: list[Transaction]
-    nonce: int = 0
-    timestamp: float = field(default_factory=time.time)
-    hash: str = ""
     
-    def __post_init__(self):
-        """Calcula hash se não fornecido."""
-        if not self.hash:
-            self.hash = self.calculate_hash()
+    __slots__ = (
+        "index", "_previous_hash", "transactions", "nonce", "timestamp", "_hash", "_encoded",
+    )
+    
+    def __init__(
+        self,
+        index: int,
+        previous_hash: str,
+        transactions: list[Transaction],
+        nonce: int = 0,
+        timestamp: float | None = None,
+        hash: str = "",
+    ):
+        self.index = index
+        self.previous_hash = previous_hash
+        self.transactions = transactions
+        self.nonce = nonce
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self._encoded: bytes | None = None
+        # Calcula hash se não fornecido
+        self.hash = hash or self.calculate_hash()
+    
+    @property
+    def hash(self) -> str:
+        """Hash do bloco (hexadecimal)."""
+        return unpack_hash(self._hash)
+    
+    @hash.setter
+    def hash(self, value: str):
+        self._hash = pack_hash(value)
+    
+    @property
+    def previous_hash(self) -> str:
+        """Hash do bloco anterior (hexadecimal)."""
+        return unpack_hash(self._previous_hash)
+    
+    @previous_hash.setter
+    def previous_hash(self, value: str):
+        self._previous_hash = pack_hash(value)
+    
+    def __eq__(self, other):
+        if isinstance(other, Block):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+    
+    __hash__ = None  # Mutável (mineração altera nonce e hash)
+    
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(index={self.index!r}, previous_hash={self.previous_hash!r}, "
+            f"transactions={self.transactions!r}, nonce={self.nonce!r}, "
+            f"timestamp={self.timestamp!r}, hash={self.hash!r})"
+        )
     
     def calculate_hash(self) -> str:
         """
         Calcula o hash SHA-256 do bloco.
         
         O hash é baseado em todos os campos do bloco exceto o próprio hash.
+        Em um bloco congelado o hash já foi verificado e não é recalculado.
         """
+        if self.frozen:
+            return self.hash
+        
         block_data = {
             "index": self.index,
             "previous_hash": self.previous_hash,
-            "transactions": [tx.to_dict() for tx in self.transactions],
+            "transactions": self._transaction_dicts(),
             "nonce": self.nonce,
             "timestamp": self.timestamp,
         }
@@ -57,12 +157,61 @@ class Block:
         return {
             "index": self.index,
             "previous_hash": self.previous_hash,
-            "transactions": [tx.to_dict() for tx in self.transactions],
+            "transactions": self._transaction_dicts(),
             "nonce": self.nonce,
             "timestamp": self.timestamp,
             "hash": self.hash,
         }
     
+    @property
+    def frozen(self) -> bool:
+        """Indica se o bloco foi congelado (confirmado na cadeia)."""
+        return self._encoded is not None
+    
+    def freeze(self):
+        """
+        Congela o bloco ao ser aceito na cadeia.
+        
+        Guarda a serialização canônica (encode()) e faz calculate_hash()
+        reaproveitar o hash verificado. O bloco não deve mais ser alterado.
+        """
+        if self._encoded is None:
+            self._encoded = json.dumps(self.to_dict()).encode()
+    
+    def encode(self) -> bytes:
+        """JSON de to_dict() em bytes (em cache se o bloco estiver congelado)."""
+        if self._encoded is not None:
+            return self._encoded
+        return json.dumps(self.to_dict()).encode()
+    
+    def merkle_root(self) -> str:
+        """Calcula a raiz de Merkle das transações do bloco."""
+        return merkle_root([Transaction.hash_dict(tx) for tx in self._transaction_dicts()])
+    
+    def _transaction_dicts(self) -> list[dict[str, Any]]:
+        """Transações do bloco em forma de dicionário (serialização e hash)."""
+        return [tx.to_dict() for tx in self.transactions]
+    
+    def transaction(self, position: int) -> Transaction:
+        """Transação na posição do bloco (visões colunares montam só esta)."""
+        return self.transactions[position]
+    
+    def header(self, with_merkle_root: bool = True) -> BlockHeader:
+        """
+        Retorna o cabeçalho do bloco.
+        
+        O merkle_root só é necessário para clientes leves; calculá-lo exige
+        o hash de todas as transações.
+        """
+        return BlockHeader(
+            index=self.index,
+            previous_hash=self.previous_hash,
+            nonce=self.nonce,
+            timestamp=self.timestamp,
+            hash=self.hash,
+            merkle_root=self.merkle_root() if with_merkle_root else "",
+        )
+    
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Block":
         """Cria bloco a partir de dicionário."""
@@ -96,3 +245,74 @@ class Block:
     def is_valid_hash(self, difficulty: str = "000") -> bool:
         """Verifica se o hash atende à dificuldade (Proof of Work)."""
         return self.hash.startswith(difficulty)
+
+
+class LazyBlock(Block):
+    """
+    Bloco recebido da rede com decodificação preguiçosa das transações.
+    
+    Guarda as transações no formato bruto (dicionários do JSON) e só cria
+    os objetos Transaction no primeiro acesso a `transactions`. Hash,
+    raiz de Merkle e to_dict() usam o formato bruto, então um bloco pode
+    ser rejeitado ou retransmitido sem decodificar nem re-serializar as
+    transações.
+    
+    O hash cobre os dicionários brutos, não transações válidas: a
+    Blockchain decodifica as transações (e rejeita o bloco se alguma for
+    inválida) antes de aceitá-lo.
+    """
+    
+    __slots__ = ("_raw_transactions", "_transactions")
+    
+    def __init__(
+        self,
+        index: int,
+        previous_hash: str,
+        raw_transactions: list[dict[str, Any]],
+        nonce: int,
+        timestamp: float,
+        hash: str,
+    ):
+        self.index = index
+        self.previous_hash = previous_hash
+        self.nonce = nonce
+        self.timestamp = timestamp
+        self.hash = hash
+        self._encoded = None
+        self._raw_transactions: list[dict[str, Any]] | None = raw_transactions
+        self._transactions: list[Transaction] | None = None
+    
+    @property
+    def transactions(self) -> list[Transaction]:
+        """Transações do bloco (decodificadas no primeiro acesso)."""
+        if self._transactions is None:
+            self._transactions = [Transaction.from_dict(tx) for tx in self._raw_transactions]
+        return self._transactions
+    
+    @transactions.setter
+    def transactions(self, transactions: list[Transaction]):
+        self._transactions = transactions
+        self._raw_transactions = None
+    
+    @property
+    def is_decoded(self) -> bool:
+        """Indica se as transações já foram decodificadas."""
+        return self._transactions is not None
+    
+    def _transaction_dicts(self) -> list[dict[str, Any]]:
+        """Transações brutas, sem decodificar (ou serializadas se alteradas)."""
+        if self._raw_transactions is not None:
+            return self._raw_transactions
+        return super()._transaction_dicts()
+    
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LazyBlock":
+        """Cria bloco a partir de dicionário sem decodificar as transações."""
+        return cls(
+            index=data["index"],
+            previous_hash=data["previous_hash"],
+            raw_transactions=data["transactions"],
+            nonce=data["nonce"],
+            timestamp=data["timestamp"],
+            hash=data["hash"],
+        )
@@ -2,13 +2,43 @@
 Módulo da Blockchain
 """
 
-from typing import Any
-from collections import defaultdict
+import functools
+import threading
+from typing import Any, Callable
+from collections import defaultdict, deque
 
-from .block import Block
+from .archive import BlockArchive
+from .block import Block, BlockHeader
+from .columnar import ColumnarChain
+from .events import EventBus, EventType
+from .index import AddressIndex, TransactionIndex
+from .snapshot import ChainSnapshot, LedgerSnapshot
 from .transaction import Transaction
 
 
+def _locked(method: Callable) -> Callable:
+    """
+    Executa o método com a trava da cadeia (Blockchain.lock).
+    
+    Os eventos gerados pelo método são publicados depois que a trava é
+    liberada (na chamada mais externa), para que um assinante lento não
+    segure a cadeia.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        state = self._lock_state
+        with self.lock:
+            state.depth = getattr(state, "depth", 0) + 1
+            try:
+                result = method(self, *args, **kwargs)
+            finally:
+                state.depth -= 1
+        if state.depth == 0:
+            self._flush_events()
+        return result
+    return wrapper
+
+
 class Blockchain:
     """
     Gerencia a cadeia de blocos e transações pendentes.
@@ -18,33 +48,141 @@ class Blockchain:
     - Gerenciar pool de transações pendentes
     - Validar blocos e transações
     - Calcular saldos
+    - Manter índices de transações (por endereço e por id) e de blocos
+    - Podar blocos antigos (opcional)
+    
+    Modo de poda: mantém os cabeçalhos de toda a cadeia e apenas os
+    últimos prune_keep blocos completos (e/ou até memory_budget bytes
+    estimados). Os corpos podados são descartados ou gravados no arquivo
+    em archive_dir (para servir faixas antigas aos peers durante a
+    execução), e os saldos até a altura podada vêm de um snapshot do
+    livro-razão em memória.
+    
+    Modo colunar (columnar=True): os blocos confirmados ficam em colunas
+    compactas (ColumnarChain) e a cadeia guarda apenas visões leves deles.
+    
+    Mudanças (novos blocos e transações, reorganizações) são publicadas
+    em events (EventBus), entregues de forma assíncrona aos assinantes.
+    
+    Blocos aceitos são congelados (hash verificado e JSON em cache) e a
+    lista de blocos em JSON para RESPONSE_CHAIN é mantida por
+    encoded_chain(): estendida a cada bloco novo e cortada apenas no
+    ponto de divergência de uma reorganização.
+    
+    Os métodos públicos que alteram ou consultam mais de uma estrutura
+    rodam sob `lock` (RLock), então podem ser chamados de várias threads;
+    quem precisar de várias consultas consistentes entre si deve segurar
+    `lock` durante todas elas.
     """
     
     DIFFICULTY = "000"  # Hash deve começar com 000
     
-    def __init__(self):
-        self.chain: list[Block] = [Block.create_genesis()]
+    # Aproximação (não medida em tempo de execução) da memória de um bloco e
+    # de cada transação: objetos + JSON em cache, medidos com tracemalloc no
+    # Python 3.12 (~340 B por bloco, ~160 B + ~150 B por transação) e
+    # arredondados para cima. O orçamento da poda é sobre essa estimativa,
+    # não sobre a memória real do processo (índices não entram na conta).
+    ESTIMATED_BLOCK_BYTES = 500
+    ESTIMATED_TX_BYTES = 400
+    
+    def __init__(
+        self,
+        prune_keep: int | None = None,
+        memory_budget: int | None = None,
+        archive_dir: str | None = None,
+        columnar: bool = False,
+    ):
+        if prune_keep is not None and prune_keep < 1:
+            raise ValueError("Poda deve manter ao menos um bloco completo")
+        if columnar and (prune_keep is not None or memory_budget is not None):
+            raise ValueError("Modo colunar não pode ser combinado com poda")
+        
+        self.columns = ColumnarChain() if columnar else None
+        
+        # Abaixo de pruned_height a cadeia guarda apenas cabeçalhos
+        self.chain: list[Block | BlockHeader] = [self._store(Block.create_genesis())]
         self.pending_transactions: list[Transaction] = []
+        self.address_index = AddressIndex()
+        self.tx_index = TransactionIndex()
+        self.tx_index.add_block(self.chain[0])
+        
+        self.prune_keep = prune_keep
+        self.memory_budget = memory_budget
+        self.pruned_height = 0
+        self.ledger_snapshot = LedgerSnapshot()
+        # Transações com timestamp até aqui são recusadas (cadeia vinda de
+        # snapshot, sem os ids das transações abaixo da base)
+        self.replay_floor = 0.0
+        self.archive = BlockArchive(archive_dir) if archive_dir else None
+        self._body_bytes = self._estimate_size(self.chain[0])
+        self.events = EventBus()
+        
+        # Cadeia em JSON ("[bloco, bloco, ...", sem o "]") e fim de cada bloco
+        self._encoded_chain = bytearray(b"[")
+        self._encoded_ends: list[int] = []
+        
+        # Trava única da cadeia: toda alteração (handlers do nó, mineração,
+        # sincronização, verificação de snapshot) e as leituras compostas
+        # (RPC, exportação) passam por ela
+        self.lock = threading.RLock()
+        self._lock_state = threading.local()  # Profundidade de _locked por thread
+        
+        # Eventos gerados sob a trava, publicados em ordem após liberá-la
+        self._outbox: deque[tuple[EventType, Any]] = deque()
+        self._publish_lock = threading.Lock()
     
     @property
     def last_block(self) -> Block:
         """Retorna o último bloco da cadeia."""
         return self.chain[-1]
     
+    @property
+    def pruning_enabled(self) -> bool:
+        """Indica se o modo de poda está configurado."""
+        return self.prune_keep is not None or self.memory_budget is not None
+    
+    @property
+    def is_pruned(self) -> bool:
+        """Indica se algum bloco já teve o corpo podado."""
+        return self.pruned_height > 0
+    
+    def get_block(self, height: int) -> Block | None:
+        """Retorna o bloco completo da altura (memória ou arquivo em disco)."""
+        blocks = self.get_blocks(height, height + 1)
+        return blocks[0] if blocks else None
+    
+    @_locked
+    def get_blocks(self, start: int, end: int) -> list[Block]:
+        """
+        Retorna os blocos completos com altura em [start, end).
+        
+        Blocos podados vêm do arquivo em disco; a lista para no primeiro
+        bloco indisponível.
+        """
+        start = max(start, 0)
+        end = min(end, len(self.chain))
+        blocks = []
+        
+        if start < self.pruned_height:
+            if self.archive is None:
+                return []
+            pruned_end = min(end, self.pruned_height)
+            blocks = self.archive.get_range(start, pruned_end)
+            if len(blocks) < pruned_end - start:
+                return blocks
+        
+        blocks.extend(self.chain[max(start, self.pruned_height):end])
+        return blocks
+    
+    @_locked
     def get_balance(self, address: str) -> float:
         """
         Calcula o saldo de um endereço.
         
         Soma todas as transações recebidas e subtrai as enviadas.
+        O saldo confirmado vem do índice de endereços.
         """
-        balance = 0.0
-        
-        for block in self.chain:
-            for tx in block.transactions:
-                if tx.destino == address:
-                    balance += tx.valor
-                if tx.origem == address:
-                    balance -= tx.valor
+        balance = self.address_index.balance(address)
         
         # Considera também transações pendentes
         for tx in self.pending_transactions:
@@ -55,6 +193,74 @@ class Blockchain:
         
         return balance
     
+    @_locked
+    def get_balances(self, addresses: list[str]) -> dict[str, float]:
+        """
+        Calcula o saldo de vários endereços de uma só vez.
+        
+        Usa o índice para os saldos confirmados e percorre o pool de
+        pendentes uma única vez para todos os endereços.
+        """
+        balances = {address: self.address_index.balance(address) for address in addresses}
+        
+        for tx in self.pending_transactions:
+            if tx.destino in balances:
+                balances[tx.destino] += tx.valor
+            if tx.origem in balances:
+                balances[tx.origem] -= tx.valor
+        
+        return balances
+    
+    @_locked
+    def get_history(
+        self, address: str, offset: int = 0, limit: int = 50
+    ) -> list[tuple[int, int, Transaction]]:
+        """
+        Retorna uma página do histórico confirmado de um endereço.
+        
+        Cada item é (altura do bloco, posição no bloco, transação),
+        em ordem cronológica. Use count_history() para paginar.
+        """
+        return [
+            (height, position, self.chain[height].transaction(position))
+            for height, position in self.address_index.history(address, offset, limit)
+        ]
+    
+    @_locked
+    def count_history(self, address: str) -> int:
+        """Quantidade de transações confirmadas de um endereço."""
+        return self.address_index.count(address)
+    
+    @_locked
+    def get_transaction(self, tx_id: str) -> tuple[int, int, Transaction] | None:
+        """
+        Busca uma transação confirmada pelo id.
+        
+        Retorna (altura do bloco, posição no bloco, transação) ou None.
+        """
+        location = self.tx_index.locate_transaction(tx_id)
+        if location is None:
+            return None
+        
+        height, position = location
+        block = self.get_block(height)
+        if block is None:
+            return None
+        return height, position, block.transaction(position)
+    
+    @_locked
+    def get_block_by_hash(self, block_hash: str) -> Block | BlockHeader | None:
+        """
+        Busca um bloco da cadeia pelo hash.
+        
+        Blocos podados sem arquivo em disco retornam apenas o cabeçalho.
+        """
+        height = self.tx_index.block_height(block_hash)
+        if height is None:
+            return None
+        return self.get_block(height) or self.chain[height]
+    
+    @_locked
     def add_transaction(self, transaction: Transaction) -> bool:
         """
         Adiciona uma transação ao pool de pendentes.
@@ -62,15 +268,19 @@ class Blockchain:
         Valida:
         - Valor positivo
         - Saldo suficiente na origem
-        - Transação não duplicada
+        - Transação não duplicada (nem já confirmada, mesmo que podada)
         """
         # Verifica duplicata
         if transaction in self.pending_transactions:
             return False
         
-        for block in self.chain:
-            if transaction in block.transactions:
-                return False
+        # Já confirmada (consulta o índice em vez de percorrer a cadeia)
+        if self.tx_index.is_confirmed(transaction.id):
+            return False
+        
+        # Anterior ao snapshot carregado: os ids abaixo da base são desconhecidos
+        if transaction.timestamp <= self.replay_floor:
+            return False
         
         # Verifica saldo (exceto para origem "genesis" ou "coinbase")
         if transaction.origem not in ("genesis", "coinbase"):
@@ -79,8 +289,10 @@ class Blockchain:
                 return False
         
         self.pending_transactions.append(transaction)
+        self._emit(EventType.NEW_TRANSACTION, transaction)
         return True
     
+    @_locked
     def add_block(self, block: Block) -> bool:
         """
         Adiciona um bloco à cadeia após validação.
@@ -90,6 +302,7 @@ class Blockchain:
         - Hash do bloco anterior
         - Proof of Work válido
         - Hash calculado corretamente
+        - Transações decodificáveis e válidas
         """
         if not self.is_valid_block(block):
             return False
@@ -99,7 +312,12 @@ class Blockchain:
             if tx in self.pending_transactions:
                 self.pending_transactions.remove(tx)
         
-        self.chain.append(block)
+        self.chain.append(self._store(block))
+        self.address_index.add_block(block)
+        self.tx_index.add_block(block)
+        self._body_bytes += self._estimate_size(block)
+        self._prune()
+        self._emit(EventType.NEW_BLOCK, block)
         return True
     
     def is_valid_block(self, block: Block) -> bool:
@@ -120,6 +338,20 @@ class Blockchain:
         if block.hash != block.calculate_hash():
             return False
         
+        return self._valid_transactions(block)
+    
+    @staticmethod
+    def _valid_transactions(block: Block) -> bool:
+        """
+        Decodifica as transações do bloco (LazyBlock só o faz no primeiro
+        acesso); False se alguma for inválida (ex.: valor negativo).
+        """
+        if not isinstance(block, Block):
+            return True  # Cabeçalho de bloco podado
+        try:
+            block.transactions
+        except (KeyError, TypeError, ValueError):
+            return False
         return True
     
     def is_valid_chain(self, chain: list[Block] = None) -> bool:
@@ -130,6 +362,8 @@ class Blockchain:
         - Bloco gênesis correto
         - Encadeamento de hashes
         - Proof of Work de cada bloco
+        
+        Cabeçalhos de blocos podados não têm o hash recalculado.
         """
         if chain is None:
             chain = self.chain
@@ -152,7 +386,7 @@ class Blockchain:
                 return False
             
             # Verifica hash
-            if current.hash != current.calculate_hash():
+            if isinstance(current, Block) and current.hash != current.calculate_hash():
                 return False
             
             # Verifica Proof of Work
@@ -161,23 +395,308 @@ class Blockchain:
         
         return True
     
+    @_locked
     def replace_chain(self, new_chain: list[Block]) -> bool:
         """
         Substitui a cadeia atual por uma nova (mais longa e válida).
         
         Usado para resolução de conflitos (cadeia mais longa vence).
+        No modo de poda, reorganizações abaixo da altura podada são recusadas.
         """
         if len(new_chain) <= len(self.chain):
             return False
         
+        fork = self.find_fork_point(new_chain)
+        if fork + 1 < self.pruned_height:
+            return False
+        if self.columns is not None and fork + 1 < self.columns.start_height:
+            return False  # Abaixo do início das colunas (não há como truncá-las)
+        
         if not self.is_valid_chain(new_chain):
             return False
         
-        self.chain = new_chain
+        # Decodifica os blocos novos antes de qualquer alteração de estado
+        if not all(self._valid_transactions(block) for block in new_chain[fork + 1:]):
+            return False
+        
+        old_height = len(self.chain) - 1
+        removed = [block.hash for block in self.chain[fork + 1:]]
+        
+        # Reindexa apenas a partir do ponto de divergência
+        self.address_index.remove_blocks(fork + 1, self.chain)
+        self.tx_index.remove_blocks(fork + 1, self.chain)
+        if self.columns is not None:
+            self.columns.truncate(fork + 1)
+        self._truncate_encoded(fork + 1)
+        self.chain = self.chain[:fork + 1] + [self._store(block) for block in new_chain[fork + 1:]]
+        for block in new_chain[fork + 1:]:
+            self.address_index.add_block(block)
+            self.tx_index.add_block(block)
+        
+        self._body_bytes = sum(
+            self._estimate_size(block) for block in self.chain[self.pruned_height:]
+        )
+        self._prune()
+        
+        if removed:
+            self._publish_reorg(fork, removed, old_height)
+        for block in new_chain[fork + 1:]:
+            self._emit(EventType.NEW_BLOCK, block)
+        return True
+    
+    def _publish_reorg(self, fork: int, removed: list[str], old_height: int):
+        """Publica a reorganização (blocos acima de fork foram substituídos)."""
+        self._emit(EventType.REORG, {
+            "fork_height": fork,
+            "removed": removed,
+            "old_height": old_height,
+            "new_height": len(self.chain) - 1,
+            "new_tip": self.last_block.hash,
+        })
+    
+    def find_fork_point(self, other_chain: list[Block]) -> int:
+        """Retorna a altura do último bloco em comum com outra cadeia."""
+        height = min(len(self.chain), len(other_chain)) - 1
+        while height > 0 and self.chain[height].hash != other_chain[height].hash:
+            height -= 1
+        return height
+    
+    @_locked
+    def export_snapshot(self, recent: int = 10) -> ChainSnapshot:
+        """
+        Exporta um snapshot para inicialização rápida de novos nós.
+        
+        Os saldos são calculados até a altura base e os últimos recent
+        blocos (ou todos os completos, se a cadeia estiver podada) seguem
+        inteiros.
+        """
+        tip = len(self.chain) - 1
+        base = max(tip - recent, self.pruned_height - 1, 0)
+        
+        ledger = LedgerSnapshot.from_dict(self.ledger_snapshot.to_dict())
+        for block in self.chain[ledger.height + 1:base + 1]:
+            ledger.apply_block(block)
+        
+        # Sem merkle_root: recalculá-lo exigiria o hash de todas as
+        # transações do histórico a cada pedido, e abaixo da base o nó que
+        # recebe o snapshot só guarda cabeçalhos (sem provas para clientes leves)
+        headers = [
+            block if isinstance(block, BlockHeader) else block.header(with_merkle_root=False)
+            for block in self.chain[:base + 1]
+        ]
+        return ChainSnapshot(ledger, headers, self.chain[base + 1:])
+    
+    @_locked
+    def load_snapshot(self, snapshot: ChainSnapshot):
+        """
+        Substitui a cadeia local pelo estado de um snapshot já verificado.
+        
+        Abaixo da altura base ficam apenas os cabeçalhos, como em uma
+        cadeia podada, até que o histórico seja verificado.
+        """
+        base = snapshot.base_height
+        old_height = len(self.chain) - 1
+        removed = [block.hash for block in self.chain[1:]]
+        if self.columns is not None:
+            self.columns.reset(base + 1)
+        self._truncate_encoded(0)
+        self.chain = list(snapshot.headers) + [self._store(block) for block in snapshot.blocks]
+        self.pruned_height = base + 1
+        self.ledger_snapshot = LedgerSnapshot.from_dict(snapshot.ledger.to_dict())
+        self.replay_floor = self.chain[base].timestamp
+        
+        self.address_index = AddressIndex()
+        self.address_index.rebuild(self.chain, base=self.ledger_snapshot)
+        self.tx_index.rebuild(self.chain)
+        
+        if self.archive is not None:
+            self.archive.reset(base + 1)
+        
+        confirmed = {tx.id for block in snapshot.blocks for tx in block.transactions}
+        self.pending_transactions = [
+            tx for tx in self.pending_transactions if tx.id not in confirmed
+        ]
+        
+        self._body_bytes = sum(
+            self._estimate_size(block) for block in self.chain[self.pruned_height:]
+        )
+        self._prune()
+        
+        # Toda a cadeia acima do gênesis passa a vir do snapshot
+        self._publish_reorg(0, removed, old_height)
+    
+    @_locked
+    def discard_snapshot(self, base: BlockHeader | None = None) -> bool:
+        """
+        Volta ao gênesis, descartando uma cadeia vinda de snapshot reprovado.
+        
+        As transações pendentes também são descartadas (foram validadas
+        contra os saldos do snapshot); a cadeia deve ser baixada de novo.
+        Com base, só descarta se a cadeia ainda estiver sobre esse bloco
+        (pode já ter sido substituída por uma sincronização completa).
+        """
+        if base is not None:
+            if len(self.chain) <= base.index or self.chain[base.index].hash != base.hash:
+                return False
+        
+        old_height = len(self.chain) - 1
+        removed = [block.hash for block in self.chain[1:]]
+        if self.columns is not None:
+            self.columns.reset(0)
+        self._truncate_encoded(0)
+        self.chain = [self._store(Block.create_genesis())]
+        self.pending_transactions = []
+        self.pruned_height = 0
+        self.ledger_snapshot = LedgerSnapshot()
+        self.replay_floor = 0.0
+        
+        self.address_index = AddressIndex()
+        self.address_index.rebuild(self.chain)
+        self.tx_index.rebuild(self.chain)
+        
+        if self.archive is not None:
+            self.archive.reset(0)
+        self._body_bytes = self._estimate_size(self.chain[0])
+        self._publish_reorg(0, removed, old_height)
         return True
     
+    @_locked
+    def restore_history(self, blocks: list[Block]):
+        """
+        Recoloca na cadeia os corpos verificados anteriores ao snapshot.
+        
+        No modo de poda os corpos não são mantidos em memória. No modo
+        colunar, quando o histórico fica completo, as colunas são refeitas
+        a partir do gênesis.
+        """
+        if self.pruning_enabled:
+            return
+        
+        for block in blocks:
+            if block.index < self.pruned_height and self.chain[block.index].hash == block.hash:
+                block.freeze()
+                self.chain[block.index] = block
+        
+        if all(isinstance(block, Block) for block in self.chain[:self.pruned_height]):
+            if self.columns is not None:
+                self._rebuild_columns()
+            self.pruned_height = 0
+            self.ledger_snapshot = LedgerSnapshot()
+            self.replay_floor = 0.0
+            self.address_index = AddressIndex()
+            self.address_index.rebuild(self.chain)
+            self.tx_index.rebuild(self.chain)
+            self._body_bytes = sum(self._estimate_size(block) for block in self.chain)
+    
+    def _rebuild_columns(self):
+        """
+        Guarda a cadeia inteira em colunas novas a partir do gênesis.
+        
+        Após restore_history as colunas precisam cobrir o histórico
+        recolocado, senão uma reorganização abaixo da base do snapshot não
+        consegue truncá-las. As visões antigas continuam válidas (as
+        colunas antigas não são alteradas).
+        """
+        columns = ColumnarChain()
+        chain = [columns.append(block) for block in self.chain]
+        for block in chain:
+            block.freeze()
+        self.columns = columns
+        self.chain = chain
+    
+    def _emit(self, event_type: EventType, data: Any):
+        """Enfileira um evento (chamar com a trava); publicado por _flush_events."""
+        self._outbox.append((event_type, data))
+    
+    def _flush_events(self):
+        """
+        Publica os eventos enfileirados, na ordem em que foram gerados.
+        
+        Chamado sem a trava da cadeia. Quem chegar primeiro publica também
+        os eventos das outras threads, então a ordem se mantém.
+        """
+        with self._publish_lock:
+            while self._outbox:
+                event_type, data = self._outbox.popleft()
+                self.events.publish(event_type, data)
+    
+    def _prune(self):
+        """Poda os blocos completos mais antigos além do limite configurado."""
+        if not self.pruning_enabled:
+            return
+        
+        pruned = False
+        while len(self.chain) - self.pruned_height > 1:
+            full_blocks = len(self.chain) - self.pruned_height
+            over_count = self.prune_keep is not None and full_blocks > self.prune_keep
+            over_budget = self.memory_budget is not None and self._body_bytes > self.memory_budget
+            if not over_count and not over_budget:
+                break
+            
+            block = self.chain[self.pruned_height]
+            self.ledger_snapshot.apply_block(block)
+            self.address_index.prune_block(block, self.ledger_snapshot)
+            if self.archive is not None:
+                self.archive.append(block)
+            else:
+                self.tx_index.prune_block(block)
+            
+            self.chain[self.pruned_height] = block.header()
+            self._body_bytes -= self._estimate_size(block)
+            self.pruned_height += 1
+            pruned = True
+        
+        if pruned:
+            self._truncate_encoded(0)  # Cadeia podada não é mais servida por inteiro
+    
+    def _store(self, block: Block) -> Block:
+        """
+        Congela o bloco aceito e o guarda no armazenamento colunar (se
+        ativo), retornando a visão.
+        """
+        stored = block if self.columns is None else self.columns.append(block)
+        stored.freeze()
+        return stored
+    
+    def encoded_chain(self) -> bytes:
+        """
+        Lista de blocos da cadeia em JSON (mesmo formato de to_dict()["chain"]).
+        
+        Apenas os blocos adicionados desde a última chamada são
+        serializados; o restante é cópia do cache.
+        """
+        if self.is_pruned:
+            raise ValueError("Cadeia podada não pode ser serializada por completo")
+        
+        with self.lock:
+            chain = self.chain
+            for block in chain[len(self._encoded_ends):]:
+                if self._encoded_ends:
+                    self._encoded_chain += b", "
+                self._encoded_chain += block.encode()
+                self._encoded_ends.append(len(self._encoded_chain))
+            return bytes(self._encoded_chain) + b"]"
+    
+    def _truncate_encoded(self, height: int):
+        """Descarta do cache de encoded_chain() os blocos com altura >= height."""
+        with self.lock:
+            if height >= len(self._encoded_ends):
+                return
+            end = self._encoded_ends[height - 1] if height > 0 else 1
+            del self._encoded_chain[end:]
+            del self._encoded_ends[height:]
+    
+    @classmethod
+    def _estimate_size(cls, block: Block) -> int:
+        """Estimativa de bytes ocupados pelo bloco em memória."""
+        return cls.ESTIMATED_BLOCK_BYTES + cls.ESTIMATED_TX_BYTES * len(block.transactions)
+    
+    @_locked
     def to_dict(self) -> dict[str, Any]:
         """Converte blockchain para dicionário (serialização JSON)."""
+        if self.is_pruned:
+            raise ValueError("Cadeia podada não pode ser serializada por completo")
+        
         return {
             "chain": [block.to_dict() for block in self.chain],
             "pending_transactions": [tx.to_dict() for tx in self.pending_transactions],
@@ -191,4 +710,6 @@ class Blockchain:
         blockchain.pending_transactions = [
             Transaction.from_dict(tx) for tx in data["pending_transactions"]
         ]
+        blockchain.address_index.rebuild(blockchain.chain)
+        blockchain.tx_index.rebuild(blockchain.chain)
         return blockchain
@@ -0,0 +1,84 @@
+"""
+Módulo de Filtro de Bloom
+"""
+
+import hashlib
+import math
+from typing import Any, Iterable
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom para consultas de pertinência probabilísticas.
+    
+    Usado por clientes leves para registrar nos nós completos os
+    endereços de interesse sem enviar a lista exata. Pode haver falsos
+    positivos (o cliente descarta), mas nunca falsos negativos.
+    """
+    
+    MAX_SIZE_BITS = 36000 * 8  # Limita memória gasta com filtros remotos
+    MAX_HASHES = 50
+    
+    def __init__(self, size_bits: int, num_hashes: int, bits: bytearray | None = None):
+        if not 0 < size_bits <= self.MAX_SIZE_BITS:
+            raise ValueError("Tamanho do filtro de Bloom inválido")
+        if not 0 < num_hashes <= self.MAX_HASHES:
+            raise ValueError("Quantidade de hashes do filtro de Bloom inválida")
+        
+        self.size_bits = size_bits
+        self.num_hashes = num_hashes
+        self.bits = bits if bits is not None else bytearray((size_bits + 7) // 8)
+        
+        if len(self.bits) != (size_bits + 7) // 8:
+            raise ValueError("Bits do filtro de Bloom não correspondem ao tamanho")
+    
+    @classmethod
+    def for_items(
+        cls, items: Iterable[str], false_positive_rate: float = 0.001
+    ) -> "BloomFilter":
+        """Cria filtro dimensionado para os itens e taxa de falso positivo."""
+        items = list(items)
+        n = max(len(items), 1)
+        size = math.ceil(-n * math.log(false_positive_rate) / (math.log(2) ** 2))
+        size = min(max(size, 8), cls.MAX_SIZE_BITS)
+        hashes = min(max(round(size / n * math.log(2)), 1), cls.MAX_HASHES)
+        
+        bloom = cls(size, hashes)
+        for item in items:
+            bloom.add(item)
+        return bloom
+    
+    def add(self, item: str):
+        """Adiciona um item ao filtro."""
+        for position in self._positions(item):
+            self.bits[position // 8] |= 1 << (position % 8)
+    
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position // 8] & (1 << (position % 8))
+            for position in self._positions(item)
+        )
+    
+    def _positions(self, item: str) -> list[int]:
+        """Posições dos bits do item (double hashing sobre SHA-256)."""
+        digest = hashlib.sha256(item.encode()).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:16], 'big') | 1
+        return [(h1 + i * h2) % self.size_bits for i in range(self.num_hashes)]
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Converte filtro para dicionário (serialização JSON)."""
+        return {
+            "size_bits": self.size_bits,
+            "num_hashes": self.num_hashes,
+            "bits": self.bits.hex(),
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "BloomFilter":
+        """Cria filtro a partir de dicionário."""
+        return cls(
+            size_bits=data["size_bits"],
+            num_hashes=data["num_hashes"],
+            bits=bytearray.fromhex(data["bits"]),
+        )
@@ -0,0 +1,95 @@
+"""
+Módulo de Captura de Mensagens (gravação do tráfego recebido)
+"""
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from .blockchain import Blockchain
+
+CAPTURE_VERSION = 1
+
+
+@dataclass
+class CapturedMessage:
+    """Mensagem gravada: instante de chegada, endereço de origem e JSON recebido."""
+    timestamp: float
+    peer: str
+    data: bytes
+
+
+class MessageCapture:
+    """
+    Grava em JSON Lines as mensagens recebidas por um nó.
+    
+    A primeira linha é um cabeçalho com o estado inicial: a cadeia
+    completa (se o nó não estiver podado), para que a gravação possa ser
+    reproduzida em um nó novo a partir do mesmo estado. Cada linha
+    seguinte é {"t": instante, "peer": origem, "data": JSON da mensagem}.
+    """
+    
+    def __init__(self, path: str, node_address: str, blockchain: Blockchain):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = open(path, "wb")
+        
+        header = {
+            "capture": CAPTURE_VERSION,
+            "node": node_address,
+            "started": time.time(),
+            "height": len(blockchain.chain) - 1,
+            "tip": blockchain.last_block.hash,
+        }
+        chain = None if blockchain.is_pruned else blockchain.encoded_chain()
+        line = json.dumps(header).encode()
+        if chain is not None:
+            line = line[:-1] + b', "chain": ' + chain + b"}"
+        self._file.write(line + b"\n")
+    
+    def record(self, data: bytes, address: tuple):
+        """Grava uma mensagem recebida (JSON sem o prefixo de tamanho)."""
+        line = json.dumps({
+            "t": time.time(),
+            "peer": f"{address[0]}:{address[1]}",
+            "data": data.decode(),
+        }).encode() + b"\n"
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line)
+            self.count += 1
+    
+    def close(self):
+        """Encerra a gravação."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def read_capture(path: str) -> tuple[dict[str, Any], Iterator[CapturedMessage]]:
+    """
+    Lê uma gravação.
+    
+    Returns:
+        (cabeçalho, iterador das mensagens em ordem de chegada)
+    """
+    with open(path, "rb") as f:
+        header = json.loads(f.readline())
+        start = f.tell()
+    if header.get("capture") != CAPTURE_VERSION:
+        raise ValueError(f"Formato de captura desconhecido em {path}")
+    
+    # O arquivo só é aberto ao iterar e é fechado ao fim ou em close()
+    def messages() -> Iterator[CapturedMessage]:
+        with open(path, "rb") as f:
+            f.seek(start)
+            for line in f:
+                if line.strip():
+                    item = json.loads(line)
+                    yield CapturedMessage(item["t"], item["peer"], item["data"].encode())
+    
+    return header, messages()
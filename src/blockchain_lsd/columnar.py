@@ -0,0 +1,308 @@
+"""
+Módulo de Armazenamento Colunar de Blocos Confirmados
+"""
+
+import sys
+import uuid
+from array import array
+from typing import Any
+
+from .block import Block
+from .compact import (
+    HASH_BYTES, ID_BYTES, intern_address, pack_hash, pack_id, pack_number, unpack_number,
+)
+from .transaction import Transaction
+
+
+class ColumnarChain:
+    """
+    Blocos confirmados guardados em colunas (array/bytearray) em vez de objetos.
+    
+    Por transação: id (16 bytes), origem e destino (índices na tabela de
+    endereços), valor e timestamp (doubles) e um byte de indicadores;
+    cerca de 40 bytes contra centenas em objetos Python. Por bloco:
+    hash (32 bytes), nonce, timestamp e o deslocamento da primeira
+    transação.
+    
+    Os blocos são lidos por visões (ColumnarBlock) que montam as
+    transações sob demanda. Blocos com campos fora do formato padrão
+    (ids não UUID, valores não numéricos, campos extras nas transações)
+    são guardados como objetos.
+    """
+    
+    # Indicadores (bits) por linha
+    VALOR_INT = 1
+    TIMESTAMP_INT = 2
+    
+    # Campos de uma transação no formato colunar (outros campos entram no hash)
+    TRANSACTION_FIELDS = frozenset({"id", "origem", "destino", "valor", "timestamp"})
+    
+    def __init__(self, start_height: int = 0):
+        self.start_height = start_height
+        self._first_previous_hash = ""
+        
+        # Colunas dos blocos
+        self._hashes = bytearray()
+        self._nonces = array("q")
+        self._timestamps = array("d")
+        self._block_flags = array("B")
+        self._tx_offsets = array("q", [0])
+        self._fallback: dict[int, Block] = {}
+        
+        # Colunas das transações
+        self._ids = bytearray()
+        self._origens = array("I")
+        self._destinos = array("I")
+        self._valores = array("d")
+        self._tx_timestamps = array("d")
+        self._tx_flags = array("B")
+        
+        # Tabela de endereços (cada endereço guardado uma vez)
+        self._addresses: list[str] = []
+        self._address_ids: dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self._nonces)
+    
+    @property
+    def transaction_count(self) -> int:
+        """Quantidade de transações guardadas."""
+        return self._tx_offsets[-1]
+    
+    def reset(self, start_height: int):
+        """Descarta todos os blocos; o próximo terá altura start_height."""
+        self.truncate(self.start_height)
+        self.start_height = start_height
+    
+    def append(self, block: Block) -> Block:
+        """
+        Guarda um bloco no topo e retorna a visão colunar dele.
+        
+        Se o bloco não couber no formato colunar, ele é guardado como
+        objeto e retornado sem alteração.
+        """
+        row = len(self)
+        if block.index != self.start_height + row:
+            raise ValueError("Bloco fora de ordem no armazenamento colunar")
+        
+        packed = self._pack_block(block)
+        block_hash, nonce, timestamp, flags, transactions = packed or (
+            bytes(HASH_BYTES), 0, 0.0, 0, []
+        )
+        
+        if row == 0:
+            self._first_previous_hash = block.previous_hash
+        self._hashes += block_hash
+        self._nonces.append(nonce)
+        self._timestamps.append(timestamp)
+        self._block_flags.append(flags)
+        
+        for tx_id, origem, destino, valor, tx_timestamp, tx_flags in transactions:
+            self._ids += tx_id
+            self._origens.append(self._address_id(origem))
+            self._destinos.append(self._address_id(destino))
+            self._valores.append(valor)
+            self._tx_timestamps.append(tx_timestamp)
+            self._tx_flags.append(tx_flags)
+        self._tx_offsets.append(len(self._valores))
+        
+        if packed is None:
+            self._fallback[row] = block
+            return block
+        return ColumnarBlock(self, row)
+    
+    def truncate(self, height: int):
+        """Descarta os blocos com altura >= height (reorganização)."""
+        row = max(height - self.start_height, 0)
+        if row >= len(self):
+            return
+        
+        tx_row = self._tx_offsets[row]
+        del self._hashes[row * HASH_BYTES:]
+        del self._nonces[row:]
+        del self._timestamps[row:]
+        del self._block_flags[row:]
+        del self._tx_offsets[row + 1:]
+        for fallback_row in [r for r in self._fallback if r >= row]:
+            del self._fallback[fallback_row]
+        
+        del self._ids[tx_row * ID_BYTES:]
+        del self._origens[tx_row:]
+        del self._destinos[tx_row:]
+        del self._valores[tx_row:]
+        del self._tx_timestamps[tx_row:]
+        del self._tx_flags[tx_row:]
+    
+    def transaction_columns(self) -> tuple[list[str], array, array, array, array, array] | None:
+        """
+        Colunas das transações para exportação em lote.
+        
+        Returns:
+            (endereços, deslocamentos por bloco, origens, destinos, valores,
+            timestamps), ou None se algum bloco foi guardado como objeto
+        """
+        if self._fallback:
+            return None
+        return (
+            self._addresses, self._tx_offsets, self._origens,
+            self._destinos, self._valores, self._tx_timestamps,
+        )
+    
+    def memory_usage(self) -> int:
+        """Bytes ocupados pelas colunas (sem a tabela de endereços)."""
+        columns = [
+            self._hashes, self._nonces, self._timestamps, self._block_flags,
+            self._tx_offsets, self._ids, self._origens, self._destinos,
+            self._valores, self._tx_timestamps, self._tx_flags,
+        ]
+        return sum(sys.getsizeof(column) for column in columns)
+    
+    # Leitura (usada pelas visões)
+    
+    def block_hash(self, row: int) -> str:
+        """Hash do bloco da linha."""
+        fallback = self._fallback.get(row)
+        if fallback is not None:
+            return fallback.hash  # A coluna guarda zeros para blocos como objeto
+        return self._hashes[row * HASH_BYTES:(row + 1) * HASH_BYTES].hex()
+    
+    def previous_hash(self, row: int) -> str:
+        """Hash do bloco anterior (o da linha anterior)."""
+        return self.block_hash(row - 1) if row > 0 else self._first_previous_hash
+    
+    def nonce(self, row: int) -> int:
+        """Nonce do bloco da linha."""
+        return self._nonces[row]
+    
+    def timestamp(self, row: int) -> int | float:
+        """Timestamp do bloco da linha."""
+        return unpack_number(self._timestamps[row], bool(self._block_flags[row] & self.TIMESTAMP_INT))
+    
+    def transaction_dicts(self, row: int) -> list[dict[str, Any]]:
+        """Transações do bloco no formato de Transaction.to_dict()."""
+        return [
+            self._transaction_dict(position)
+            for position in range(self._tx_offsets[row], self._tx_offsets[row + 1])
+        ]
+    
+    def transactions(self, row: int) -> list[Transaction]:
+        """Transações do bloco montadas como objetos."""
+        return [Transaction.from_dict(data) for data in self.transaction_dicts(row)]
+    
+    def transaction(self, row: int, position: int) -> Transaction:
+        """Uma transação do bloco montada como objeto."""
+        start, end = self._tx_offsets[row], self._tx_offsets[row + 1]
+        if not 0 <= position < end - start:
+            raise IndexError("Posição fora do bloco")
+        return Transaction.from_dict(self._transaction_dict(start + position))
+    
+    def _transaction_dict(self, position: int) -> dict[str, Any]:
+        """Transação da posição global no formato de dicionário."""
+        flags = self._tx_flags[position]
+        return {
+            "id": str(uuid.UUID(bytes=bytes(self._ids[position * ID_BYTES:(position + 1) * ID_BYTES]))),
+            "origem": self._addresses[self._origens[position]],
+            "destino": self._addresses[self._destinos[position]],
+            "valor": unpack_number(self._valores[position], bool(flags & self.VALOR_INT)),
+            "timestamp": unpack_number(self._tx_timestamps[position], bool(flags & self.TIMESTAMP_INT)),
+        }
+    
+    def _address_id(self, address: str) -> int:
+        """Índice do endereço na tabela (acrescenta se novo)."""
+        address_id = self._address_ids.get(address)
+        if address_id is None:
+            address_id = self._address_ids[address] = len(self._addresses)
+            self._addresses.append(intern_address(address))
+        return address_id
+    
+    def _pack_block(self, block: Block) -> tuple | None:
+        """Campos do bloco no formato colunar, ou None se não couberem."""
+        block_hash = pack_hash(block.hash)
+        previous_ok = len(self) == 0 or block.previous_hash == self.block_hash(len(self) - 1)
+        timestamp = pack_number(block.timestamp)
+        if not isinstance(block_hash, bytes) or not previous_ok or timestamp is None:
+            return None
+        if type(block.nonce) is not int or not -2 ** 63 <= block.nonce < 2 ** 63:
+            return None
+        
+        transactions = []
+        for data in block._transaction_dicts():
+            if data.keys() != self.TRANSACTION_FIELDS:
+                return None
+            tx_id = pack_id(data["id"])
+            valor = pack_number(data["valor"])
+            tx_timestamp = pack_number(data["timestamp"])
+            if not isinstance(tx_id, bytes) or valor is None or tx_timestamp is None:
+                return None
+            if type(data["origem"]) is not str or type(data["destino"]) is not str:
+                return None
+            flags = (self.VALOR_INT if valor[1] else 0) | (self.TIMESTAMP_INT if tx_timestamp[1] else 0)
+            transactions.append(
+                (tx_id, data["origem"], data["destino"], valor[0], tx_timestamp[0], flags)
+            )
+        
+        flags = self.TIMESTAMP_INT if timestamp[1] else 0
+        return block_hash, block.nonce, timestamp[0], flags, transactions
+
+
+class ColumnarBlock(Block):
+    """
+    Visão somente leitura de um bloco guardado em ColumnarChain.
+    
+    Ocupa poucos bytes; campos e transações são lidos das colunas a cada
+    acesso (as transações são montadas como objetos sob demanda). Já nasce
+    congelada, mas sem guardar o JSON (economia de memória).
+    """
+    
+    __slots__ = ("_columns", "_row")
+    
+    def __init__(self, columns: ColumnarChain, row: int):
+        self._columns = columns
+        self._row = row
+        self._encoded = None
+    
+    @property
+    def frozen(self) -> bool:
+        """Visões colunares vêm de blocos já verificados."""
+        return True
+    
+    def freeze(self):
+        """Nada a guardar: a serialização é montada das colunas."""
+    
+    @property
+    def index(self) -> int:
+        """Altura do bloco."""
+        return self._columns.start_height + self._row
+    
+    @property
+    def previous_hash(self) -> str:
+        """Hash do bloco anterior."""
+        return self._columns.previous_hash(self._row)
+    
+    @property
+    def nonce(self) -> int:
+        """Nonce do bloco."""
+        return self._columns.nonce(self._row)
+    
+    @property
+    def timestamp(self) -> int | float:
+        """Timestamp do bloco."""
+        return self._columns.timestamp(self._row)
+    
+    @property
+    def hash(self) -> str:
+        """Hash do bloco."""
+        return self._columns.block_hash(self._row)
+    
+    @property
+    def transactions(self) -> list[Transaction]:
+        """Transações do bloco (montadas a cada acesso)."""
+        return self._columns.transactions(self._row)
+    
+    def transaction(self, position: int) -> Transaction:
+        """Monta apenas a transação da posição."""
+        return self._columns.transaction(self._row, position)
+    
+    def _transaction_dicts(self) -> list[dict[str, Any]]:
+        """Transações lidas direto das colunas (sem criar objetos)."""
+        return self._columns.transaction_dicts(self._row)
@@ -0,0 +1,78 @@
+"""
+Módulo de Representação Compacta (ids e hashes em bytes, endereços internados)
+"""
+
+import sys
+import uuid
+from typing import Any
+
+ID_BYTES = 16
+HASH_BYTES = 32
+MAX_EXACT_INT = 2 ** 53  # Inteiros representáveis sem perda em um double
+
+
+def pack_id(value: str) -> bytes | str:
+    """
+    Converte um id UUID canônico em 16 bytes.
+    
+    Ids em outro formato (outras equipes) ficam como str.
+    """
+    try:
+        packed = uuid.UUID(value).bytes
+    except (ValueError, AttributeError, TypeError):
+        return value
+    return packed if str(uuid.UUID(bytes=packed)) == value else value
+
+
+def unpack_id(value: bytes | str) -> str:
+    """Converte o id compacto de volta para str."""
+    if isinstance(value, bytes):
+        return str(uuid.UUID(bytes=value))
+    return value
+
+
+def pack_hash(value: str) -> bytes | str:
+    """
+    Converte um hash hexadecimal (64 caracteres minúsculos) em 32 bytes.
+    
+    Valores em outro formato (ex.: hash vazio antes do cálculo) ficam como str.
+    """
+    if len(value) != 2 * HASH_BYTES:
+        return value
+    try:
+        packed = bytes.fromhex(value)
+    except ValueError:
+        return value
+    return packed if packed.hex() == value else value
+
+
+def unpack_hash(value: bytes | str) -> str:
+    """Converte o hash compacto de volta para str hexadecimal."""
+    if isinstance(value, bytes):
+        return value.hex()
+    return value
+
+
+def intern_address(address: str) -> str:
+    """Interna o endereço: endereços repetidos compartilham a mesma str."""
+    return sys.intern(address) if type(address) is str else address
+
+
+def pack_number(value: Any) -> tuple[float, bool] | None:
+    """
+    Número como double + indicador de inteiro.
+    
+    O indicador preserva 50 vs 50.0 no JSON (e portanto o hash do bloco).
+    """
+    if type(value) is int:
+        if abs(value) >= MAX_EXACT_INT:
+            return None
+        return float(value), True
+    if type(value) is float:
+        return value, False
+    return None
+
+
+def unpack_number(value: float, is_int: bool) -> int | float:
+    """Inverso de pack_number()."""
+    return int(value) if is_int else value
@@ -0,0 +1,218 @@
+"""
+Módulo de Eventos (publicação/assinatura assíncrona)
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Iterable
+
+
+class EventType(Enum):
+    """Tipos de evento publicados pela blockchain."""
+    NEW_BLOCK = "new_block"  # data: Block (recebido, minerado ou da nova cadeia)
+    NEW_TRANSACTION = "new_transaction"  # data: Transaction aceita no pool
+    REORG = "reorg"  # data: dict com fork_height, removed, old_height, new_height
+
+
+@dataclass
+class Event:
+    """Evento entregue aos assinantes."""
+    type: EventType
+    data: Any
+    timestamp: float = field(default_factory=time.time)
+
+
+class Subscription:
+    """
+    Assinante com fila limitada e thread própria de entrega.
+    
+    Políticas quando a fila enche:
+    - "drop": o evento novo é descartado (contado em dropped)
+    - "block": o publicador espera até block_timeout segundos (None =
+      indefinidamente, ou até o assinante ser encerrado) e só então descarta
+    """
+    
+    DROP = "drop"
+    BLOCK = "block"
+    CLOSE_CHECK_INTERVAL = 0.1  # Publicador bloqueado confere _closed a cada intervalo
+    
+    def __init__(
+        self,
+        bus: "EventBus",
+        handler: Callable[[Event], None],
+        types: set[EventType] | None,
+        maxsize: int,
+        policy: str,
+        block_timeout: float | None,
+    ):
+        if policy not in (self.DROP, self.BLOCK):
+            raise ValueError(f"Política desconhecida: {policy}")
+        if maxsize < 1:
+            raise ValueError("Fila precisa de ao menos uma posição")
+        
+        self.bus = bus
+        self.handler = handler
+        self.types = types
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.delivered = 0
+        self.dropped = 0
+        self.failed = 0
+        self._counters_lock = threading.Lock()
+        
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._closed = False
+        self._thread = threading.Thread(target=self._deliver, daemon=True)
+        self._thread.start()
+    
+    @property
+    def pending(self) -> int:
+        """Eventos aguardando entrega."""
+        return self._queue.qsize()
+    
+    def wants(self, event_type: EventType) -> bool:
+        """Indica se o assinante recebe eventos deste tipo."""
+        return not self._closed and (self.types is None or event_type in self.types)
+    
+    def offer(self, event: Event):
+        """Enfileira um evento conforme a política (chamado pelo publicador)."""
+        try:
+            if self.policy == self.BLOCK:
+                self._put_blocking(event)
+            else:
+                self._queue.put_nowait(event)
+        except queue.Full:
+            with self._counters_lock:
+                self.dropped += 1
+    
+    def close(self):
+        """Encerra a entrega; eventos ainda na fila são descartados."""
+        self._closed = True
+        # Esvazia a fila para liberar publicadores bloqueados
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass  # A thread verifica _closed após cada entrega
+    
+    def _put_blocking(self, event: Event):
+        """Espera por espaço na fila até block_timeout ou até o encerramento."""
+        deadline = None if self.block_timeout is None else time.monotonic() + self.block_timeout
+        while not self._closed:
+            wait = self.CLOSE_CHECK_INTERVAL
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    raise queue.Full
+            try:
+                self._queue.put(event, timeout=wait)
+                return
+            except queue.Full:
+                continue
+        raise queue.Full
+    
+    def _deliver(self):
+        """Loop de entrega ao handler (fora da thread do publicador)."""
+        while not self._closed:
+            event = self._queue.get()
+            if event is None or self._closed:
+                break
+            try:
+                self.handler(event)
+                with self._counters_lock:
+                    self.delivered += 1
+            except Exception as e:
+                with self._counters_lock:
+                    self.failed += 1
+                self.bus.logger.error(f"Erro no assinante de {event.type.value}: {e}")
+
+
+class EventBus:
+    """
+    Barramento de eventos com vários assinantes.
+    
+    publish() apenas enfileira o evento na fila de cada assinante
+    interessado; cada assinante consome em sua própria thread. Com a
+    política "drop" um consumidor lento perde eventos em vez de atrasar o
+    publicador (o caminho de rede do nó).
+    """
+    
+    DEFAULT_QUEUE_SIZE = 1024
+    
+    def __init__(self):
+        self.logger = logging.getLogger("EventBus")
+        self._subscriptions: list[Subscription] = []
+        self._lock = threading.Lock()
+    
+    def subscribe(
+        self,
+        handler: Callable[[Event], None],
+        types: Iterable[EventType] | None = None,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+        policy: str = Subscription.DROP,
+        block_timeout: float | None = None,
+    ) -> Subscription:
+        """
+        Registra um assinante.
+        
+        Args:
+            handler: Chamado com cada Event (na thread do assinante)
+            types: Tipos de interesse (None = todos)
+            maxsize: Tamanho da fila do assinante
+            policy: "drop" ou "block" quando a fila enche
+            block_timeout: Espera máxima do publicador na política "block"
+        """
+        subscription = Subscription(
+            self, handler, set(types) if types is not None else None,
+            maxsize, policy, block_timeout,
+        )
+        with self._lock:
+            self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription):
+        """Remove um assinante."""
+        subscription.close()
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+    
+    def publish(self, event_type: EventType, data: Any):
+        """Publica um evento para os assinantes interessados."""
+        subscriptions = self._subscriptions  # Cópia imutável: sem lock no caminho quente
+        if not subscriptions:
+            return
+        
+        event = Event(event_type, data)
+        for subscription in subscriptions:
+            if subscription.wants(event_type):
+                subscription.offer(event)
+    
+    def close(self):
+        """Remove todos os assinantes."""
+        with self._lock:
+            subscriptions, self._subscriptions = self._subscriptions, []
+        for subscription in subscriptions:
+            subscription.close()
+    
+    @property
+    def stats(self) -> list[dict[str, Any]]:
+        """Contadores por assinante."""
+        return [
+            {
+                "types": sorted(t.value for t in s.types) if s.types is not None else None,
+                "policy": s.policy,
+                "pending": s.pending,
+                "delivered": s.delivered,
+                "dropped": s.dropped,
+                "failed": s.failed,
+            }
+            for s in self._subscriptions
+        ]
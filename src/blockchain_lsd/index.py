@@ -0,0 +1,214 @@
+"""
+Módulo de Índices da Blockchain
+"""
+
+from array import array
+from collections import defaultdict
+
+from .block import Block, BlockHeader
+from .compact import pack_id
+from .snapshot import LedgerSnapshot
+from .transaction import Transaction
+
+POSITION_BITS = 32  # Localização (altura, posição) guardada em um único inteiro
+
+
+def pack_location(height: int, position: int) -> int:
+    """Altura e posição da transação em um inteiro de 64 bits."""
+    return height << POSITION_BITS | position
+
+
+def unpack_location(location: int) -> tuple[int, int]:
+    """Inverso de pack_location()."""
+    return location >> POSITION_BITS, location & ((1 << POSITION_BITS) - 1)
+
+
+class AddressIndex:
+    """
+    Índice endereço -> lista de (altura, posição da transação no bloco).
+    
+    Mantém também o saldo confirmado de cada endereço, permitindo
+    consultas de histórico em O(k) (k = transações do endereço) e
+    consultas de saldo em O(1), sem percorrer a cadeia inteira.
+    
+    O histórico de cada endereço é um array de localizações empacotadas
+    (8 bytes por entrada, em vez de uma tupla com dois inteiros).
+    
+    No modo de poda, o histórico abaixo da altura podada é descartado e
+    os saldos passam a partir do snapshot do livro-razão (base).
+    """
+    
+    def __init__(self):
+        self._history: dict[str, array] = defaultdict(lambda: array("q"))
+        self._balances: dict[str, float] = defaultdict(float)
+        self._base: LedgerSnapshot | None = None
+    
+    def add_block(self, block: Block):
+        """Indexa as transações de um bloco recém-adicionado ao topo."""
+        for position, tx in enumerate(block.transactions):
+            location = pack_location(block.index, position)
+            self._history[tx.destino].append(location)
+            self._balances[tx.destino] += tx.valor
+            if tx.origem != tx.destino:
+                self._history[tx.origem].append(location)
+            self._balances[tx.origem] -= tx.valor
+    
+    def remove_blocks(self, height: int, chain: list[Block]):
+        """
+        Remove do índice os blocos com altura >= height (reorganização).
+        
+        Os saldos dos endereços afetados são recalculados a partir do
+        histórico restante para evitar erro acumulado de ponto flutuante.
+        """
+        affected = set()
+        for block in chain[height:]:
+            for tx in block.transactions:
+                affected.add(tx.origem)
+                affected.add(tx.destino)
+        
+        for address in affected:
+            history = self._history[address]
+            while history and history[-1] >> POSITION_BITS >= height:
+                history.pop()
+            self._recompute_balance(address, chain)
+            if not history:
+                del self._history[address]
+    
+    def rebuild(self, chain: list[Block], base: LedgerSnapshot | None = None):
+        """
+        Reconstrói o índice inteiro a partir de uma cadeia.
+        
+        Se base for informado, os saldos partem dele e apenas os blocos
+        acima da sua altura são indexados.
+        """
+        if base is not None:
+            self._base = base
+        self._history.clear()
+        self._balances.clear()
+        
+        start = 0
+        if self._base is not None:
+            self._balances.update(self._base.balances)
+            start = self._base.height + 1
+        
+        for block in chain[start:]:
+            self.add_block(block)
+    
+    def prune_block(self, block: Block, base: LedgerSnapshot):
+        """
+        Descarta o histórico de um bloco podado (sempre o mais antigo).
+        
+        Os saldos confirmados não mudam; apenas passam a ter o snapshot
+        do livro-razão como base ao serem recalculados.
+        """
+        self._base = base
+        for tx in block.transactions:
+            for address in (tx.origem, tx.destino):
+                history = self._history.get(address)
+                if history is None:
+                    continue
+                cut = 0
+                while cut < len(history) and history[cut] >> POSITION_BITS <= block.index:
+                    cut += 1
+                del history[:cut]
+                if not history:
+                    del self._history[address]
+    
+    def balance(self, address: str) -> float:
+        """Saldo confirmado de um endereço."""
+        return self._balances.get(address, 0.0)
+    
+    def count(self, address: str) -> int:
+        """Quantidade de transações confirmadas de um endereço."""
+        return len(self._history.get(address, ()))
+    
+    def history(
+        self, address: str, offset: int = 0, limit: int | None = None
+    ) -> list[tuple[int, int]]:
+        """Retorna uma página do histórico (ordem cronológica)."""
+        entries = self._history.get(address, ())
+        end = None if limit is None else offset + limit
+        return [unpack_location(location) for location in entries[offset:end]]
+    
+    def _recompute_balance(self, address: str, chain: list[Block]):
+        """Recalcula o saldo de um endereço a partir do seu histórico."""
+        balance = self._base.balance(address) if self._base is not None else 0.0
+        for location in self._history.get(address, ()):
+            height, position = unpack_location(location)
+            tx: Transaction = chain[height].transaction(position)
+            if tx.destino == address:
+                balance += tx.valor
+            if tx.origem == address:
+                balance -= tx.valor
+        
+        in_base = self._base is not None and address in self._base.balances
+        if self._history.get(address) or in_base:
+            self._balances[address] = balance
+        else:
+            self._balances.pop(address, None)
+
+
+class TransactionIndex:
+    """
+    Índices id da transação -> (altura, posição) e hash do bloco -> altura.
+    
+    Permitem buscar transações e blocos em O(1) (API de consultas).
+    No modo de poda sem arquivo em disco, as transações podadas saem do
+    índice (os corpos não estão mais disponíveis), mas os ids continuam em
+    um conjunto compacto para que is_confirmed() recuse a repetição de uma
+    transação já confirmada; os hashes dos blocos ficam, pois os
+    cabeçalhos continuam na cadeia.
+    
+    Os ids das transações são chaveados na forma compacta (16 bytes) e a
+    localização é guardada empacotada (pack_location).
+    """
+    
+    def __init__(self):
+        self._transactions: dict[bytes | str, int] = {}
+        self._blocks: dict[str, int] = {}
+        self._pruned: set[bytes | str] = set()  # Ids confirmados sem localização
+    
+    def add_block(self, block: Block | BlockHeader):
+        """Indexa um bloco recém-adicionado ao topo."""
+        self._blocks[block.hash] = block.index
+        for position, tx in enumerate(getattr(block, "transactions", ())):
+            self._transactions[pack_id(tx.id)] = pack_location(block.index, position)
+    
+    def remove_blocks(self, height: int, chain: list[Block]):
+        """Remove do índice os blocos com altura >= height (reorganização)."""
+        for block in chain[height:]:
+            self._blocks.pop(block.hash, None)
+            for tx in block.transactions:
+                key = pack_id(tx.id)
+                location = self._transactions.get(key)
+                if location is not None and location >> POSITION_BITS == block.index:
+                    del self._transactions[key]
+    
+    def rebuild(self, chain: list[Block | BlockHeader]):
+        """Reconstrói os índices a partir de uma cadeia."""
+        self._transactions.clear()
+        self._blocks.clear()
+        self._pruned.clear()
+        for block in chain:
+            self.add_block(block)
+    
+    def prune_block(self, block: Block):
+        """Descarta a localização das transações de um bloco podado (sem arquivo em disco)."""
+        for tx in block.transactions:
+            key = pack_id(tx.id)
+            self._transactions.pop(key, None)
+            self._pruned.add(key)
+    
+    def is_confirmed(self, tx_id: str) -> bool:
+        """Indica se a transação já foi confirmada (inclusive em bloco podado)."""
+        key = pack_id(tx_id)
+        return key in self._transactions or key in self._pruned
+    
+    def locate_transaction(self, tx_id: str) -> tuple[int, int] | None:
+        """Altura e posição de uma transação confirmada."""
+        location = self._transactions.get(pack_id(tx_id))
+        return None if location is None else unpack_location(location)
+    
+    def block_height(self, block_hash: str) -> int | None:
+        """Altura de um bloco da cadeia pelo hash."""
+        return self._blocks.get(block_hash)
@@ -0,0 +1,252 @@
+"""
+Módulo do Cliente Leve (somente cabeçalhos + filtro de Bloom)
+"""
+
+import threading
+
+from .block import Block, BlockHeader
+from .blockchain import Blockchain
+from .bloom import BloomFilter
+from .merkle import verify_merkle_proof
+from .node import Node
+from .protocol import Protocol, Message, MessageType
+from .transaction import Transaction
+
+
+class LightNode(Node):
+    """
+    Nó leve: guarda apenas cabeçalhos e as transações dos seus endereços.
+    
+    Registra nos nós completos um filtro de Bloom com os endereços
+    observados e recebe somente as transações que casam com o filtro,
+    cada uma com prova de inclusão (Merkle) contra o cabeçalho do bloco.
+    Memória e banda crescem com a atividade da carteira, não com a cadeia.
+    
+    Limites de segurança: o hash do bloco não compromete o merkle_root
+    (formato de bloco padronizado entre as equipes), então a raiz é
+    informada pelo mesmo nó completo que envia as provas. Uma prova só
+    mostra que a transação é coerente com a raiz declarada por esse nó; um
+    nó desonesto pode forjar raiz e prova juntos. Dos cabeçalhos o cliente
+    confere apenas o encadeamento e o prefixo de Proof of Work do hash
+    informado (recalculá-lo exigiria as transações). Confie apenas em nós
+    completos confiáveis.
+    
+    Os nós completos expiram filtros não renovados (Node.FILTER_TTL), então
+    o cliente reenvia o filtro a cada FILTER_REFRESH_INTERVAL.
+    """
+    
+    FILTER_REFRESH_INTERVAL = Node.FILTER_TTL / 3
+    
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 5000,
+        addresses: list[str] | None = None,
+        false_positive_rate: float = 0.001,
+        transport=None,
+    ):
+        super().__init__(host, port, transport=transport)
+        self.watched: set[str] = set(addresses or [])
+        self.false_positive_rate = false_positive_rate
+        self.bloom = BloomFilter.for_items(self.watched, false_positive_rate)
+        self.headers: list[BlockHeader] = [Block.create_genesis().header()]
+        
+        # id -> (altura, transação) confirmadas e id -> transação pendente
+        self.confirmed: dict[str, tuple[int, Transaction]] = {}
+        self.unconfirmed: dict[str, Transaction] = {}
+        self._refresh_stop = threading.Event()
+    
+    def start(self):
+        """Inicia o nó e a renovação periódica do filtro nos peers."""
+        super().start()
+        self._refresh_stop.clear()
+        threading.Thread(target=self._refresh_filters, daemon=True).start()
+    
+    def stop(self):
+        """Para o nó e a renovação do filtro."""
+        self._refresh_stop.set()
+        super().stop()
+    
+    def _refresh_filters(self):
+        """Reenvia o filtro (e busca cabeçalhos novos) periodicamente."""
+        while not self._refresh_stop.wait(self.FILTER_REFRESH_INTERVAL):
+            self.sync_blockchain()
+    
+    @property
+    def height(self) -> int:
+        """Altura do último cabeçalho conhecido."""
+        return len(self.headers) - 1
+    
+    def connect_to_peer(self, peer_address: str) -> bool:
+        """Conecta a um nó completo e registra o filtro de Bloom nele."""
+        if not super().connect_to_peer(peer_address):
+            return False
+        self.load_filter(peer_address)
+        return True
+    
+    def load_filter(self, peer_address: str, from_height: int | None = None):
+        """
+        Registra o filtro no peer e processa os cabeçalhos recebidos.
+        
+        O nó completo responde em páginas (MERKLE_BLOCKS com o topo); o
+        filtro é reenviado a partir do último cabeçalho até chegar ao topo.
+        """
+        if from_height is None:
+            from_height = self.height + 1
+        while True:
+            message = Protocol.filter_load(self.bloom.to_dict(), from_height)
+            response = self._send_message(peer_address, message)
+            if not response or response.type != MessageType.MERKLE_BLOCKS:
+                return
+            payload = response.payload
+            if not self._apply_merkle_blocks(payload) or not payload["headers"]:
+                return
+            last = payload["headers"][-1]["index"]
+            if last < from_height or last >= payload.get("tip", last):
+                return
+            from_height = last + 1
+    
+    def watch(self, address: str):
+        """
+        Passa a observar um novo endereço (reenvia o filtro do zero).
+        
+        O filtro é refeito para o novo conjunto de endereços: acrescentar a
+        um filtro dimensionado para menos itens o satura, e o nó completo
+        passa a enviar quase todas as transações.
+        """
+        self.watched.add(address)
+        self.bloom = BloomFilter.for_items(self.watched, self.false_positive_rate)
+        for peer in list(self.peers):
+            self.load_filter(peer, 0)
+    
+    def sync_blockchain(self):
+        """Atualiza cabeçalhos e transações filtradas com os peers."""
+        for peer in list(self.peers):
+            self.load_filter(peer)
+    
+    def broadcast_transaction(self, transaction: Transaction):
+        """Envia a transação aos nós completos (validação fica com eles)."""
+        if self._is_relevant(transaction):
+            self.unconfirmed[transaction.id] = transaction
+        self._broadcast(Protocol.new_transaction(transaction.to_dict()))
+    
+    def mine(self) -> Block | None:
+        """Clientes leves não mineram."""
+        self.logger.warning("Cliente leve não minera blocos")
+        return None
+    
+    def start_mining_service(
+        self,
+        threads: int = 1,
+        duty_cycle: float = 1.0,
+        max_block_transactions: int | None = None,
+    ):
+        """Clientes leves não mineram."""
+        self.logger.warning("Cliente leve não minera blocos")
+    
+    def get_balance(self, address: str) -> float:
+        """Saldo do endereço a partir das transações verificadas e pendentes."""
+        balance = 0.0
+        transactions = [tx for _, tx in self.confirmed.values()]
+        transactions += self.unconfirmed.values()
+        for tx in transactions:
+            if tx.destino == address:
+                balance += tx.valor
+            if tx.origem == address:
+                balance -= tx.valor
+        return balance
+    
+    def get_history(self, address: str) -> list[tuple[int, Transaction]]:
+        """Transações confirmadas do endereço (altura, transação)."""
+        history = [
+            (height, tx) for height, tx in self.confirmed.values()
+            if address in (tx.origem, tx.destino)
+        ]
+        return sorted(history, key=lambda item: (item[0], item[1].timestamp))
+    
+    def _process_message(self, message: Message, remote: str = "") -> Message | None:
+        """Processa apenas as mensagens relevantes para um cliente leve."""
+        self.logger.info(f"Mensagem recebida: {message.type.value} de {message.sender}")
+        
+        match message.type:
+            case MessageType.MERKLE_BLOCKS:
+                self._apply_merkle_blocks(message.payload)
+            
+            case MessageType.NEW_TRANSACTION:
+                transaction = Transaction.from_dict(message.payload["transaction"])
+                if self._is_relevant(transaction) and transaction.id not in self.confirmed:
+                    self.unconfirmed[transaction.id] = transaction
+                    self.logger.info(f"Transação pendente recebida: {transaction.id[:8]}...")
+            
+            case MessageType.PING:
+                return Protocol.pong()
+        
+        return None
+    
+    def _apply_merkle_blocks(self, payload: dict) -> bool:
+        """Valida e aplica cabeçalhos e transações filtradas (False se não encadearem)."""
+        headers = [BlockHeader.from_dict(h) for h in payload["headers"]]
+        if headers and not self._connect_headers(headers):
+            self.logger.warning("Cabeçalhos recebidos não encadeiam com a cadeia local")
+            return False
+        
+        for match in payload["matches"]:
+            height = match["height"]
+            transaction = Transaction.from_dict(match["transaction"])
+            if height >= len(self.headers) or not self._is_relevant(transaction):
+                continue  # Fora da cadeia conhecida ou falso positivo do filtro
+            
+            root = self.headers[height].merkle_root
+            if not verify_merkle_proof(transaction.calculate_hash(), match["proof"], root):
+                self.logger.warning(f"Prova de Merkle inválida: {transaction.id[:8]}...")
+                continue
+            
+            self.confirmed[transaction.id] = (height, transaction)
+            self.unconfirmed.pop(transaction.id, None)
+        
+        return True
+    
+    def _connect_headers(self, headers: list[BlockHeader]) -> bool:
+        """
+        Encadeia cabeçalhos recebidos à cadeia local.
+        
+        Cabeçalhos já conhecidos são ignorados; se divergirem (reorganização),
+        a cadeia local é truncada no ponto de divergência.
+        """
+        start = headers[0].index
+        if start > len(self.headers):
+            return False
+        
+        for header in headers:
+            if header.index == 0:
+                if header.hash != self.headers[0].hash:
+                    return False
+                continue
+            if header.index > len(self.headers):
+                return False
+            if header.index < len(self.headers) and self.headers[header.index].hash == header.hash:
+                continue
+            
+            previous = self.headers[header.index - 1]
+            if header.previous_hash != previous.hash:
+                return False
+            if not header.is_valid_hash(Blockchain.DIFFICULTY):
+                return False
+            
+            if header.index < len(self.headers):
+                self._truncate(header.index)
+            self.headers.append(header)
+        
+        return True
+    
+    def _truncate(self, height: int):
+        """Descarta cabeçalhos a partir de height e as transações confirmadas neles."""
+        del self.headers[height:]
+        for tx_id, (tx_height, tx) in list(self.confirmed.items()):
+            if tx_height >= height:
+                del self.confirmed[tx_id]
+                self.unconfirmed[tx_id] = tx
+    
+    def _is_relevant(self, transaction: Transaction) -> bool:
+        """Verifica se a transação envolve algum endereço observado."""
+        return transaction.origem in self.watched or transaction.destino in self.watched
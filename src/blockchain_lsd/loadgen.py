@@ -0,0 +1,497 @@
+"""
+Módulo de Geração de Carga (transações válidas e medida de vazão)
+
+Uso:
+    uv run python -m src.blockchain_lsd.loadgen --target localhost:5000 --rate 100
+    uv run python -m src.blockchain_lsd.loadgen --simulate --nodes 1 4 16 --block-sizes 50 200
+"""
+
+import argparse
+import dataclasses
+import logging
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+from .protocol import Message, MessageType, Protocol
+from .simulator import NetworkConfig, Simulator, Workload, percentiles
+from .transaction import Transaction
+from .transport import TcpTransport
+
+
+@dataclass
+class LoadConfig:
+    """
+    Carga gerada: contas, ritmo de envio e conexões.
+    
+    Com rate, as transações são agendadas em intervalos fixos (malha
+    aberta) e distribuídas entre as conexões. Com rate=None cada conexão
+    envia a próxima transação assim que o nó processa a anterior (malha
+    fechada), o que mede a vazão máxima de entrada.
+    """
+    accounts: int = 50
+    rate: float | None = 50.0  # Transações por segundo (None = malha fechada)
+    connections: int = 8  # Conexões simultâneas, cada uma com identidade própria
+    duration: float = 10.0
+    settle: float = 5.0  # Espera final por confirmações
+    amount: float = 1.0  # Valor de cada transferência
+    funding: float = 1_000_000.0  # Saldo inicial de cada conta (coinbase)
+    funding_timeout: float = 60.0  # Espera máxima pela confirmação do saldo inicial
+    poll_interval: float = 0.1  # Intervalo de consulta de blocos novos
+    seed: int | None = None
+
+
+@dataclass
+class LoadReport:
+    """Resultado de uma carga (tempos em segundos)."""
+    targets: int
+    duration: float
+    submitted: int
+    processed: int  # Processadas pelo nó, admitidas ou não (sem BUSY nem erro)
+    busy: int  # BUSY por filas cheias (nó sobrecarregado)
+    rate_limited: int  # BUSY pelo limite de taxa do nó (mede o limite, não o nó)
+    errors: int
+    confirmed: int  # Incluídas em bloco até o fim da espera final
+    processed_tps: float  # Processadas por segundo durante a carga
+    confirmed_tps: float  # Confirmadas por segundo durante a carga
+    process_latency: dict[str, float]  # Envio até o nó processar a mensagem
+    confirm_latency: dict[str, float]  # Envio até a inclusão em bloco
+    blocks: int  # Blocos da cadeia do observador durante a carga e a espera final
+    block_size: float  # Transações por bloco observado (média)
+    schedule_lag: float = 0.0  # Maior atraso no envio (gerador saturado se alto)
+    
+    def format(self) -> str:
+        """Relatório em texto."""
+        def latencies(values: dict[str, float]) -> str:
+            return "  ".join(f"{name}={value * 1000:.0f}ms" for name, value in values.items())
+        
+        return "\n".join([
+            f"Nós alvo: {self.targets}  duração: {self.duration:.1f}s",
+            f"Enviadas: {self.submitted}  processadas: {self.processed}  "
+            f"BUSY: {self.busy}  limitadas: {self.rate_limited}  erros: {self.errors}",
+            f"Vazão: processamento={self.processed_tps:.1f} tx/s  "
+            f"confirmação={self.confirmed_tps:.1f} tx/s",
+            f"  envio -> processada: {latencies(self.process_latency)}",
+            f"  envio -> bloco: {latencies(self.confirm_latency)}",
+            f"Confirmadas: {self.confirmed}  blocos: {self.blocks}  "
+            f"transações por bloco: {self.block_size:.1f}",
+            f"Atraso máximo do envio: {self.schedule_lag * 1000:.0f}ms",
+        ] + ([
+            "Aviso: o limite de taxa do nó recusou transações; a vazão medida é a do "
+            "limite (inicie o nó alvo com --no-rate-limit)"
+        ] if self.rate_limited else []))
+
+
+class LoadGenerator:
+    """
+    Envia transações válidas a um ou mais nós pelo protocolo da rede.
+    
+    As contas recebem saldo por transações coinbase, confirmadas antes da
+    carga; depois cada transação transfere `amount` de uma conta para
+    outra. Cada conexão envia com um remetente próprio (como clientes
+    distintos) para um nó fixo dos alvos.
+    
+    Os limites de taxa do nó são por IP da conexão: por TCP todas as
+    conexões do gerador vêm do mesmo IP e dividem um único balde de
+    NEW_TRANSACTION. Para medir o nó, e não o limite, o nó alvo deve rodar
+    com --no-rate-limit; respostas BUSY do limite são contadas à parte
+    (rate_limited) das de sobrecarga (busy).
+    
+    O protocolo não confirma a admissão no mempool: o nó só encerra a
+    conexão após add_transaction, aceite ou rejeite a transação. Por isso
+    "processadas" mede apenas o processamento; a admissão é vista nas
+    confirmações, obtidas consultando blocos novos no nó observador
+    (REQUEST_BLOCKS). Blocos que deixam a cadeia do observador
+    (reorganização) são descartados junto com suas confirmações.
+    """
+    
+    TIMEOUT = 10.0
+    BLOCKS_PER_POLL = 50
+    
+    def __init__(
+        self,
+        targets: list[str],
+        config: LoadConfig | None = None,
+        transport=None,
+        observer: str | None = None,
+    ):
+        if not targets:
+            raise ValueError("Informe ao menos um nó alvo")
+        self.config = config or LoadConfig()
+        if self.config.accounts < 2:
+            raise ValueError("A carga precisa de ao menos duas contas")
+        if self.config.connections < 1:
+            raise ValueError("É necessária ao menos uma conexão")
+        if self.config.rate is not None and self.config.rate <= 0:
+            raise ValueError("Taxa deve ser positiva")
+        
+        self.targets = targets
+        self.transport = transport or TcpTransport()
+        self.observer = observer or targets[0]
+        self.logger = logging.getLogger("LoadGenerator")
+        
+        self.random = random.Random(self.config.seed)
+        run_id = f"{self.random.getrandbits(32):08x}"
+        self.accounts = [f"load-{run_id}-{i}" for i in range(self.config.accounts)]
+        
+        # Transação -> instante de envio / de processamento / de confirmação
+        self._submitted: dict[str, float] = {}
+        self._processed: dict[str, float] = {}
+        self._confirmed: dict[str, float] = {}
+        self._busy = 0
+        self._rate_limited = 0
+        self._errors = 0
+        # Cadeia do observador a partir do topo inicial: (hash, ids das transações)
+        self._chain: list[tuple[str | None, list[str]]] = []
+        self._load_start = 0  # Primeiro bloco de _chain observado durante a carga
+        self._height = 0
+        self._lock = threading.Lock()
+        self._observing = False
+    
+    def run(self) -> LoadReport:
+        """Financia as contas, aplica a carga e retorna o relatório."""
+        self._height, tip = self._tip()
+        self._chain = [(tip, [])]
+        self._observing = True
+        observer = threading.Thread(target=self._observe, daemon=True)
+        observer.start()
+        try:
+            self.fund()
+            self._reset()
+            
+            started = time.monotonic()
+            lag = self._load(started)
+            self._wait_confirmations()
+            
+            report = self.report(started)
+            report.schedule_lag = lag
+            return report
+        finally:
+            self._observing = False
+            observer.join(timeout=self.TIMEOUT)
+    
+    def fund(self):
+        """Dá saldo às contas (coinbase) e espera a confirmação."""
+        funding = [Transaction("coinbase", account, self.config.funding) for account in self.accounts]
+        for i, tx in enumerate(funding):
+            self._submit(tx, self.targets[i % len(self.targets)], "load-funding:0")
+        
+        deadline = time.monotonic() + self.config.funding_timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if all(tx.id in self._confirmed for tx in funding):
+                    return
+            time.sleep(self.config.poll_interval)
+        raise TimeoutError("Saldo inicial não confirmado: os nós alvo estão minerando?")
+    
+    def report(self, started: float) -> LoadReport:
+        """Monta o relatório a partir dos instantes registrados."""
+        duration = self.config.duration
+        end = started + duration
+        with self._lock:
+            submitted = dict(self._submitted)
+            processed = dict(self._processed)
+            confirmed = dict(self._confirmed)
+            blocks = [len(tx_ids) for _, tx_ids in self._chain[self._load_start:]]
+            busy, rate_limited, errors = self._busy, self._rate_limited, self._errors
+        
+        confirmed = {tx_id: at for tx_id, at in confirmed.items() if tx_id in submitted}
+        return LoadReport(
+            targets=len(self.targets),
+            duration=duration,
+            submitted=len(submitted),
+            processed=len(processed),
+            busy=busy,
+            rate_limited=rate_limited,
+            errors=errors,
+            confirmed=len(confirmed),
+            processed_tps=sum(1 for at in processed.values() if at <= end) / duration,
+            confirmed_tps=sum(1 for at in confirmed.values() if at <= end) / duration,
+            process_latency=percentiles([at - submitted[tx_id] for tx_id, at in processed.items()]),
+            confirm_latency=percentiles([at - submitted[tx_id] for tx_id, at in confirmed.items()]),
+            blocks=len(blocks),
+            block_size=sum(blocks) / len(blocks) if blocks else 0.0,
+        )
+    
+    # Carga
+    
+    def _load(self, started: float) -> float:
+        """Envia transações durante config.duration; retorna o atraso máximo."""
+        end = started + self.config.duration
+        pending: queue.Queue = queue.Queue(maxsize=self.config.connections * 2)
+        lag = 0.0
+        
+        if self.config.rate is None:
+            target = self._closed_loop
+            args = (end,)
+        else:
+            target = self._open_loop
+            args = (pending,)
+        workers = [
+            threading.Thread(target=target, args=(i, *args), daemon=True)
+            for i in range(self.config.connections)
+        ]
+        for worker in workers:
+            worker.start()
+        
+        if self.config.rate is not None:
+            interval = 1 / self.config.rate
+            at = started
+            while at < end:
+                delay = at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    lag = max(lag, -delay)
+                pending.put(self._next_transaction())
+                at += interval
+            for _ in workers:
+                pending.put(None)
+        
+        for worker in workers:
+            worker.join()
+        return lag
+    
+    def _open_loop(self, connection: int, pending: queue.Queue):
+        """Conexão da malha aberta: envia o que o agendador enfileirar."""
+        target, sender = self._connection(connection)
+        while True:
+            tx = pending.get()
+            if tx is None:
+                return
+            self._submit(tx, target, sender)
+    
+    def _closed_loop(self, connection: int, end: float):
+        """Conexão da malha fechada: uma transação em voo por vez."""
+        target, sender = self._connection(connection)
+        while time.monotonic() < end:
+            self._submit(self._next_transaction(), target, sender)
+    
+    def _connection(self, connection: int) -> tuple[str, str]:
+        """Nó alvo e remetente da conexão."""
+        return self.targets[connection % len(self.targets)], f"load-{connection}:{connection + 1}"
+    
+    def _next_transaction(self) -> Transaction:
+        """Transferência entre duas contas distintas."""
+        with self._lock:
+            origin, destination = self.random.sample(self.accounts, 2)
+        return Transaction(origin, destination, self.config.amount)
+    
+    def _submit(self, tx: Transaction, target: str, sender: str):
+        """Envia uma transação e registra quando o nó a processou (admitida ou não)."""
+        message = Protocol.new_transaction(tx.to_dict())
+        message.sender = sender
+        submitted = time.monotonic()
+        with self._lock:
+            self._submitted[tx.id] = submitted
+        
+        try:
+            response = self._request(target, message, sender)
+        except Exception as e:
+            self.logger.debug(f"Falha ao enviar para {target}: {e}")
+            with self._lock:
+                self._errors += 1
+            return
+        
+        with self._lock:
+            if response is not None and response.type == MessageType.BUSY:
+                if response.payload.get("reason") == Protocol.BUSY_RATE_LIMITED:
+                    self._rate_limited += 1
+                else:
+                    self._busy += 1
+            else:
+                self._processed[tx.id] = time.monotonic()
+    
+    def _request(self, target: str, message: Message, source: str) -> Message | None:
+        """Envia uma mensagem e lê a resposta (None se o nó só fechar a conexão)."""
+        with self.transport.connect(target, self.TIMEOUT, source=source) as conn:
+            conn.sendall(message.to_bytes())
+            length_data = conn.recv(4)
+            if not length_data:
+                return None
+            length = int.from_bytes(length_data, "big")
+            data = b""
+            while len(data) < length:
+                chunk = conn.recv(length - len(data))
+                if not chunk:
+                    break
+                data += chunk
+            return Message.from_bytes(data)
+    
+    # Confirmações
+    
+    def _observe(self):
+        """Consulta blocos novos no observador e registra as confirmações."""
+        source = "load-observer:0"
+        while self._observing:
+            start = self._height + 1
+            message = Protocol.request_blocks(start, start + self.BLOCKS_PER_POLL)
+            blocks = []
+            try:
+                response = self._request(self.observer, message, source)
+                if response is not None and response.type == MessageType.RESPONSE_BLOCKS:
+                    blocks = response.payload["blocks"]
+            except Exception as e:
+                self.logger.debug(f"Falha ao consultar {self.observer}: {e}")
+            
+            now = time.monotonic()
+            reorganized = False
+            with self._lock:
+                for block in blocks:
+                    tip = self._chain[-1][0]
+                    if tip is not None and block["previous_hash"] != tip:
+                        # O observador trocou de ramo: o topo visto ficou órfão
+                        self._rollback()
+                        reorganized = True
+                        break
+                    tx_ids = [tx["id"] for tx in block["transactions"]]
+                    for tx_id in tx_ids:
+                        self._confirmed.setdefault(tx_id, now)
+                    self._chain.append((block["hash"], tx_ids))
+                    self._height += 1
+            
+            if not reorganized and len(blocks) < self.BLOCKS_PER_POLL:
+                time.sleep(self.config.poll_interval)
+    
+    def _rollback(self):
+        """Descarta o último bloco observado e suas confirmações (com lock)."""
+        if len(self._chain) == 1:
+            # Troca de ramo anterior ao início da observação: aceita o novo ramo
+            self._chain[0] = (None, [])
+            return
+        
+        _, tx_ids = self._chain.pop()
+        self._height -= 1
+        for tx_id in tx_ids:
+            self._confirmed.pop(tx_id, None)
+        self._load_start = min(self._load_start, len(self._chain))
+    
+    def _tip(self) -> tuple[int, str]:
+        """Altura e hash do topo atual do observador."""
+        source = "load-observer:0"
+        response = self._request(self.observer, Protocol.request_headers(0, 0), source)
+        if response is None or response.type != MessageType.RESPONSE_HEADERS:
+            raise ConnectionError(f"Sem resposta de {self.observer}")
+        height = response.payload["tip"]
+        
+        response = self._request(self.observer, Protocol.request_headers(height, height + 1), source)
+        if (
+            response is None
+            or response.type != MessageType.RESPONSE_HEADERS
+            or not response.payload["headers"]
+        ):
+            raise ConnectionError(f"Sem resposta de {self.observer}")
+        return height, response.payload["headers"][0]["hash"]
+    
+    def _wait_confirmations(self):
+        """Espera até config.settle segundos pelas confirmações das processadas."""
+        deadline = time.monotonic() + self.config.settle
+        while time.monotonic() < deadline:
+            with self._lock:
+                if all(tx_id in self._confirmed for tx_id in self._processed):
+                    return
+            time.sleep(self.config.poll_interval)
+    
+    def _reset(self):
+        """Descarta os registros do financiamento antes da carga."""
+        with self._lock:
+            self._submitted.clear()
+            self._processed.clear()
+            self._load_start = len(self._chain)
+            self._busy = self._rate_limited = self._errors = 0
+
+
+def sweep(
+    node_counts: list[int],
+    block_sizes: list[int],
+    config: LoadConfig | None = None,
+    network: NetworkConfig | None = None,
+    miners: int = 1,
+    rate_limit: bool = False,
+) -> list[tuple[int, int, LoadReport]]:
+    """
+    Mede a vazão em redes simuladas para cada combinação de quantidade de
+    nós e tamanho máximo de bloco.
+    
+    Cada rede é montada pelo Simulator (InMemoryTransport); os `miners`
+    primeiros nós mineram continuamente e a carga é dividida entre todos.
+    Os limites de taxa dos nós ficam desativados, a menos que rate_limit
+    seja True (senão a medida é a do limite).
+    
+    Returns:
+        (nós, transações por bloco, relatório) de cada combinação
+    """
+    config = config or LoadConfig()
+    results = []
+    for nodes in node_counts:
+        for block_size in block_sizes:
+            simulator = Simulator(
+                dataclasses.replace(network or NetworkConfig(), nodes=nodes),
+                Workload(duration=0, tx_rate=0, miners=0),
+            )
+            simulator.build()
+            try:
+                for node in simulator.nodes:
+                    node.rate_limiter.enabled = rate_limit
+                for node in simulator.nodes[:miners]:
+                    node.start_mining_service(max_block_transactions=block_size)
+                
+                generator = LoadGenerator(
+                    [node.address for node in simulator.nodes], config, transport=simulator.transport
+                )
+                results.append((nodes, block_size, generator.run()))
+            finally:
+                simulator.stop()
+    return results
+
+
+def main():
+    """Gera carga pela linha de comando."""
+    parser = argparse.ArgumentParser(description="Gerador de carga de transações")
+    parser.add_argument("--target", nargs="+", default=[], help="Nós alvo (host:porta)")
+    parser.add_argument("--rate", type=float, default=50.0, help="Transações por segundo")
+    parser.add_argument("--closed-loop", action="store_true", help="Uma transação em voo por conexão")
+    parser.add_argument("--connections", type=int, default=8, help="Conexões simultâneas")
+    parser.add_argument("--accounts", type=int, default=50, help="Contas financiadas")
+    parser.add_argument("--duration", type=float, default=10.0, help="Duração da carga (s)")
+    parser.add_argument("--settle", type=float, default=5.0, help="Espera final por confirmações (s)")
+    parser.add_argument("--seed", type=int, help="Semente (reprodutibilidade)")
+    parser.add_argument("--simulate", action="store_true", help="Mede em redes simuladas")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1, 4], help="Nós por rede simulada")
+    parser.add_argument("--block-sizes", type=int, nargs="+", default=[100], help="Transações por bloco")
+    parser.add_argument("--miners", type=int, default=1, help="Nós mineradores (simulação)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Latência por mensagem (simulação)")
+    parser.add_argument(
+        "--rate-limit", action="store_true", help="Mantém os limites de taxa dos nós (simulação)"
+    )
+    args = parser.parse_args()
+    
+    config = LoadConfig(
+        accounts=args.accounts,
+        rate=None if args.closed_loop else args.rate,
+        connections=args.connections,
+        duration=args.duration,
+        settle=args.settle,
+        seed=args.seed,
+    )
+    
+    if not args.simulate:
+        if not args.target:
+            parser.error("informe --target ou --simulate")
+        print(LoadGenerator(args.target, config).run().format())
+        return
+    
+    network = NetworkConfig(latency=args.latency, seed=args.seed)
+    results = sweep(
+        args.nodes, args.block_sizes, config, network,
+        miners=args.miners, rate_limit=args.rate_limit,
+    )
+    for nodes, block_size, report in results:
+        print(f"\n=== {nodes} nós, até {block_size} transações por bloco ===")
+        print(report.format())
+
+
+if __name__ == "__main__":
+    main()
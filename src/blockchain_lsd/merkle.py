@@ -0,0 +1,61 @@
+"""
+Módulo de Árvore de Merkle
+"""
+
+import hashlib
+
+
+EMPTY_ROOT = "0" * 64
+
+
+def _hash_pair(left: str, right: str) -> str:
+    return hashlib.sha256((left + right).encode()).hexdigest()
+
+
+def _next_level(level: list[str]) -> list[str]:
+    if len(level) % 2:
+        level = level + [level[-1]]  # Duplica o último (como no Bitcoin)
+    return [_hash_pair(level[i], level[i + 1]) for i in range(0, len(level), 2)]
+
+
+def merkle_root(leaves: list[str]) -> str:
+    """Calcula a raiz de Merkle de uma lista de hashes (folhas)."""
+    if not leaves:
+        return EMPTY_ROOT
+    
+    level = leaves
+    while len(level) > 1:
+        level = _next_level(level)
+    return level[0]
+
+
+def merkle_proof(leaves: list[str], position: int) -> list[list[str]]:
+    """
+    Gera a prova de inclusão da folha na posição informada.
+    
+    A prova é uma lista de [hash irmão, lado], onde lado é "L" se o
+    irmão fica à esquerda e "R" se fica à direita.
+    """
+    proof = []
+    level = leaves
+    while len(level) > 1:
+        if len(level) % 2:
+            level = level + [level[-1]]
+        if position % 2:
+            proof.append([level[position - 1], "L"])
+        else:
+            proof.append([level[position + 1], "R"])
+        level = _next_level(level)
+        position //= 2
+    return proof
+
+
+def verify_merkle_proof(leaf: str, proof: list[list[str]], root: str) -> bool:
+    """Verifica se a folha pertence à árvore com a raiz informada."""
+    current = leaf
+    for sibling, side in proof:
+        if side == "L":
+            current = _hash_pair(sibling, current)
+        else:
+            current = _hash_pair(current, sibling)
+    return current == root
@@ -15,14 +15,33 @@ class Miner:
     Implementa o algoritmo de Proof of Work.
     
     O minerador deve encontrar um nonce tal que o hash do bloco
-    comece com a dificuldade especificada (ex: "000").
+    comece com a dificuldade especificada (ex: "000"). Com
+    max_block_transactions, cada bloco leva no máximo essa quantidade de
+    transações pendentes (as mais antigas primeiro).
     """
     
-    def __init__(self, blockchain: Blockchain, miner_address: str):
+    def __init__(
+        self,
+        blockchain: Blockchain,
+        miner_address: str,
+        max_block_transactions: int | None = None,
+    ):
         self.blockchain = blockchain
         self.miner_address = miner_address
+        self.max_block_transactions = max_block_transactions
         self.mining = False
     
+    @property
+    def max_block_transactions(self) -> int | None:
+        """Máximo de transações por bloco (None = todo o pool)."""
+        return self._max_block_transactions
+    
+    @max_block_transactions.setter
+    def max_block_transactions(self, value: int | None):
+        if value is not None and value < 1:
+            raise ValueError("Blocos precisam de ao menos uma transação")
+        self._max_block_transactions = value
+    
     def mine_block(
         self,
         transactions: list[Transaction] = None,
@@ -39,7 +58,7 @@ class Miner:
             Bloco minerado ou None se interrompido
         """
         if transactions is None:
-            transactions = self.blockchain.pending_transactions.copy()
+            transactions = self.blockchain.pending_transactions[:self.max_block_transactions]
         
         if not transactions:
             return None
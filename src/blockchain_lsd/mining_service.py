@@ -0,0 +1,216 @@
+"""
+Módulo de Mineração Contínua (serviço em segundo plano)
+"""
+
+import threading
+import time
+from typing import Callable
+
+from .block import Block
+from .blockchain import Blockchain
+
+
+class MiningService:
+    """
+    Minera continuamente em segundo plano sobre o topo atual da cadeia.
+    
+    Sempre que o topo da cadeia ou o pool de pendentes muda, um novo
+    template (bloco candidato) é montado imediatamente e as threads de
+    mineração abandonam o trabalho antigo ao fim do lote de nonces atual.
+    O trabalho obsoleto (stale_work_*) mede só as mudanças de topo: é o
+    tempo entre o refresh() do novo topo e uma thread começar o template novo.
+    
+    O hash de cada nonce roda em Python e segura o GIL, então threads > 1
+    não aumenta a taxa de hashes (as threads dividem o mesmo núcleo); o
+    parâmetro existe para dividir os nonces e como orçamento de threads.
+    
+    Configuração:
+    - threads: quantidade de threads de mineração (sem ganho de vazão sob o GIL)
+    - duty_cycle: fração do tempo gasta minerando (0 < duty_cycle <= 1)
+    - batch_size: nonces testados por lote antes de checar novo template
+    - max_block_transactions: transações por bloco (None = todo o pool)
+    """
+    
+    def __init__(
+        self,
+        blockchain: Blockchain,
+        on_block_found: Callable[[Block], None],
+        threads: int = 1,
+        duty_cycle: float = 1.0,
+        batch_size: int = 1000,
+        max_block_transactions: int | None = None,
+    ):
+        if threads < 1:
+            raise ValueError("Quantidade de threads deve ser positiva")
+        if not 0 < duty_cycle <= 1:
+            raise ValueError("Duty cycle deve estar em (0, 1]")
+        if max_block_transactions is not None and max_block_transactions < 1:
+            raise ValueError("Blocos precisam de ao menos uma transação")
+        
+        self.blockchain = blockchain
+        self.on_block_found = on_block_found
+        self.threads = threads
+        self.duty_cycle = duty_cycle
+        self.batch_size = batch_size
+        self.max_block_transactions = max_block_transactions
+        
+        self.running = False
+        self._workers: list[threading.Thread] = []
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._template: Block | None = None
+        self._changed_at: float | None = None  # refresh() do topo ainda não atendido
+        
+        self.stats = {
+            "templates": 0,
+            "mempool_templates": 0,  # Dos templates, os montados por mudança no pool
+            "blocks_found": 0,
+            "hashes": 0,
+            "stale_work_last": 0.0,
+            "stale_work_max": 0.0,
+            "stale_work_total": 0.0,
+            "stale_work_samples": 0,
+        }
+    
+    def start(self):
+        """Inicia as threads de mineração."""
+        if self.running:
+            return
+        
+        self.running = True
+        self.refresh()
+        
+        for worker_id in range(self.threads):
+            worker = threading.Thread(target=self._work, args=(worker_id,))
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+    
+    def stop(self):
+        """Para as threads de mineração."""
+        with self._condition:
+            self.running = False
+            self._generation += 1
+            self._condition.notify_all()
+        
+        for worker in self._workers:
+            worker.join(timeout=1)
+        self._workers.clear()
+    
+    def refresh(self, tip_changed: bool = True):
+        """
+        Monta um novo template sobre o topo atual da cadeia.
+        
+        Deve ser chamado quando chega um novo bloco (tip_changed=True) ou
+        uma nova transação (tip_changed=False; não entra no trabalho obsoleto).
+        """
+        changed_at = time.perf_counter()
+        with self.blockchain.lock:
+            transactions = self.blockchain.pending_transactions[:self.max_block_transactions]
+            template = None
+            if transactions:
+                template = Block(
+                    index=len(self.blockchain.chain),
+                    previous_hash=self.blockchain.last_block.hash,
+                    transactions=transactions,
+                    nonce=0,
+                    timestamp=time.time(),
+                )
+        
+        with self._condition:
+            self._generation += 1
+            self._template = template
+            if template is not None:
+                self.stats["templates"] += 1
+                if not tip_changed:
+                    self.stats["mempool_templates"] += 1
+                elif self._changed_at is None:
+                    self._changed_at = changed_at
+            self._condition.notify_all()
+    
+    def get_stats(self) -> dict[str, float]:
+        """Retorna estatísticas de mineração (inclui tempo de trabalho obsoleto)."""
+        with self._condition:
+            stats = dict(self.stats)
+        samples = stats.pop("stale_work_samples")
+        stats["stale_work_avg"] = stats["stale_work_total"] / samples if samples else 0.0
+        return stats
+    
+    def _work(self, worker_id: int):
+        """Loop de uma thread de mineração."""
+        generation = -1
+        block: Block | None = None
+        
+        while True:
+            with self._condition:
+                while self.running and self._template is None:
+                    self._condition.wait()
+                if not self.running:
+                    return
+                
+                if self._generation != generation:
+                    generation = self._generation
+                    template = self._template
+                    # Cópia própria: cada thread testa nonces disjuntos
+                    block = Block(
+                        index=template.index,
+                        previous_hash=template.previous_hash,
+                        transactions=template.transactions,
+                        nonce=worker_id,
+                        timestamp=template.timestamp,
+                    )
+                    self._record_stale_work()
+            
+            started = time.perf_counter()
+            found = self._mine_batch(block, generation)
+            elapsed = time.perf_counter() - started
+            
+            if found:
+                self._on_found(block, generation)
+            elif self.duty_cycle < 1:
+                time.sleep(elapsed * (1 - self.duty_cycle) / self.duty_cycle)
+    
+    def _mine_batch(self, block: Block, generation: int) -> bool:
+        """Testa um lote de nonces; retorna True se encontrou um hash válido."""
+        tried = 0
+        for _ in range(self.batch_size):
+            if self._generation != generation:
+                break
+            block.hash = block.calculate_hash()
+            tried += 1
+            if block.is_valid_hash(Blockchain.DIFFICULTY):
+                self._count_hashes(tried)
+                return True
+            block.nonce += self.threads
+        
+        self._count_hashes(tried)
+        return False
+    
+    def _count_hashes(self, tried: int):
+        """Soma os hashes de um lote (as threads atualizam o mesmo contador)."""
+        with self._condition:
+            self.stats["hashes"] += tried
+    
+    def _on_found(self, block: Block, generation: int):
+        """Entrega o bloco encontrado se o template ainda for o atual."""
+        with self._condition:
+            if self._generation != generation:
+                return
+            # Invalida o template até o chamador atualizar a cadeia
+            self._generation += 1
+            self._template = None
+            self.stats["blocks_found"] += 1
+        
+        self.on_block_found(block)
+    
+    def _record_stale_work(self):
+        """Registra o tempo entre a mudança do topo e o início do novo template (com lock)."""
+        if self._changed_at is None:
+            return
+        
+        stale = time.perf_counter() - self._changed_at
+        self._changed_at = None
+        self.stats["stale_work_last"] = stale
+        self.stats["stale_work_max"] = max(self.stats["stale_work_max"], stale)
+        self.stats["stale_work_total"] += stale
+        self.stats["stale_work_samples"] += 1
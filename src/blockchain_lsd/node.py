@@ -2,16 +2,29 @@
 Módulo do Nó da Rede P2P
 """
 
-import socket
+import ipaddress
+import itertools
+import queue
 import threading
+import time
 import logging
-from typing import Callable
+from dataclasses import dataclass
 
+from .backpressure import RateLimiter
 from .blockchain import Blockchain
-from .block import Block
+from .block import Block, BlockHeader, LazyBlock
+from .bloom import BloomFilter
+from .capture import MessageCapture
+from .events import EventBus
+from .merkle import merkle_proof, merkle_root
 from .transaction import Transaction
 from .miner import Miner
+from .mining_service import MiningService
+from .peers import PeerManager
 from .protocol import Protocol, Message, MessageType
+from .snapshot import ChainSnapshot, HistoryVerifier
+from .sync import PeerStats, SyncScheduler
+from .transport import Connection, TcpTransport
 
 
 logging.basicConfig(
@@ -20,47 +33,150 @@ logging.basicConfig(
 )
 
 
+@dataclass
+class LightPeer:
+    """Filtro de Bloom registrado por um cliente leve."""
+    address: str  # Endereço declarado pelo cliente (destino das atualizações)
+    bloom: BloomFilter
+    expires: float  # time.monotonic() em que o filtro expira sem novo FILTER_LOAD
+    tip: tuple[int, str] = (-1, "")  # Último cabeçalho enviado (altura, hash)
+
+
 class Node:
     """
     Representa um nó na rede P2P da blockchain.
     
     Responsabilidades:
     - Executar como processo independente
-    - Comunicar com outros nós via sockets
+    - Comunicar com outros nós (TCP ou rede simulada, via transporte)
     - Manter cópia local da blockchain
     - Minerar novos blocos
     - Propagar transações e blocos
+    
+    Eventos (novos blocos e transações, reorganizações) são publicados no
+    EventBus da blockchain (node.events) e entregues de forma assíncrona,
+    sem atrasar o processamento das mensagens.
+    
+    Controle de carga: conexões aceitas entram em uma fila limitada lida
+    por um pool fixo de leitores; as mensagens lidas passam por limites de
+    taxa por peer/tipo e entram em uma fila de prioridade limitada (blocos
+    antes de transações) processada por um pool fixo de workers. Quando
+    algum limite estoura, o remetente recebe BUSY com retry_after. Os
+    limites por peer usam o endereço remoto da conexão (o campo sender da
+    mensagem é declarado pelo próprio remetente), exceto para peers ativos
+    no mesmo host da conexão, que têm balde próprio pelo endereço anunciado
+    (vários nós em um mesmo computador não dividem o limite); cada mensagem
+    tem tamanho máximo e prazo total de leitura.
     """
     
     BUFFER_SIZE = 65536  # 64KB
+    READER_WORKERS = 4
+    HANDLER_WORKERS = 4
+    MAX_PENDING_CONNECTIONS = 64
+    MAX_QUEUED_MESSAGES = 256
+    READ_TIMEOUT = 5.0  # Prazo total para ler uma mensagem (não por recv)
+    MAX_MESSAGE_SIZE = 8 * 1024 * 1024  # Maior mensagem recebida aceita (8MB)
+    QUEUE_FULL_RETRY_AFTER = 1.0
+    MAX_BUSY_RETRIES = 2
+    
+    # Prioridade na fila de processamento (menor = antes)
+    MESSAGE_PRIORITY = {
+        MessageType.NEW_BLOCK: 0,
+        MessageType.NEW_TRANSACTION: 2,
+    }
+    DEFAULT_PRIORITY = 1
+    MAX_BLOCKS_PER_MESSAGE = 500
+    MAX_HEADERS_PER_MESSAGE = 2000
+    SNAPSHOT_RECENT_BLOCKS = 10
+    MAX_FILTERS = 100  # Clientes leves registrados ao mesmo tempo
+    MAX_FILTERS_PER_HOST = 4
+    FILTER_TTL = 600.0  # Filtro expira se não for renovado por FILTER_LOAD
+    MAX_FILTERED_BLOCKS_PER_MESSAGE = 500  # Blocos por MERKLE_BLOCKS (o cliente pagina)
+    MAX_FILTERED_MATCHES_PER_MESSAGE = 2000  # Encerra a página no fim do bloco que passar disso
+    HISTORY_ATTEMPTS = 3  # Rodadas pedindo o histórico do snapshot antes de recusá-lo
+    HISTORY_RETRY_DELAY = 5.0
+    CATCH_UP_INTERVAL = 2.0  # Intervalo mínimo entre sincronizações disparadas por blocos
     
-    def __init__(self, host: str = "localhost", port: int = 5000):
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 5000,
+        blockchain: Blockchain | None = None,
+        transport=None,
+    ):
         self.host = host
         self.port = port
         self.address = f"{host}:{port}"
         
-        self.blockchain = Blockchain()
+        self.blockchain = blockchain or Blockchain()
         self.miner = Miner(self.blockchain, self.address)
+        self.mining_service: MiningService | None = None
+        
+        self.peer_manager = PeerManager(self)  # Peers ativos e catálogo passivo
+        self.peer_stats: dict[str, PeerStats] = {}  # Desempenho no download
+        
+        # Filtros de clientes leves: (endereço remoto da conexão, endereço
+        # declarado) -> filtro; limitados por host e no total, com expiração
+        self.filters: dict[tuple[str, str], LightPeer] = {}
+        self._filters_lock = threading.Lock()
+        
+        # Chave compartilhada para assinar/verificar snapshots (opcional)
+        self.snapshot_key: str | None = None
+        # Resultado da verificação em segundo plano do histórico do snapshot
+        self.snapshot_verified: bool | None = None
+        
+        # Controle de carga das mensagens recebidas
+        self.rate_limiter = RateLimiter()
+        self._connections: queue.Queue = queue.Queue(maxsize=self.MAX_PENDING_CONNECTIONS)
+        self._messages: queue.PriorityQueue = queue.PriorityQueue(maxsize=self.MAX_QUEUED_MESSAGES)
+        self._sequence = itertools.count()
+        self.load_stats = {
+            "rate_limited": 0, "connections_rejected": 0, "messages_rejected": 0, "oversized": 0,
+        }
+        self._stats_lock = threading.Lock()
+        
+        # Sincronização disparada por blocos à frente do topo local
+        self._catching_up = False
+        self._last_catch_up = 0.0
+        self._catch_up_lock = threading.Lock()
         
-        self.peers: set[str] = set()  # Conjunto de peers conhecidos
-        self.server_socket: socket.socket | None = None
+        # Transporte: TCP real ou rede simulada (InMemoryTransport)
+        self.transport = transport or TcpTransport()
+        self.listener = None
         self.running = False
         
-        self.logger = logging.getLogger(f"Node:{port}")
+        # Gravação opcional das mensagens recebidas (replay.py)
+        self.capture: MessageCapture | None = None
+        
+        # Tempo de CPU gasto processando mensagens (medido por thread)
+        self.cpu_time = 0.0
+        self._cpu_lock = threading.Lock()
         
-        # Callbacks para eventos
-        self.on_new_block: Callable[[Block], None] | None = None
-        self.on_new_transaction: Callable[[Transaction], None] | None = None
+        self.logger = logging.getLogger(f"Node:{port}")
+    
+    @property
+    def events(self) -> EventBus:
+        """Barramento de eventos da blockchain local."""
+        return self.blockchain.events
+    
+    @property
+    def peers(self) -> set[str]:
+        """Peers ativos (cópia do conjunto do PeerManager)."""
+        return set(self.peer_manager.active)
     
     def start(self):
         """Inicia o servidor do nó."""
-        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.server_socket.bind((self.host, self.port))
-        self.server_socket.listen(10)
+        self.listener = self.transport.listen(self.host, self.port)
         
         self.running = True
         self.logger.info(f"Nó iniciado em {self.address}")
+        self.peer_manager.start()
+        
+        # Pools fixos de leitura e processamento
+        for _ in range(self.READER_WORKERS):
+            threading.Thread(target=self._read_connections, daemon=True).start()
+        for _ in range(self.HANDLER_WORKERS):
+            threading.Thread(target=self._process_queue, daemon=True).start()
         
         # Thread para aceitar conexões
         accept_thread = threading.Thread(target=self._accept_connections)
@@ -70,58 +186,193 @@ class Node:
     def stop(self):
         """Para o servidor do nó."""
         self.running = False
+        self.peer_manager.stop()
         self.miner.stop_mining()
-        if self.server_socket:
-            self.server_socket.close()
+        self.stop_mining_service()
+        if self.listener:
+            self.listener.close()
+        self.stop_capture()
+        self.events.close()
         self.logger.info("Nó encerrado")
     
     def _accept_connections(self):
-        """Loop para aceitar novas conexões."""
+        """Loop para aceitar novas conexões (enfileiradas para os leitores)."""
         while self.running:
             try:
-                client_socket, address = self.server_socket.accept()
-                client_thread = threading.Thread(
-                    target=self._handle_client,
-                    args=(client_socket, address)
-                )
-                client_thread.daemon = True
-                client_thread.start()
+                client_socket, address = self.listener.accept()
+                try:
+                    self._connections.put_nowait((client_socket, address))
+                except queue.Full:
+                    self._count_load("connections_rejected")
+                    self._reject(client_socket, self.QUEUE_FULL_RETRY_AFTER)
             except Exception as e:
                 if self.running:
                     self.logger.error(f"Erro ao aceitar conexão: {e}")
     
-    def _handle_client(self, client_socket: socket.socket, address: tuple):
-        """Processa mensagens de um cliente."""
+    def _read_connections(self):
+        """Worker do pool de leitura."""
+        while self.running:
+            try:
+                client_socket, address = self._connections.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self._handle_client(client_socket, address)
+    
+    def _process_queue(self):
+        """Worker do pool de processamento (mensagens por prioridade)."""
+        while self.running:
+            try:
+                _, _, message, client_socket, address = self._messages.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            
+            started = time.thread_time()
+            try:
+                response = self._process_message(message, address[0])
+                if response:
+                    client_socket.sendall(response.to_bytes())
+            except Exception as e:
+                self.logger.error(f"Erro ao processar cliente {address}: {e}")
+            finally:
+                client_socket.close()
+                self.add_cpu_time(time.thread_time() - started)
+    
+    def start_capture(self, path: str):
+        """Passa a gravar as mensagens recebidas em path (JSON Lines)."""
+        self.stop_capture()
+        self.capture = MessageCapture(path, self.address, self.blockchain)
+        self.logger.info(f"Gravando mensagens recebidas em {path}")
+    
+    def stop_capture(self):
+        """Encerra a gravação de mensagens, se ativa."""
+        capture, self.capture = self.capture, None
+        if capture:
+            capture.close()
+            self.logger.info(f"Gravação encerrada: {capture.count} mensagens em {capture.path}")
+    
+    def add_cpu_time(self, seconds: float):
+        """Acumula tempo de CPU atribuído a este nó."""
+        with self._cpu_lock:
+            self.cpu_time += seconds
+    
+    def _count_load(self, name: str):
+        """Incrementa um contador de load_stats."""
+        with self._stats_lock:
+            self.load_stats[name] += 1
+    
+    def _reject(
+        self, client_socket: Connection, retry_after: float, reason: str = Protocol.BUSY_OVERLOADED
+    ):
+        """Responde BUSY e fecha a conexão."""
         try:
+            client_socket.sendall(Protocol.busy(retry_after, reason).to_bytes())
+        except OSError:
+            pass
+        finally:
+            client_socket.close()
+    
+    def _handle_client(self, client_socket: Connection, address: tuple):
+        """
+        Lê a mensagem de um cliente e a encaminha para processamento.
+        
+        Aplica os limites de taxa e a fila limitada de mensagens. Com a
+        captura ativa, a mensagem é gravada antes de qualquer descarte.
+        """
+        queued = False
+        try:
+            deadline = time.monotonic() + self.READ_TIMEOUT
+            
             # Lê tamanho da mensagem (4 bytes)
-            length_data = client_socket.recv(4)
-            if not length_data:
+            length_data = self._recv_before(client_socket, 4, deadline)
+            if len(length_data) < 4:
                 return
             
             length = int.from_bytes(length_data, 'big')
+            if length > self.MAX_MESSAGE_SIZE:
+                self._count_load("oversized")
+                self.logger.warning(f"Mensagem de {length} bytes de {address} descartada")
+                return
             
             # Lê mensagem
             data = b""
             while len(data) < length:
-                chunk = client_socket.recv(min(self.BUFFER_SIZE, length - len(data)))
+                chunk = self._recv_before(client_socket, length - len(data), deadline)
                 if not chunk:
                     break
                 data += chunk
             
             if data:
+                capture = self.capture
+                if capture is not None:
+                    capture.record(data, address)
+                
                 message = Message.from_bytes(data)
-                response = self._process_message(message)
                 
-                if response:
-                    client_socket.sendall(response.to_bytes())
+                retry_after = self.rate_limiter.check(
+                    self._rate_limit_key(address, message), message.type
+                )
+                if retry_after:
+                    self._count_load("rate_limited")
+                    self._reject(client_socket, retry_after, Protocol.BUSY_RATE_LIMITED)
+                    return
+                
+                priority = self.MESSAGE_PRIORITY.get(message.type, self.DEFAULT_PRIORITY)
+                item = (priority, next(self._sequence), message, client_socket, address)
+                try:
+                    self._messages.put_nowait(item)
+                    queued = True
+                except queue.Full:
+                    self._count_load("messages_rejected")
+                    self._reject(client_socket, self.QUEUE_FULL_RETRY_AFTER)
         
         except Exception as e:
             self.logger.error(f"Erro ao processar cliente {address}: {e}")
         finally:
-            client_socket.close()
+            if not queued:
+                client_socket.close()
+    
+    def _rate_limit_key(self, address: tuple, message: Message) -> str:
+        """
+        Chave dos limites de taxa da mensagem.
+        
+        O endereço anunciado (sender) só é usado se for de um peer ativo
+        (verificado por PING) no mesmo host da conexão; caso contrário vale
+        o IP remoto, para que um host não escape dos limites variando o
+        sender declarado.
+        """
+        sender = message.sender
+        if sender in self.peer_manager.active:
+            host = sender.rpartition(":")[0]
+            if self._same_host(host, address[0]):
+                return sender
+        return address[0]
+    
+    @staticmethod
+    def _same_host(host: str, remote: str) -> bool:
+        """Verifica se o host anunciado é o da conexão (nomes locais = loopback)."""
+        if host == remote:
+            return True
+        try:
+            if not ipaddress.ip_address(remote).is_loopback:
+                return False
+            return host == "localhost" or ipaddress.ip_address(host).is_loopback
+        except ValueError:
+            return False
+    
+    def _recv_before(self, client_socket: Connection, size: int, deadline: float) -> bytes:
+        """recv() limitado ao prazo total da mensagem (TimeoutError se esgotado)."""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("Prazo de leitura da mensagem esgotado")
+        client_socket.settimeout(remaining)
+        return client_socket.recv(min(self.BUFFER_SIZE, size))
     
-    def _process_message(self, message: Message) -> Message | None:
-        """Processa uma mensagem recebida e retorna resposta se necessário."""
+    def _process_message(self, message: Message, remote: str = "") -> Message | None:
+        """
+        Processa uma mensagem recebida e retorna resposta se necessário.
+        
+        remote é o host da conexão (não declarado pelo remetente).
+        """
         self.logger.info(f"Mensagem recebida: {message.type.value} de {message.sender}")
         
         match message.type:
@@ -130,54 +381,99 @@ class Node:
                 transaction = Transaction.from_dict(tx_data)
                 if self.blockchain.add_transaction(transaction):
                     self.logger.info(f"Nova transação adicionada: {transaction.id[:8]}...")
+                    self._on_mempool_changed()
                     # Propaga para outros peers
                     self._broadcast(message, exclude=message.sender)
-                    if self.on_new_transaction:
-                        self.on_new_transaction(transaction)
+                    self._relay_to_filters(transaction)
             
             case MessageType.NEW_BLOCK:
                 block_data = message.payload["block"]
-                block = Block.from_dict(block_data)
+                block = LazyBlock.from_dict(block_data)
                 if self.blockchain.add_block(block):
                     self.logger.info(f"Novo bloco adicionado: #{block.index}")
                     # Para mineração atual (outro nó encontrou primeiro)
                     self.miner.stop_mining()
+                    self._on_chain_changed()
                     # Propaga para outros peers
                     self._broadcast(message, exclude=message.sender)
-                    if self.on_new_block:
-                        self.on_new_block(block)
+                elif block.index >= len(self.blockchain.chain):
+                    # Bloco à frente do topo (ou de outro ramo): faltam blocos
+                    # que o gossip não entregou
+                    self._schedule_catch_up()
             
             case MessageType.REQUEST_CHAIN:
-                return Protocol.response_chain(self.blockchain.to_dict())
+                if self.blockchain.is_pruned:
+                    self.logger.info("Cadeia podada: REQUEST_CHAIN ignorado")
+                    return None
+                with self.blockchain.lock:
+                    chain_json = self.blockchain.encoded_chain()
+                    pending = [tx.to_dict() for tx in self.blockchain.pending_transactions]
+                return Protocol.response_chain_encoded(chain_json, pending)
+            
+            case MessageType.REQUEST_BLOCKS:
+                start = message.payload["start"]
+                end = min(message.payload["end"], start + self.MAX_BLOCKS_PER_MESSAGE)
+                blocks = self.blockchain.get_blocks(start, end)
+                return Protocol.response_blocks_encoded([block.encode() for block in blocks])
+            
+            case MessageType.REQUEST_HEADERS:
+                start = max(message.payload["start"], 0)
+                end = min(message.payload["end"], start + self.MAX_HEADERS_PER_MESSAGE)
+                headers = [
+                    block.to_dict() if isinstance(block, BlockHeader)
+                    else block.header(with_merkle_root=False).to_dict()
+                    for block in self.blockchain.chain[start:end]
+                ]
+                return Protocol.response_headers(headers, len(self.blockchain.chain) - 1)
+            
+            case MessageType.REQUEST_SNAPSHOT:
+                recent = message.payload.get("recent", self.SNAPSHOT_RECENT_BLOCKS)
+                snapshot = self.blockchain.export_snapshot(recent)
+                if self.snapshot_key:
+                    snapshot.sign(self.snapshot_key)
+                return Protocol.response_snapshot(snapshot.to_dict())
             
             case MessageType.RESPONSE_CHAIN:
                 chain_data = message.payload["blockchain"]
-                new_chain = [Block.from_dict(b) for b in chain_data["chain"]]
+                new_chain = [LazyBlock.from_dict(b) for b in chain_data["chain"]]
                 if self.blockchain.replace_chain(new_chain):
                     self.logger.info(f"Blockchain atualizada: {len(new_chain)} blocos")
+                    self._on_chain_changed()
             
             case MessageType.PING:
                 return Protocol.pong()
             
             case MessageType.DISCOVER_PEERS:
-                return Protocol.peers_list(list(self.peers))
+                # O remetente também vira candidato a peer
+                self.peer_manager.learn([message.sender])
+                return Protocol.peers_list(self.peer_manager.advertised())
             
             case MessageType.PEERS_LIST:
-                new_peers = set(message.payload["peers"])
-                self.peers.update(new_peers - {self.address})
+                self.peer_manager.learn(message.payload["peers"])
+            
+            case MessageType.FILTER_LOAD:
+                bloom = BloomFilter.from_dict(message.payload["filter"])
+                from_height = message.payload.get("from_height", 0)
+                light_peer = self._register_filter(remote, message.sender, bloom)
+                if light_peer is None:
+                    self.logger.warning(f"Filtro de Bloom de {message.sender} recusado (limite)")
+                    return None
+                self.logger.info(f"Filtro de Bloom registrado por {message.sender}")
+                return self._filtered_blocks(light_peer, from_height)
         
         return None
     
     def connect_to_peer(self, peer_address: str) -> bool:
-        """Conecta a um peer e adiciona à lista."""
+        """
+        Conecta a um peer e adiciona ao conjunto ativo.
+        
+        Se o conjunto ativo estiver cheio, o peer fica no catálogo passivo.
+        """
         if peer_address == self.address:
             return False
         
         try:
-            host, port = peer_address.split(":")
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.connect((host, int(port)))
-                
+            with self.transport.connect(peer_address, timeout=10, source=self.address) as sock:
                 # Envia ping para verificar conexão
                 message = Protocol.ping()
                 message.sender = self.address
@@ -186,7 +482,7 @@ class Node:
                 # Aguarda pong
                 length_data = sock.recv(4)
                 if length_data:
-                    self.peers.add(peer_address)
+                    self.peer_manager.add(peer_address)
                     self.logger.info(f"Conectado ao peer: {peer_address}")
                     return True
         
@@ -196,31 +492,194 @@ class Node:
         return False
     
     def sync_blockchain(self):
-        """Sincroniza blockchain com os peers (baixa a cadeia mais longa)."""
+        """
+        Sincroniza blockchain com os peers.
+        
+        Baixa os blocos faltantes de todos os peers em paralelo; se nenhum
+        peer suportar download por faixas, baixa a cadeia completa.
+        """
+        result = SyncScheduler(self, self.peer_stats).run()
+        if result is None:
+            self._sync_full_chain()
+        elif result:
+            self._on_chain_changed()
+    
+    def _sync_full_chain(self):
+        """Sincroniza baixando a cadeia completa (a mais longa vence)."""
         for peer in list(self.peers):
             try:
                 response = self._send_message(peer, Protocol.request_chain())
                 if response and response.type == MessageType.RESPONSE_CHAIN:
                     chain_data = response.payload["blockchain"]
-                    new_chain = [Block.from_dict(b) for b in chain_data["chain"]]
+                    new_chain = [LazyBlock.from_dict(b) for b in chain_data["chain"]]
                     if self.blockchain.replace_chain(new_chain):
                         self.logger.info(f"Blockchain sincronizada de {peer}")
+                        self._on_chain_changed()
                         break
             except Exception as e:
                 self.logger.error(f"Erro ao sincronizar com {peer}: {e}")
     
+    def _schedule_catch_up(self):
+        """Sincroniza em segundo plano (no máximo uma vez por CATCH_UP_INTERVAL)."""
+        with self._catch_up_lock:
+            now = time.monotonic()
+            if self._catching_up or now - self._last_catch_up < self.CATCH_UP_INTERVAL:
+                return
+            self._catching_up = True
+            self._last_catch_up = now
+        threading.Thread(target=self._catch_up, daemon=True).start()
+    
+    def _catch_up(self):
+        """
+        Baixa os blocos que faltam e repropaga o novo topo.
+        
+        Repropagar o topo faz os vizinhos que também perderam blocos
+        dispararem a própria sincronização.
+        """
+        try:
+            tip = self.blockchain.last_block.hash
+            self.sync_blockchain()
+            last_block = self.blockchain.last_block
+            if last_block.hash != tip:
+                self._broadcast(
+                    Protocol.new_block_encoded(last_block.encode()),
+                    description=f"Bloco #{last_block.index}",
+                )
+        except Exception as e:
+            self.logger.error(f"Erro na sincronização de recuperação: {e}")
+        finally:
+            with self._catch_up_lock:
+                self._catching_up = False
+    
+    def export_snapshot(self, path: str, recent: int = SNAPSHOT_RECENT_BLOCKS):
+        """Grava em disco um snapshot da cadeia local."""
+        snapshot = self.blockchain.export_snapshot(recent)
+        if self.snapshot_key:
+            snapshot.sign(self.snapshot_key)
+        snapshot.save(path)
+        self.logger.info(f"Snapshot exportado: base #{snapshot.base_height}, topo #{snapshot.tip_height}")
+    
+    def bootstrap_from_snapshot(self) -> bool:
+        """
+        Inicializa a cadeia a partir do snapshot de um peer.
+        
+        O nó passa a operar a partir do snapshot imediatamente; o histórico
+        anterior é baixado e verificado em segundo plano.
+        """
+        for peer in list(self.peers):
+            response = self._send_message(peer, Protocol.request_snapshot(self.SNAPSHOT_RECENT_BLOCKS))
+            if not response or response.type != MessageType.RESPONSE_SNAPSHOT:
+                continue
+            
+            try:
+                snapshot = ChainSnapshot.from_dict(response.payload["snapshot"])
+            except (KeyError, ValueError) as e:
+                self.logger.error(f"Snapshot inválido de {peer}: {e}")
+                continue
+            
+            if self.load_snapshot(snapshot):
+                self.logger.info(f"Snapshot obtido de {peer}")
+                return True
+        
+        return False
+    
+    def load_snapshot(self, snapshot: ChainSnapshot) -> bool:
+        """Verifica e aplica um snapshot, iniciando a verificação do histórico."""
+        if snapshot.tip_height < len(self.blockchain.chain) - 1:
+            self.logger.warning("Snapshot mais curto que a cadeia local")
+            return False
+        
+        if not snapshot.verify(Blockchain.DIFFICULTY, self.snapshot_key):
+            self.logger.error("Snapshot reprovado na verificação")
+            return False
+        
+        self.blockchain.load_snapshot(snapshot)
+        self.snapshot_verified = None
+        self.logger.info(
+            f"Cadeia inicializada por snapshot: base #{snapshot.base_height}, "
+            f"topo #{snapshot.tip_height}"
+        )
+        self._on_chain_changed()
+        
+        verify_thread = threading.Thread(target=self._verify_snapshot_history, args=(snapshot,))
+        verify_thread.daemon = True
+        verify_thread.start()
+        return True
+    
+    def _verify_snapshot_history(self, snapshot: ChainSnapshot):
+        """
+        Baixa dos peers e verifica o histórico anterior ao snapshot.
+        
+        Se os saldos não conferem, ou se nenhum peer fornece o histórico
+        após HISTORY_ATTEMPTS rodadas, o snapshot é recusado: a cadeia volta
+        ao gênesis e é sincronizada por completo.
+        """
+        verifier = HistoryVerifier(snapshot)
+        keep_bodies = not self.blockchain.pruning_enabled
+        restored: list[Block] = []
+        attempts = 0
+        
+        while not verifier.complete:
+            start = verifier.next_height
+            end = min(start + self.MAX_BLOCKS_PER_MESSAGE, snapshot.base_height + 1)
+            progressed = False
+            
+            for peer in list(self.peers):
+                response = self._send_message(peer, Protocol.request_blocks(start, end))
+                if not response or response.type != MessageType.RESPONSE_BLOCKS:
+                    continue
+                
+                batch = [LazyBlock.from_dict(b) for b in response.payload["blocks"]]
+                if batch and verifier.feed(batch):
+                    if keep_bodies:
+                        restored.extend(batch)
+                    progressed = True
+                    break
+            
+            if progressed:
+                attempts = 0
+                continue
+            attempts += 1
+            if attempts >= self.HISTORY_ATTEMPTS:
+                self.logger.error(f"Nenhum peer forneceu o histórico a partir de #{start}")
+                self._reject_snapshot(snapshot)
+                return
+            time.sleep(self.HISTORY_RETRY_DELAY)
+        
+        if verifier.matches():
+            self.snapshot_verified = True
+            self.logger.info(f"Histórico do snapshot verificado até #{snapshot.base_height}")
+            self.blockchain.restore_history(restored)
+        else:
+            self.logger.error("Saldos do snapshot não conferem com o histórico!")
+            self._reject_snapshot(snapshot)
+    
+    def _reject_snapshot(self, snapshot: ChainSnapshot):
+        """Descarta a cadeia do snapshot e sincroniza a cadeia completa."""
+        self.snapshot_verified = False
+        # A cadeia pode já ter sido substituída por uma sincronização completa
+        if not self.blockchain.discard_snapshot(base=snapshot.headers[-1]):
+            return
+        self.logger.warning("Snapshot recusado; sincronizando a cadeia completa")
+        self._on_chain_changed()
+        self.sync_blockchain()
+    
     def broadcast_transaction(self, transaction: Transaction):
-        """Propaga uma transação para todos os peers."""
+        """Propaga uma transação para os peers (gossip)."""
         if self.blockchain.add_transaction(transaction):
             message = Protocol.new_transaction(transaction.to_dict())
             self._broadcast(message)
+            self._on_mempool_changed()
+            self._relay_to_filters(transaction)
     
-    def broadcast_block(self, block: Block):
-        """Propaga um bloco minerado para todos os peers."""
-        if self.blockchain.add_block(block):
-            message = Protocol.new_block(block.to_dict())
-            self._broadcast(message)
-            self.logger.info(f"Bloco #{block.index} propagado para {len(self.peers)} peers")
+    def broadcast_block(self, block: Block) -> bool:
+        """Propaga um bloco minerado para os peers (gossip); False se rejeitado."""
+        if not self.blockchain.add_block(block):
+            return False
+        message = Protocol.new_block_encoded(block.encode())
+        self._broadcast(message, description=f"Bloco #{block.index}")
+        self._on_chain_changed()
+        return True
     
     def mine(self) -> Block | None:
         """Inicia mineração de um novo bloco."""
@@ -237,41 +696,263 @@ class Node:
         
         return block
     
-    def _send_message(self, peer_address: str, message: Message) -> Message | None:
-        """Envia mensagem para um peer e retorna resposta."""
-        try:
-            host, port = peer_address.split(":")
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(10)
-                sock.connect((host, int(port)))
-                
-                message.sender = self.address
-                sock.sendall(message.to_bytes())
-                
-                # Aguarda resposta
-                length_data = sock.recv(4)
-                if length_data:
-                    length = int.from_bytes(length_data, 'big')
-                    data = b""
-                    while len(data) < length:
-                        chunk = sock.recv(min(self.BUFFER_SIZE, length - len(data)))
-                        if not chunk:
-                            break
-                        data += chunk
-                    if data:
-                        return Message.from_bytes(data)
+    def start_mining_service(
+        self,
+        threads: int = 1,
+        duty_cycle: float = 1.0,
+        max_block_transactions: int | None = None,
+    ):
+        """Inicia a mineração contínua em segundo plano."""
+        if self.mining_service:
+            return
         
-        except Exception as e:
-            self.logger.error(f"Erro ao enviar para {peer_address}: {e}")
+        self.mining_service = MiningService(
+            self.blockchain,
+            on_block_found=self._on_block_mined,
+            threads=threads,
+            duty_cycle=duty_cycle,
+            max_block_transactions=max_block_transactions,
+        )
+        self.mining_service.start()
+        self.logger.info(
+            f"Mineração contínua iniciada ({threads} threads, duty cycle {duty_cycle:.0%})"
+        )
+    
+    def stop_mining_service(self):
+        """Para a mineração contínua."""
+        if self.mining_service:
+            self.mining_service.stop()
+            self.mining_service = None
+            self.logger.info("Mineração contínua encerrada")
+    
+    def _on_block_mined(self, block: Block):
+        """Callback do serviço de mineração quando um bloco é encontrado."""
+        self.logger.info(f"Bloco minerado! #{block.index} hash={block.hash[:16]}...")
+        self.broadcast_block(block)
         
-        return None
+        # Bloco rejeitado (template obsoleto): serviço precisa de novo template.
+        # Compara por hash: no modo colunar o topo é uma visão, não o objeto minerado
+        if self.blockchain.last_block.hash != block.hash:
+            self._on_chain_changed()
     
-    def _broadcast(self, message: Message, exclude: str = ""):
-        """Envia mensagem para todos os peers."""
-        message.sender = self.address
-        for peer in list(self.peers):
-            if peer != exclude:
+    def _on_chain_changed(self):
+        """Reage a mudança no topo da cadeia."""
+        if self.mining_service:
+            self.mining_service.refresh()
+        self._push_filtered_blocks()
+    
+    def _on_mempool_changed(self):
+        """Reage a mudança no pool de transações pendentes."""
+        if self.mining_service:
+            self.mining_service.refresh(tip_changed=False)
+    
+    def _register_filter(self, remote: str, address: str, bloom: BloomFilter) -> LightPeer | None:
+        """
+        Registra (ou renova) o filtro de um cliente leve.
+        
+        A chave inclui o host da conexão, então um host não consegue ocupar
+        mais de MAX_FILTERS_PER_HOST entradas variando o sender declarado.
+        Retorna None se os limites estiverem cheios.
+        """
+        key = (remote, address)
+        now = time.monotonic()
+        with self._filters_lock:
+            self._expire_filters(now)
+            light_peer = self.filters.get(key)
+            if light_peer is not None:
+                light_peer.bloom = bloom
+                light_peer.expires = now + self.FILTER_TTL
+                return light_peer
+            
+            from_host = sum(1 for host, _ in self.filters if host == remote)
+            if from_host >= self.MAX_FILTERS_PER_HOST or len(self.filters) >= self.MAX_FILTERS:
+                return None
+            light_peer = LightPeer(address, bloom, now + self.FILTER_TTL)
+            self.filters[key] = light_peer
+            return light_peer
+    
+    def _active_filters(self) -> list[LightPeer]:
+        """Filtros ainda válidos (descarta os expirados)."""
+        with self._filters_lock:
+            self._expire_filters(time.monotonic())
+            return list(self.filters.values())
+    
+    def _expire_filters(self, now: float):
+        """Remove os filtros expirados (com lock)."""
+        for key in [key for key, peer in self.filters.items() if peer.expires <= now]:
+            del self.filters[key]
+    
+    def _filtered_blocks(self, light_peer: LightPeer, from_height: int) -> Message:
+        """
+        Monta uma página de cabeçalhos a partir de from_height e as
+        transações que casam com o filtro do cliente leve, cada uma com sua
+        prova de Merkle.
+        
+        A página tem no máximo MAX_FILTERED_BLOCKS_PER_MESSAGE blocos e
+        termina no primeiro bloco em que as transações passam de
+        MAX_FILTERED_MATCHES_PER_MESSAGE; o cliente pede o restante a partir
+        do último cabeçalho (o topo segue na resposta, como em
+        RESPONSE_HEADERS).
+        """
+        bloom = light_peer.bloom
+        chain = self.blockchain.chain
+        tip = len(chain) - 1
+        from_height = min(max(from_height, 0), tip)
+        headers = []
+        matches = []
+        
+        for block in chain[from_height:from_height + self.MAX_FILTERED_BLOCKS_PER_MESSAGE]:
+            if len(matches) >= self.MAX_FILTERED_MATCHES_PER_MESSAGE:
+                break
+            if isinstance(block, BlockHeader):
+                headers.append(block.to_dict())  # Bloco podado
+                continue
+            
+            # Folhas calculadas uma vez para a raiz e para as provas
+            leaves = [Transaction.hash_dict(tx) for tx in block._transaction_dicts()]
+            header = block.header(with_merkle_root=False)
+            header.merkle_root = merkle_root(leaves)
+            headers.append(header.to_dict())
+            
+            for position, tx in enumerate(block.transactions):
+                if self._matches_filter(bloom, tx):
+                    matches.append({
+                        "height": block.index,
+                        "transaction": tx.to_dict(),
+                        "proof": merkle_proof(leaves, position),
+                    })
+        
+        last = chain[from_height + len(headers) - 1]
+        light_peer.tip = (last.index, last.hash)
+        return Protocol.merkle_blocks(headers, matches, tip)
+    
+    def _push_filtered_blocks(self):
+        """Envia aos clientes leves os cabeçalhos e transações novos."""
+        chain = self.blockchain.chain
+        for light_peer in self._active_filters():
+            height, tip_hash = light_peer.tip
+            if height >= 0 and height < len(chain) and chain[height].hash == tip_hash:
+                from_height = height + 1
+            else:
+                from_height = 0  # Reorganização: reenvia tudo
+            
+            if from_height >= len(chain):
+                continue
+            
+            message = self._filtered_blocks(light_peer, from_height)
+            message.sender = self.address
+            threading.Thread(
+                target=self._send_message,
+                args=(light_peer.address, message)
+            ).start()
+    
+    def _relay_to_filters(self, transaction: Transaction):
+        """Envia transação pendente aos clientes leves interessados."""
+        for light_peer in self._active_filters():
+            if self._matches_filter(light_peer.bloom, transaction):
+                message = Protocol.new_transaction(transaction.to_dict())
+                message.sender = self.address
                 threading.Thread(
                     target=self._send_message,
-                    args=(peer, message)
+                    args=(light_peer.address, message)
                 ).start()
+    
+    @staticmethod
+    def _matches_filter(bloom: BloomFilter, transaction: Transaction) -> bool:
+        """Verifica se a transação interessa ao filtro."""
+        return (
+            transaction.origem in bloom
+            or transaction.destino in bloom
+            or transaction.id in bloom
+        )
+    
+    def _send_message(self, peer_address: str, message: Message) -> Message | None:
+        """
+        Envia mensagem para um peer e retorna resposta.
+        
+        Se o peer responder BUSY, aguarda o retry_after sugerido e tenta
+        novamente (até MAX_BUSY_RETRIES vezes).
+        """
+        return self._request(peer_address, message)[1]
+    
+    def _deliver(self, peer_address: str, message: Message) -> bool:
+        """Envia mensagem sem resposta esperada (gossip); True se o peer a recebeu."""
+        return self._request(peer_address, message)[0]
+    
+    def _request(self, peer_address: str, message: Message) -> tuple[bool, Message | None]:
+        """Envia com novas tentativas em BUSY; retorna (entregue, resposta)."""
+        for _ in range(self.MAX_BUSY_RETRIES + 1):
+            try:
+                response = self._exchange(peer_address, message)
+            except Exception as e:
+                self.logger.error(f"Erro ao enviar para {peer_address}: {e}")
+                self.peer_manager.record_failure(peer_address)
+                return False, None
+            if not response or response.type != MessageType.BUSY:
+                return True, response
+            retry_after = float(response.payload.get("retry_after", 1.0))
+            self.logger.debug(f"Peer {peer_address} ocupado; nova tentativa em {retry_after:.2f}s")
+            time.sleep(min(retry_after, self.READ_TIMEOUT))
+        
+        self.logger.warning(f"Peer {peer_address} ocupado; mensagem descartada")
+        return False, None
+    
+    def _send_once(self, peer_address: str, message: Message) -> Message | None:
+        """Envia mensagem uma vez (nova conexão) e retorna resposta."""
+        try:
+            return self._exchange(peer_address, message)
+        except Exception as e:
+            self.logger.error(f"Erro ao enviar para {peer_address}: {e}")
+            self.peer_manager.record_failure(peer_address)
+            return None
+    
+    def _exchange(self, peer_address: str, message: Message) -> Message | None:
+        """Envia mensagem em uma nova conexão e lê a resposta (exceções propagam)."""
+        with self.transport.connect(peer_address, timeout=10, source=self.address) as sock:
+            message.sender = self.address
+            sock.sendall(message.to_bytes())
+            
+            # Aguarda resposta
+            length_data = sock.recv(4)
+            if not length_data:
+                return None
+            length = int.from_bytes(length_data, 'big')
+            data = b""
+            while len(data) < length:
+                chunk = sock.recv(min(self.BUFFER_SIZE, length - len(data)))
+                if not chunk:
+                    break
+                data += chunk
+            return Message.from_bytes(data) if data else None
+    
+    def _broadcast(self, message: Message, exclude: str = "", description: str | None = None):
+        """
+        Propaga mensagem por gossip.
+        
+        Envia para um subconjunto aleatório dos peers ativos (fanout do
+        PeerManager); cada peer que aceita a mensagem a repassa adiante.
+        Peers que perderem um bloco o recuperam pela sincronização disparada
+        ao receber um bloco seguinte. Com description, registra no log
+        quantos envios foram entregues.
+        """
+        message.sender = self.address
+        targets = self.peer_manager.gossip_targets(exclude)
+        delivered: list[bool] = []
+        threads = [
+            threading.Thread(
+                target=lambda peer: delivered.append(self._deliver(peer, message)),
+                args=(peer,)
+            )
+            for peer in targets
+        ]
+        for thread in threads:
+            thread.start()
+        
+        if description is not None:
+            def report():
+                for thread in threads:
+                    thread.join()
+                self.logger.info(
+                    f"{description} propagado para {sum(delivered)}/{len(targets)} peers"
+                )
+            threading.Thread(target=report, daemon=True).start()
@@ -0,0 +1,212 @@
+"""
+Módulo de Gerenciamento de Peers (conjunto ativo limitado e descoberta)
+"""
+
+import math
+import random
+import threading
+from typing import TYPE_CHECKING
+
+from .protocol import Protocol, MessageType
+
+if TYPE_CHECKING:
+    from .node import Node
+
+
+class PeerManager:
+    """
+    Mantém a tabela de peers do nó com tamanho limitado.
+    
+    - Conjunto ativo (até max_active peers): recebem gossip e são usados
+      na sincronização; verificados periodicamente com PING
+    - Catálogo passivo (até max_passive endereços): endereços aprendidos
+      via PEERS_LIST, promovidos ao conjunto ativo quando há vaga
+    
+    O gossip vai para um subconjunto aleatório dos peers ativos com
+    tamanho ~ln(n) (n = tamanho estimado da rede), então o custo de
+    propagação por nó fica quase constante conforme a rede cresce.
+    """
+    
+    MAX_ACTIVE = 8
+    MAX_PASSIVE = 256
+    MIN_FANOUT = 3
+    MAX_FAILURES = 3
+    PING_INTERVAL = 10.0
+    DISCOVERY_INTERVAL = 30.0
+    MAX_ADVERTISED = 50  # Endereços enviados em cada PEERS_LIST
+    
+    def __init__(
+        self,
+        node: "Node",
+        max_active: int | None = None,
+        max_passive: int | None = None,
+    ):
+        self.node = node
+        self.max_active = max_active or self.MAX_ACTIVE
+        self.max_passive = max_passive or self.MAX_PASSIVE
+        
+        self.active: set[str] = set()
+        self.passive: set[str] = set()
+        self._failures: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+    
+    @property
+    def network_size(self) -> int:
+        """Estimativa do tamanho da rede (endereços conhecidos + este nó)."""
+        return len(self.active) + len(self.passive) + 1
+    
+    @property
+    def fanout(self) -> int:
+        """Quantidade de peers que recebem cada mensagem de gossip."""
+        target = max(self.MIN_FANOUT, math.ceil(math.log(self.network_size)) + 1)
+        return min(target, len(self.active))
+    
+    def start(self):
+        """Inicia a manutenção periódica (pings e descoberta)."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._maintain)
+        self._thread.daemon = True
+        self._thread.start()
+    
+    def stop(self):
+        """Para a manutenção periódica."""
+        self._stop.set()
+    
+    def add(self, address: str) -> bool:
+        """
+        Adiciona um peer já verificado (respondeu ao PING).
+        
+        Returns:
+            True se entrou no conjunto ativo, False se foi para o passivo
+        """
+        if address == self.node.address:
+            return False
+        
+        with self._lock:
+            self._failures.pop(address, None)
+            if address in self.active:
+                return True
+            if len(self.active) < self.max_active:
+                self.passive.discard(address)
+                self.active.add(address)
+                return True
+            self._add_passive(address)
+            return False
+    
+    def learn(self, addresses: list[str]):
+        """Registra endereços divulgados por outros peers no catálogo passivo."""
+        with self._lock:
+            for address in addresses:
+                if address and address != self.node.address and address not in self.active:
+                    self._add_passive(address)
+    
+    def remove(self, address: str):
+        """Remove o peer de ambos os conjuntos."""
+        with self._lock:
+            self.active.discard(address)
+            self.passive.discard(address)
+            self._failures.pop(address, None)
+    
+    def record_success(self, address: str):
+        """Registra resposta de um peer ativo."""
+        if address in self.active:
+            self._failures.pop(address, None)
+    
+    def record_failure(self, address: str):
+        """Registra falha de um peer ativo; remove após MAX_FAILURES seguidas."""
+        with self._lock:
+            if address not in self.active:
+                return
+            failures = self._failures.get(address, 0) + 1
+            self._failures[address] = failures
+            if failures < self.MAX_FAILURES:
+                return
+            
+            self.active.discard(address)
+            self._failures.pop(address, None)
+        self.node.logger.info(f"Peer {address} removido (sem resposta)")
+    
+    def gossip_targets(self, exclude: str = "") -> list[str]:
+        """Subconjunto aleatório dos peers ativos para propagar uma mensagem."""
+        with self._lock:
+            candidates = [peer for peer in self.active if peer != exclude]
+            fanout = self.fanout
+        return random.sample(candidates, min(fanout, len(candidates)))
+    
+    def advertised(self) -> list[str]:
+        """Endereços divulgados em PEERS_LIST (ativos e amostra dos passivos)."""
+        with self._lock:
+            peers = list(self.active)
+            passive = list(self.passive)
+        room = max(self.MAX_ADVERTISED - len(peers), 0)
+        return peers + random.sample(passive, min(room, len(passive)))
+    
+    def _add_passive(self, address: str):
+        """Adiciona ao catálogo passivo, descartando um endereço aleatório se cheio (com lock)."""
+        if address in self.passive:
+            return
+        if len(self.passive) >= self.max_passive:
+            self.passive.discard(random.choice(list(self.passive)))
+        self.passive.add(address)
+    
+    def _maintain(self):
+        """Loop de manutenção: pings, descoberta e preenchimento do conjunto ativo."""
+        elapsed_ping = elapsed_discovery = 0.0
+        tick = min(self.PING_INTERVAL, self.DISCOVERY_INTERVAL, 1.0)
+        
+        while not self._stop.wait(tick):
+            elapsed_ping += tick
+            elapsed_discovery += tick
+            
+            if elapsed_ping >= self.PING_INTERVAL:
+                elapsed_ping = 0.0
+                self.ping_active()
+            
+            if elapsed_discovery >= self.DISCOVERY_INTERVAL:
+                elapsed_discovery = 0.0
+                self.discover()
+            
+            self.fill_active()
+    
+    def ping_active(self):
+        """
+        Envia PING aos peers ativos.
+        
+        Falhas de conexão são registradas pelo próprio envio do nó
+        (record_failure), que remove o peer após MAX_FAILURES seguidas.
+        """
+        for peer in list(self.active):
+            if self._ping(peer):
+                self.record_success(peer)
+    
+    def discover(self):
+        """Pede a lista de peers a um peer ativo aleatório (DISCOVER_PEERS)."""
+        peers = list(self.active)
+        if not peers:
+            return
+        
+        peer = random.choice(peers)
+        response = self.node._send_message(peer, Protocol.discover_peers())
+        if response and response.type == MessageType.PEERS_LIST:
+            self.learn(response.payload["peers"])
+    
+    def fill_active(self):
+        """Promove endereços do catálogo passivo enquanto houver vagas."""
+        while len(self.active) < self.max_active:
+            with self._lock:
+                candidates = list(self.passive - self.active)
+                if not candidates:
+                    return
+                candidate = random.choice(candidates)
+                self.passive.discard(candidate)
+            
+            if self._ping(candidate):
+                self.add(candidate)
+                self.node.logger.info(f"Peer {candidate} promovido ao conjunto ativo")
+    
+    def _ping(self, peer: str) -> bool:
+        """Verifica se o peer responde (PONG)."""
+        response = self.node._send_once(peer, Protocol.ping())
+        return response is not None and response.type == MessageType.PONG
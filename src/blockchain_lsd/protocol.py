@@ -4,7 +4,7 @@ Módulo de Protocolo de Comunicação
 
 import json
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 
@@ -20,6 +20,15 @@ class MessageType(Enum):
     - PONG: resposta ao ping
     - DISCOVER_PEERS: descoberta de novos nós
     - PEERS_LIST: lista de peers conhecidos
+    - FILTER_LOAD: cliente leve registra seu filtro de Bloom
+    - MERKLE_BLOCKS: cabeçalhos e transações filtradas com provas de Merkle
+    - REQUEST_BLOCKS: solicitação de uma faixa de blocos
+    - RESPONSE_BLOCKS: envio de uma faixa de blocos
+    - REQUEST_SNAPSHOT: solicitação de snapshot para inicialização rápida
+    - RESPONSE_SNAPSHOT: envio do snapshot (saldos, cabeçalhos e blocos recentes)
+    - REQUEST_HEADERS: solicitação de uma faixa de cabeçalhos
+    - RESPONSE_HEADERS: envio de cabeçalhos e da altura do topo
+    - BUSY: nó sobrecarregado; remetente deve aguardar retry_after segundos
     """
     NEW_TRANSACTION = "NEW_TRANSACTION"
     NEW_BLOCK = "NEW_BLOCK"
@@ -29,14 +38,36 @@ class MessageType(Enum):
     PONG = "PONG"
     DISCOVER_PEERS = "DISCOVER_PEERS"
     PEERS_LIST = "PEERS_LIST"
+    FILTER_LOAD = "FILTER_LOAD"
+    MERKLE_BLOCKS = "MERKLE_BLOCKS"
+    REQUEST_BLOCKS = "REQUEST_BLOCKS"
+    RESPONSE_BLOCKS = "RESPONSE_BLOCKS"
+    REQUEST_SNAPSHOT = "REQUEST_SNAPSHOT"
+    RESPONSE_SNAPSHOT = "RESPONSE_SNAPSHOT"
+    REQUEST_HEADERS = "REQUEST_HEADERS"
+    RESPONSE_HEADERS = "RESPONSE_HEADERS"
+    BUSY = "BUSY"
 
 
 @dataclass
 class Message:
-    """Representa uma mensagem do protocolo."""
+    """
+    Representa uma mensagem do protocolo.
+    
+    O quadro serializado fica em cache por remetente, então um broadcast
+    serializa a mensagem uma única vez para todos os peers. Mensagens
+    recebidas guardam o JSON original: ao retransmitir, apenas o
+    remetente é trocado, sem re-serializar o payload. Por isso o payload
+    não deve ser alterado depois de enviado ou recebido.
+    
+    Mensagens montadas com encoded() já trazem o payload em JSON (ex.:
+    blocos com serialização em cache) e nunca o decodificam.
+    """
     type: MessageType
     payload: dict[str, Any]
     sender: str = ""  # host:port do remetente
+    _raw_prefix: bytes | None = field(default=None, repr=False, compare=False)
+    _frame: tuple[str, bytes] | None = field(default=None, repr=False, compare=False)
     
     def to_json(self) -> str:
         """Serializa mensagem para JSON."""
@@ -56,18 +87,51 @@ class Message:
             sender=parsed.get("sender", ""),
         )
     
+    @classmethod
+    def encoded(cls, message_type: MessageType, payload_json: bytes) -> "Message":
+        """
+        Cria mensagem com o payload já serializado em JSON.
+        
+        O campo payload fica vazio; o JSON recebido é enviado como está.
+        """
+        message = cls(type=message_type, payload={})
+        message._raw_prefix = (
+            b'{"type": ' + json.dumps(message_type.value).encode() + b', "payload": ' + payload_json
+        )
+        return message
+    
     def to_bytes(self) -> bytes:
         """Converte para bytes para envio via socket."""
-        json_str = self.to_json()
-        # Adiciona tamanho da mensagem no início (4 bytes)
-        length = len(json_str.encode())
-        return length.to_bytes(4, 'big') + json_str.encode()
+        cached = self._frame
+        if cached is not None and cached[0] == self.sender:
+            return cached[1]
+        
+        if self._raw_prefix is not None:
+            parts = [self._raw_prefix, self._sender_suffix(self.sender)]
+        else:
+            parts = [self.to_json().encode()]
+        # Adiciona tamanho da mensagem no início (4 bytes); uma única cópia
+        size = sum(len(part) for part in parts)
+        frame = b"".join([size.to_bytes(4, 'big'), *parts])
+        self._frame = (self.sender, frame)
+        return frame
     
     @classmethod
     def from_bytes(cls, data: bytes) -> "Message":
         """Cria mensagem a partir de bytes."""
         json_str = data.decode()
-        return cls.from_json(json_str)
+        message = cls.from_json(json_str)
+        
+        # Guarda o JSON original se veio no formato de to_json()
+        suffix = cls._sender_suffix(message.sender)
+        if data.endswith(suffix):
+            message._raw_prefix = data[:-len(suffix)]
+        return message
+    
+    @staticmethod
+    def _sender_suffix(sender: str) -> bytes:
+        """Trecho final do JSON de to_json() (o remetente é o último campo)."""
+        return b', "sender": ' + json.dumps(sender).encode() + b'}'
 
 
 class Protocol:
@@ -75,6 +139,10 @@ class Protocol:
     Factory para criação de mensagens do protocolo.
     """
     
+    # Motivo de uma resposta BUSY (campo "reason")
+    BUSY_RATE_LIMITED = "rate_limited"  # Limite de taxa do remetente
+    BUSY_OVERLOADED = "overloaded"  # Filas do nó cheias
+    
     @staticmethod
     def new_transaction(transaction_dict: dict) -> Message:
         """Cria mensagem de nova transação."""
@@ -91,6 +159,11 @@ class Protocol:
             payload={"block": block_dict},
         )
     
+    @staticmethod
+    def new_block_encoded(block_json: bytes) -> Message:
+        """Cria mensagem de novo bloco já serializado (Block.encode())."""
+        return Message.encoded(MessageType.NEW_BLOCK, b'{"block": ' + block_json + b'}')
+    
     @staticmethod
     def request_chain() -> Message:
         """Cria mensagem de solicitação da blockchain."""
@@ -107,6 +180,21 @@ class Protocol:
             payload={"blockchain": blockchain_dict},
         )
     
+    @staticmethod
+    def response_chain_encoded(chain_json: bytes | bytearray, pending: list[dict]) -> Message:
+        """
+        Resposta com a blockchain a partir da lista de blocos já em JSON.
+        
+        Equivale a response_chain() sem serializar os blocos novamente.
+        """
+        return Message.encoded(
+            MessageType.RESPONSE_CHAIN,
+            b"".join([
+                b'{"blockchain": {"chain": ', chain_json,
+                b', "pending_transactions": ', json.dumps(pending).encode(), b'}}',
+            ]),
+        )
+    
     @staticmethod
     def ping() -> Message:
         """Cria mensagem de ping."""
@@ -138,3 +226,83 @@ class Protocol:
             type=MessageType.PEERS_LIST,
             payload={"peers": peers},
         )
+    
+    @staticmethod
+    def filter_load(filter_dict: dict, from_height: int = 0) -> Message:
+        """Cria mensagem de registro de filtro de Bloom (cliente leve)."""
+        return Message(
+            type=MessageType.FILTER_LOAD,
+            payload={"filter": filter_dict, "from_height": from_height},
+        )
+    
+    @staticmethod
+    def merkle_blocks(headers: list[dict], matches: list[dict], tip: int) -> Message:
+        """Cria mensagem com cabeçalhos, transações filtradas com provas e o topo."""
+        return Message(
+            type=MessageType.MERKLE_BLOCKS,
+            payload={"headers": headers, "matches": matches, "tip": tip},
+        )
+    
+    @staticmethod
+    def request_blocks(start: int, end: int) -> Message:
+        """Cria mensagem de solicitação dos blocos com altura em [start, end)."""
+        return Message(
+            type=MessageType.REQUEST_BLOCKS,
+            payload={"start": start, "end": end},
+        )
+    
+    @staticmethod
+    def response_blocks(blocks: list[dict]) -> Message:
+        """Cria mensagem de resposta com uma faixa de blocos."""
+        return Message(
+            type=MessageType.RESPONSE_BLOCKS,
+            payload={"blocks": blocks},
+        )
+    
+    @staticmethod
+    def response_blocks_encoded(blocks: list[bytes]) -> Message:
+        """Resposta com uma faixa de blocos já serializados (Block.encode())."""
+        return Message.encoded(
+            MessageType.RESPONSE_BLOCKS,
+            b'{"blocks": [' + b", ".join(blocks) + b']}',
+        )
+    
+    @staticmethod
+    def request_snapshot(recent: int = 10) -> Message:
+        """Cria mensagem de solicitação de snapshot."""
+        return Message(
+            type=MessageType.REQUEST_SNAPSHOT,
+            payload={"recent": recent},
+        )
+    
+    @staticmethod
+    def response_snapshot(snapshot_dict: dict) -> Message:
+        """Cria mensagem de resposta com o snapshot."""
+        return Message(
+            type=MessageType.RESPONSE_SNAPSHOT,
+            payload={"snapshot": snapshot_dict},
+        )
+    
+    @staticmethod
+    def request_headers(start: int, end: int) -> Message:
+        """Cria mensagem de solicitação dos cabeçalhos com altura em [start, end)."""
+        return Message(
+            type=MessageType.REQUEST_HEADERS,
+            payload={"start": start, "end": end},
+        )
+    
+    @staticmethod
+    def response_headers(headers: list[dict], tip: int) -> Message:
+        """Cria mensagem de resposta com cabeçalhos e a altura do topo."""
+        return Message(
+            type=MessageType.RESPONSE_HEADERS,
+            payload={"headers": headers, "tip": tip},
+        )
+    
+    @staticmethod
+    def busy(retry_after: float, reason: str = BUSY_OVERLOADED) -> Message:
+        """Cria mensagem de sobrecarga com o tempo sugerido de espera e o motivo."""
+        return Message(
+            type=MessageType.BUSY,
+            payload={"retry_after": retry_after, "reason": reason},
+        )
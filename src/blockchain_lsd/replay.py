@@ -0,0 +1,270 @@
+"""
+Módulo de Replay (reproduz uma gravação de mensagens em um nó novo)
+
+Uso:
+    uv run python -m src.blockchain_lsd.replay captura.jsonl --fast
+"""
+
+import argparse
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+
+from .block import LazyBlock
+from .capture import CapturedMessage, read_capture
+from .node import Node
+from .protocol import Message, MessageType
+from .simulator import percentiles
+from .snapshot import ChainSnapshot
+from .transport import InMemoryTransport
+
+
+@dataclass
+class ReplayReport:
+    """Resultado de um replay (tempos em segundos)."""
+    messages: int
+    duration: float
+    throughput: float  # Mensagens por segundo
+    by_type: dict[str, int]
+    latency: dict[str, float]  # Envio até a resposta (ou o fechamento)
+    latency_by_type: dict[str, dict[str, float]]
+    busy: int
+    errors: int
+    height: int
+    tip: str
+    mempool: int
+    load_stats: dict[str, int]
+    cpu_time: float
+    schedule_lag: float = 0.0  # Maior atraso no envio (velocidade original)
+    
+    def format(self) -> str:
+        """Relatório em texto."""
+        def latencies(values: dict[str, float]) -> str:
+            return "  ".join(f"{name}={value * 1000:.1f}ms" for name, value in values.items())
+        
+        lines = [
+            f"Mensagens: {self.messages}  duração: {self.duration:.2f}s  "
+            f"vazão: {self.throughput:.1f} msg/s",
+            f"Latência: {latencies(self.latency)}",
+        ]
+        for name in sorted(self.by_type):
+            lines.append(
+                f"  {name} ({self.by_type[name]}): {latencies(self.latency_by_type[name])}"
+            )
+        lines += [
+            f"BUSY: {self.busy}  erros: {self.errors}  "
+            f"atraso máximo do envio: {self.schedule_lag * 1000:.0f}ms",
+            f"Estado final: #{self.height} {self.tip[:16]}...  mempool: {self.mempool}",
+            "Carga: " + "  ".join(f"{name}={value}" for name, value in self.load_stats.items()),
+            f"CPU do nó: {self.cpu_time:.3f}s",
+        ]
+        return "\n".join(lines)
+
+
+class Replayer:
+    """
+    Reproduz uma gravação (capture.py) em um Node novo.
+    
+    O nó parte do estado do cabeçalho da gravação (ou de um snapshot) e
+    escuta em um InMemoryTransport sem latência, então apenas o
+    processamento do nó entra nas medidas. Cada mensagem é reenviada em
+    uma conexão própria com o endereço de origem gravado, mantendo os
+    limites de taxa por peer. Com speed=None as mensagens são enviadas o
+    mais rápido possível por `concurrency` conexões simultâneas; caso
+    contrário respeitam os intervalos originais divididos por speed, por
+    uma única conexão: cada mensagem só é enviada depois que o nó terminou
+    a anterior, então a ordem da gravação (um bloco depois do pai) e o
+    estado final se reproduzem.
+    """
+    
+    PORT = 1
+    TIMEOUT = 10.0
+    
+    def __init__(
+        self,
+        path: str,
+        speed: float | None = 1.0,
+        concurrency: int = 8,
+        rate_limit: bool = True,
+        snapshot: str | None = None,
+        log_level: int = logging.CRITICAL,
+    ):
+        if speed is not None and speed <= 0:
+            raise ValueError("Velocidade deve ser positiva")
+        if concurrency < 1:
+            raise ValueError("É necessária ao menos uma conexão")
+        
+        self.path = path
+        self.speed = speed
+        self.concurrency = concurrency if speed is None else 1  # Ordem da gravação
+        self.header, self._messages = read_capture(path)
+        
+        self.transport = InMemoryTransport()
+        self.node = Node("replay", self.PORT, transport=self.transport)
+        self.node.logger.setLevel(log_level)
+        self.node.rate_limiter.enabled = rate_limit
+        self._load_state(snapshot)
+        
+        self._latencies: dict[str, list[float]] = {}
+        self._busy = 0
+        self._errors = 0
+        self._lock = threading.Lock()
+    
+    def run(self) -> ReplayReport:
+        """Reproduz a gravação e retorna o relatório."""
+        self.node.start()
+        self.node.peer_manager.stop()
+        
+        pending: queue.Queue = queue.Queue(maxsize=self.concurrency * 2)
+        workers = [
+            threading.Thread(target=self._send_loop, args=(pending,), daemon=True)
+            for _ in range(self.concurrency)
+        ]
+        for worker in workers:
+            worker.start()
+        
+        started = time.monotonic()
+        first = None
+        lag = 0.0
+        count = 0
+        try:
+            for captured in self._messages:
+                if self.speed is not None:
+                    first = captured.timestamp if first is None else first
+                    delay = started + (captured.timestamp - first) / self.speed - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    else:
+                        lag = max(lag, -delay)
+                pending.put(captured)
+                count += 1
+            
+            for _ in workers:
+                pending.put(None)
+            for worker in workers:
+                worker.join()
+            
+            report = self.report(count, time.monotonic() - started)
+            report.schedule_lag = lag
+            return report
+        finally:
+            self._messages.close()
+            self.node.stop()
+    
+    def report(self, count: int, duration: float) -> ReplayReport:
+        """Monta o relatório com as latências e o estado final do nó."""
+        blockchain = self.node.blockchain
+        with self._lock:
+            all_latencies = [value for values in self._latencies.values() for value in values]
+            return ReplayReport(
+                messages=count,
+                duration=duration,
+                throughput=count / duration if duration > 0 else 0.0,
+                by_type={name: len(values) for name, values in self._latencies.items()},
+                latency=percentiles(all_latencies),
+                latency_by_type={
+                    name: percentiles(values) for name, values in self._latencies.items()
+                },
+                busy=self._busy,
+                errors=self._errors,
+                height=len(blockchain.chain) - 1,
+                tip=blockchain.last_block.hash,
+                mempool=len(blockchain.pending_transactions),
+                load_stats=dict(self.node.load_stats),
+                cpu_time=self.node.cpu_time,
+            )
+    
+    def _load_state(self, snapshot: str | None):
+        """Leva o nó ao estado inicial da gravação."""
+        if snapshot is not None:
+            if not self.node.load_snapshot(ChainSnapshot.load(snapshot)):
+                raise ValueError(f"Snapshot inválido: {snapshot}")
+        elif "chain" in self.header:
+            chain = [LazyBlock.from_dict(block) for block in self.header["chain"]]
+            if len(chain) > 1 and not self.node.blockchain.replace_chain(chain):
+                raise ValueError(f"Cadeia inicial inválida em {self.path}")
+        elif self.header["height"] > 0:
+            raise ValueError(
+                f"{self.path} foi gravada em um nó podado: informe um snapshot do estado inicial"
+            )
+        
+        tip = self.node.blockchain.last_block.hash
+        if tip != self.header["tip"]:
+            self.node.logger.warning(
+                f"Estado inicial difere da gravação: {tip[:16]} != {self.header['tip'][:16]}"
+            )
+    
+    def _send_loop(self, pending: queue.Queue):
+        """Worker: envia mensagens até receber None."""
+        while True:
+            captured = pending.get()
+            if captured is None:
+                return
+            self._send(captured)
+    
+    def _send(self, captured: CapturedMessage):
+        """Envia uma mensagem gravada e mede o tempo até a resposta."""
+        try:
+            name = Message.from_bytes(captured.data).type.value
+        except Exception:
+            name = "invalid"
+        
+        started = time.perf_counter()
+        busy = failed = False
+        try:
+            with self.transport.connect(self.node.address, self.TIMEOUT, source=captured.peer) as conn:
+                conn.sendall(len(captured.data).to_bytes(4, "big") + captured.data)
+                response = self._read_response(conn)
+            busy = response is not None and response.type == MessageType.BUSY
+        except Exception:
+            failed = True
+        latency = time.perf_counter() - started
+        
+        with self._lock:
+            self._latencies.setdefault(name, []).append(latency)
+            self._busy += busy
+            self._errors += failed
+    
+    @staticmethod
+    def _read_response(conn) -> Message | None:
+        """Lê a resposta do nó (None se a conexão for fechada sem resposta)."""
+        length_data = conn.recv(4)
+        if not length_data:
+            return None
+        length = int.from_bytes(length_data, "big")
+        data = b""
+        while len(data) < length:
+            chunk = conn.recv(length - len(data))
+            if not chunk:
+                break
+            data += chunk
+        return Message.from_bytes(data)
+
+
+def main():
+    """Reproduz uma gravação pela linha de comando."""
+    parser = argparse.ArgumentParser(description="Replay de mensagens gravadas com --capture")
+    parser.add_argument("capture", help="Arquivo gravado pelo nó")
+    parser.add_argument("--speed", type=float, default=1.0, help="Fator sobre a velocidade original")
+    parser.add_argument("--fast", action="store_true", help="Envia o mais rápido possível")
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Conexões simultâneas (apenas com --fast)"
+    )
+    parser.add_argument("--no-rate-limit", action="store_true", help="Desativa os limites de taxa")
+    parser.add_argument("--snapshot", help="Snapshot do estado inicial (gravação de nó podado)")
+    args = parser.parse_args()
+    
+    replayer = Replayer(
+        args.capture,
+        speed=None if args.fast else args.speed,
+        concurrency=args.concurrency,
+        rate_limit=not args.no_rate_limit,
+        snapshot=args.snapshot,
+    )
+    print(replayer.run().format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+Módulo da API JSON-RPC (consultas para carteiras e exploradores)
+"""
+
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+from .block import Block
+from .blockchain import Blockchain
+
+# Códigos de erro do JSON-RPC 2.0
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class RPCError(Exception):
+    """Erro retornado ao cliente no campo "error" da resposta."""
+    
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class RPCServer:
+    """
+    Servidor JSON-RPC 2.0 sobre HTTP, ao lado do nó P2P.
+    
+    Atende em threads próprias e lê apenas dos índices da blockchain. A
+    trava da cadeia não é segurada durante a chamada inteira: cada leitura
+    composta trava só o necessário (trabalho limitado por MAX_ADDRESSES e
+    MAX_HISTORY_PAGE), e a conversão para JSON é feita fora dela, então
+    consultas grandes não bloqueiam o processamento P2P. Usa HTTP/1.1, então
+    conexões persistentes (keep-alive) e requisições em pipeline são
+    atendidas em sequência na mesma conexão. Aceita requisições em lote
+    (lista de chamadas em um único POST).
+    
+    Métodos:
+    - get_tip(): altura, hash e timestamp do topo
+    - get_balances(addresses): saldos (inclui pendentes)
+    - get_transaction(id): transação confirmada ou pendente
+    - get_block(height) / get_block_by_hash(hash): bloco completo
+      (ou apenas o cabeçalho, se podado)
+    - get_mempool(limit=None): transações pendentes
+    - get_history(address, offset=0, limit=50): histórico paginado
+    """
+    
+    MAX_BATCH_SIZE = 1000
+    MAX_ADDRESSES = 1000  # Endereços por get_balances
+    MAX_BODY_BYTES = 1 << 20  # 1MB
+    MAX_HISTORY_PAGE = 1000
+    
+    def __init__(self, blockchain: Blockchain, host: str = "localhost", port: int = 8545):
+        self.blockchain = blockchain
+        self.host = host
+        self.port = port
+        self.logger = logging.getLogger(f"RPC:{port}")
+        
+        self.methods: dict[str, Callable[..., Any]] = {
+            "get_tip": self.get_tip,
+            "get_balances": self.get_balances,
+            "get_transaction": self.get_transaction,
+            "get_block": self.get_block,
+            "get_block_by_hash": self.get_block_by_hash,
+            "get_mempool": self.get_mempool,
+            "get_history": self.get_history,
+        }
+        self._server: ThreadingHTTPServer | None = None
+    
+    @property
+    def address(self) -> str:
+        """Endereço HTTP do servidor (host:porta)."""
+        return f"{self.host}:{self.port}"
+    
+    def start(self):
+        """Inicia o servidor HTTP em segundo plano."""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        
+        thread = threading.Thread(target=self._server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.logger.info(f"API JSON-RPC em http://{self.address}")
+    
+    def stop(self):
+        """Para o servidor HTTP."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+    
+    def handle(self, body: bytes) -> dict | list | None:
+        """
+        Processa o corpo de uma requisição (chamada única ou lote).
+        
+        Returns:
+            Resposta JSON-RPC, lista de respostas, ou None se só havia
+            notificações (chamadas sem id)
+        """
+        try:
+            request = json.loads(body)
+        except (ValueError, UnicodeDecodeError):
+            return self._error(None, PARSE_ERROR, "JSON inválido")
+        
+        if isinstance(request, list):
+            if not request:
+                return self._error(None, INVALID_REQUEST, "Lote vazio")
+            if len(request) > self.MAX_BATCH_SIZE:
+                return self._error(None, INVALID_REQUEST, "Lote muito grande")
+            responses = [self._call(item) for item in request]
+            return [response for response in responses if response is not None] or None
+        
+        return self._call(request)
+    
+    def _call(self, request: Any) -> dict | None:
+        """Executa uma chamada JSON-RPC."""
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return self._error(None, INVALID_REQUEST, "Requisição inválida")
+        
+        request_id = request.get("id")
+        method = self.methods.get(request["method"])
+        params = request.get("params", [])
+        
+        try:
+            if method is None:
+                raise RPCError(METHOD_NOT_FOUND, f"Método desconhecido: {request['method']}")
+            if not isinstance(params, (dict, list)):
+                raise RPCError(INVALID_PARAMS, "params deve ser lista ou objeto")
+            if isinstance(params, dict):
+                result = method(**params)
+            else:
+                result = method(*params)
+            response = {"jsonrpc": "2.0", "result": result, "id": request_id}
+        except RPCError as e:
+            response = self._error(request_id, e.code, e.message)
+        except (TypeError, ValueError) as e:
+            response = self._error(request_id, INVALID_PARAMS, str(e))
+        except Exception as e:
+            self.logger.error(f"Erro em {request['method']}: {e}")
+            response = self._error(request_id, INTERNAL_ERROR, "Erro interno")
+        
+        if "id" not in request:
+            return None  # Notificação: sem resposta, nem de erro
+        return response
+    
+    @staticmethod
+    def _error(request_id: Any, code: int, message: str) -> dict:
+        """Monta uma resposta de erro."""
+        return {"jsonrpc": "2.0", "error": {"code": code, "message": message}, "id": request_id}
+    
+    # Métodos da API
+    
+    def get_tip(self) -> dict:
+        """Altura, hash e timestamp do topo da cadeia."""
+        with self.blockchain.lock:
+            block = self.blockchain.last_block
+            return {"height": block.index, "hash": block.hash, "timestamp": block.timestamp}
+    
+    def get_balances(self, addresses: list[str]) -> dict[str, float]:
+        """Saldos de vários endereços (inclui transações pendentes)."""
+        if isinstance(addresses, str):
+            addresses = [addresses]
+        addresses = list(addresses)
+        if len(addresses) > self.MAX_ADDRESSES:
+            raise RPCError(INVALID_PARAMS, f"Máximo de {self.MAX_ADDRESSES} endereços por chamada")
+        return self.blockchain.get_balances(addresses)
+    
+    def get_transaction(self, id: str) -> dict | None:
+        """Transação confirmada (com altura) ou pendente, pelo id."""
+        with self.blockchain.lock:
+            found = self.blockchain.get_transaction(id)
+            tip = len(self.blockchain.chain) - 1
+        if found is not None:
+            height, position, tx = found
+            return {
+                "transaction": tx.to_dict(),
+                "height": height,
+                "position": position,
+                "confirmations": tip - height + 1,
+            }
+        
+        for tx in list(self.blockchain.pending_transactions):
+            if tx.id == id:
+                return {"transaction": tx.to_dict(), "height": None, "confirmations": 0}
+        return None
+    
+    def get_block(self, height: int) -> dict | None:
+        """Bloco pela altura."""
+        if not isinstance(height, int) or isinstance(height, bool):
+            raise RPCError(INVALID_PARAMS, "height deve ser inteiro")
+        # Um bloco só (visões colunares leem as colunas, que mudam em reorganizações)
+        with self.blockchain.lock:
+            if not 0 <= height < len(self.blockchain.chain):
+                return None
+            return self._block_to_dict(
+                self.blockchain.get_block(height) or self.blockchain.chain[height]
+            )
+    
+    def get_block_by_hash(self, hash: str) -> dict | None:
+        """Bloco pelo hash."""
+        with self.blockchain.lock:
+            block = self.blockchain.get_block_by_hash(hash)
+            return self._block_to_dict(block) if block is not None else None
+    
+    def get_mempool(self, limit: int | None = None) -> list[dict]:
+        """Transações pendentes."""
+        if limit is not None:
+            self._check_count("limit", limit)
+        pending = list(self.blockchain.pending_transactions)
+        if limit is not None:
+            pending = pending[:limit]
+        return [tx.to_dict() for tx in pending]
+    
+    def get_history(self, address: str, offset: int = 0, limit: int = 50) -> dict:
+        """Página do histórico confirmado de um endereço."""
+        self._check_count("offset", offset)
+        self._check_count("limit", limit)
+        limit = min(limit, self.MAX_HISTORY_PAGE)
+        with self.blockchain.lock:
+            total = self.blockchain.count_history(address)
+            history = self.blockchain.get_history(address, offset, limit)
+        return {
+            "total": total,
+            "items": [
+                {"height": height, "position": position, "transaction": tx.to_dict()}
+                for height, position, tx in history
+            ],
+        }
+    
+    @staticmethod
+    def _check_count(name: str, value: Any):
+        """Valida offsets e limites (inteiros não negativos)."""
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            raise RPCError(INVALID_PARAMS, f"{name} deve ser inteiro não negativo")
+    
+    def _block_to_dict(self, block) -> dict:
+        """Bloco completo, ou cabeçalho marcado como podado."""
+        data = block.to_dict()
+        data["pruned"] = not isinstance(block, Block)
+        return data
+    
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        """Cria a classe de handler HTTP ligada a este servidor."""
+        rpc = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive e pipeline
+            
+            def do_POST(self):
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    self.send_error(400)
+                    return
+                if length > rpc.MAX_BODY_BYTES:
+                    self.send_error(413)
+                    return
+                
+                response = rpc.handle(self.rfile.read(length))
+                body = json.dumps(response).encode() if response is not None else b""
+                
+                self.send_response(200 if body else 204)
+                if body:
+                    self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                rpc.logger.debug(format % args)
+        
+        return Handler
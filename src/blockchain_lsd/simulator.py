@@ -0,0 +1,417 @@
+"""
+Módulo de Simulação de Rede (vários nós em um único processo)
+
+Uso:
+    uv run python -m src.blockchain_lsd.simulator --nodes 100 --topology random
+"""
+
+import argparse
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+
+from .events import Event, EventType
+from .node import Node
+from .transaction import Transaction
+from .transport import InMemoryTransport
+
+TOPOLOGIES = ("ring", "mesh", "star", "random")
+ACTIONS = ("tx", "mine")
+
+
+@dataclass
+class NetworkConfig:
+    """Rede simulada: quantidade de nós, topologia e características dos enlaces."""
+    nodes: int = 20
+    topology: str = "random"  # ring | mesh | star | random
+    degree: int = 4  # Vizinhos por nó na topologia random
+    latency: float = 0.05  # Segundos por mensagem
+    jitter: float = 0.01
+    bandwidth: float | None = None  # Bytes/s por enlace, dividida entre as conexões (None = ilimitada)
+    loss: float = 0.0  # Probabilidade de uma conexão falhar
+    workers: int = 2  # Threads de leitura e de processamento por nó
+    discovery: bool = False  # Mantém descoberta/pings (altera a topologia)
+    seed: int | None = None
+
+
+@dataclass
+class Workload:
+    """
+    Carga aplicada à rede.
+    
+    Sem script, transações (coinbase) chegam a nós aleatórios à taxa
+    tx_rate e blocos são minerados pelos `miners` primeiros nós a cada
+    block_interval segundos em média. Com script, apenas os eventos
+    (instante, "tx" | "mine", índice do nó) são executados.
+    """
+    duration: float = 10.0
+    tx_rate: float = 5.0  # Transações por segundo na rede toda
+    block_interval: float = 2.0
+    miners: int = 3
+    settle: float = 2.0  # Espera final para a propagação terminar
+    script: list[tuple[float, str, int]] = field(default_factory=list)
+
+
+@dataclass
+class SimulationReport:
+    """Resultado de uma simulação (tempos em segundos)."""
+    nodes: int
+    duration: float
+    transactions: int
+    tx_propagation: dict[str, float]
+    tx_coverage: float
+    blocks_mined: int
+    block_propagation: dict[str, float]
+    block_coverage: float
+    stale_blocks: int  # Rejeitados pelo próprio minerador (template obsoleto)
+    orphaned_blocks: int  # Aceitos localmente, fora da cadeia final
+    fork_rate: float
+    final_height: int
+    agreement: float  # Fração dos nós no topo da cadeia final
+    cpu_time: dict[str, float]
+    network: dict[str, int]
+    schedule_lag: float = 0.0  # Maior atraso de um evento (host saturado se alto)
+    
+    def format(self) -> str:
+        """Relatório em texto."""
+        def percentiles(values: dict[str, float]) -> str:
+            return "  ".join(f"{name}={value * 1000:.0f}ms" for name, value in values.items())
+        
+        cpu = sorted(self.cpu_time.values())
+        lines = [
+            f"Nós: {self.nodes}  duração: {self.duration:.1f}s",
+            f"Transações: {self.transactions}  cobertura: {self.tx_coverage:.1%}",
+            f"  propagação: {percentiles(self.tx_propagation)}",
+            f"Blocos minerados: {self.blocks_mined}  cobertura: {self.block_coverage:.1%}",
+            f"  propagação: {percentiles(self.block_propagation)}",
+            f"  obsoletos: {self.stale_blocks}  órfãos: {self.orphaned_blocks}  "
+            f"taxa de fork: {self.fork_rate:.1%}",
+            f"Cadeia final: #{self.final_height}  nós de acordo: {self.agreement:.1%}",
+            f"Atraso máximo do agendador: {self.schedule_lag * 1000:.0f}ms",
+        ]
+        if cpu:
+            lines.append(
+                f"CPU por nó: min={cpu[0]:.3f}s  mediana={cpu[len(cpu) // 2]:.3f}s  "
+                f"max={cpu[-1]:.3f}s  total={sum(cpu):.3f}s"
+            )
+        lines.append(
+            "Rede: " + "  ".join(f"{name}={value}" for name, value in self.network.items())
+        )
+        return "\n".join(lines)
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    """p50/p90/p99/max de uma lista de valores (posto mais próximo)."""
+    if not values:
+        return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+    values = sorted(values)
+    
+    def rank(p: float) -> float:
+        return values[min(len(values) - 1, max(0, round(p * len(values)) - 1))]
+    
+    return {"p50": rank(0.50), "p90": rank(0.90), "p99": rank(0.99), "max": values[-1]}
+
+
+class Simulator:
+    """
+    Executa vários Node em um processo sobre um InMemoryTransport.
+    
+    A topologia é montada diretamente nas tabelas de peers (sem handshake),
+    então a rede fica pronta de imediato mesmo com centenas de nós. Cada
+    item (transação ou bloco) tem o instante de origem registrado; os
+    eventos de cada nó (EventBus) registram quando ele o aceitou, o que dá
+    os percentis de propagação e a cobertura.
+    """
+    
+    BASE_PORT = 1
+    EVENT_QUEUE_SIZE = 10000
+    
+    def __init__(
+        self,
+        config: NetworkConfig | None = None,
+        workload: Workload | None = None,
+        log_level: int = logging.CRITICAL,
+    ):
+        self.config = config or NetworkConfig()
+        self.workload = workload or Workload()
+        if self.config.topology not in TOPOLOGIES:
+            raise ValueError(f"Topologia desconhecida: {self.config.topology}")
+        if self.config.nodes < 1:
+            raise ValueError("A rede precisa de pelo menos um nó")
+        for _, action, index in self.workload.script:
+            if action not in ACTIONS or not 0 <= index < self.config.nodes:
+                raise ValueError(f"Evento inválido no script: {action} no nó {index}")
+        
+        self.random = random.Random(self.config.seed)
+        self.transport = InMemoryTransport(
+            latency=self.config.latency,
+            jitter=self.config.jitter,
+            bandwidth=self.config.bandwidth,
+            loss=self.config.loss,
+            seed=self.config.seed,
+        )
+        self.log_level = log_level
+        self.nodes: list[Node] = []
+        
+        # Item -> instante de origem; item -> {nó: instante de chegada}
+        self._origins: dict[str, float] = {}
+        self._arrivals: dict[str, dict[int, float]] = {}
+        self._kinds: dict[str, str] = {}
+        self._mined: list[tuple[int, str, bool]] = []  # (nó, hash, aceito localmente)
+        self._lock = threading.Lock()
+        self._workers: list[threading.Thread] = []
+    
+    def build(self):
+        """Cria e inicia os nós e conecta a topologia."""
+        for i in range(self.config.nodes):
+            # Um host por nó: os limites de taxa são por endereço remoto
+            node = Node(f"sim{i}", self.BASE_PORT + i, transport=self.transport)
+            node.READER_WORKERS = node.HANDLER_WORKERS = self.config.workers
+            node.logger.setLevel(self.log_level)
+            node.events.subscribe(
+                lambda event, i=i: self._arrived(event, i),
+                types=(EventType.NEW_TRANSACTION, EventType.NEW_BLOCK),
+                maxsize=self.EVENT_QUEUE_SIZE,
+            )
+            self.nodes.append(node)
+        
+        neighbours = self.topology()
+        for node, peers in zip(self.nodes, neighbours):
+            node.peer_manager.max_active = max(node.peer_manager.max_active, len(peers))
+            for peer in peers:
+                node.peer_manager.add(self.nodes[peer].address)
+        
+        for node in self.nodes:
+            node.start()
+            if not self.config.discovery:
+                node.peer_manager.stop()
+    
+    def topology(self) -> list[set[int]]:
+        """Vizinhos (índices) de cada nó; as ligações são bidirecionais."""
+        n = self.config.nodes
+        neighbours: list[set[int]] = [set() for _ in range(n)]
+        
+        def link(a: int, b: int):
+            if a != b:
+                neighbours[a].add(b)
+                neighbours[b].add(a)
+        
+        match self.config.topology:
+            case "ring":
+                for i in range(n):
+                    link(i, (i + 1) % n)
+            case "mesh":
+                for i in range(n):
+                    for j in range(i + 1, n):
+                        link(i, j)
+            case "star":
+                for i in range(1, n):
+                    link(0, i)
+            case "random":
+                # Anel garante conectividade; o resto são ligações aleatórias
+                for i in range(n):
+                    link(i, (i + 1) % n)
+                degree = min(self.config.degree, n - 1)
+                for i in range(n):
+                    candidates = [j for j in range(n) if j != i and j not in neighbours[i]]
+                    self.random.shuffle(candidates)
+                    while len(neighbours[i]) < degree and candidates:
+                        link(i, candidates.pop())
+        
+        return neighbours
+    
+    def events(self) -> list[tuple[float, str, int]]:
+        """Eventos da carga ordenados por instante."""
+        if self.workload.script:
+            return sorted(self.workload.script)
+        
+        events = []
+        duration = self.workload.duration
+        if self.workload.tx_rate > 0:
+            t = self.random.expovariate(self.workload.tx_rate)
+            while t < duration:
+                events.append((t, "tx", self.random.randrange(self.config.nodes)))
+                t += self.random.expovariate(self.workload.tx_rate)
+        
+        miners = min(self.workload.miners, self.config.nodes)
+        if miners > 0 and self.workload.block_interval > 0:
+            t = self.random.expovariate(1 / self.workload.block_interval)
+            while t < duration:
+                events.append((t, "mine", self.random.randrange(miners)))
+                t += self.random.expovariate(1 / self.workload.block_interval)
+        
+        return sorted(events)
+    
+    def run(self) -> SimulationReport:
+        """Monta a rede, executa a carga e retorna o relatório."""
+        if not self.nodes:
+            self.build()
+        
+        started = time.monotonic()
+        lag = 0.0
+        try:
+            for at, action, index in self.events():
+                delay = started + at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    lag = max(lag, -delay)
+                
+                if action == "tx":
+                    self._submit_transaction(index)
+                else:
+                    # Mineração bloqueia: roda em thread para não atrasar a carga
+                    worker = threading.Thread(target=self._mine, args=(index,), daemon=True)
+                    worker.start()
+                    self._workers.append(worker)
+            
+            remaining = started + self.workload.duration - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+            for worker in self._workers:
+                worker.join(timeout=self.workload.settle)
+            time.sleep(self.workload.settle)
+            
+            report = self.report(time.monotonic() - started)
+            report.schedule_lag = lag
+            return report
+        finally:
+            self.stop()
+    
+    def stop(self):
+        """Para todos os nós."""
+        for node in self.nodes:
+            node.stop()
+    
+    def _submit_transaction(self, index: int):
+        """Cria uma transação no nó index e a propaga."""
+        node = self.nodes[index]
+        tx = Transaction("coinbase", f"user{self.random.randrange(1000)}", 1)
+        self._origin(tx.id, "tx", index)
+        node.broadcast_transaction(tx)
+    
+    def _mine(self, index: int):
+        """Minera um bloco no nó index (tempo de CPU atribuído ao nó)."""
+        node = self.nodes[index]
+        started = time.thread_time()
+        block = node.miner.mine_block()
+        node.add_cpu_time(time.thread_time() - started)
+        if block is None:
+            return  # Interrompido por outro bloco ou mempool vazio
+        
+        self._origin(block.hash, "block", index)
+        # Aceito por add_block, não pelo topo depois da propagação (outro
+        # bloco pode ter chegado); a cadeia final é comparada por hash
+        accepted = node.broadcast_block(block)
+        with self._lock:
+            self._mined.append((index, block.hash, accepted))
+    
+    def _origin(self, item: str, kind: str, index: int):
+        """Registra a criação de um item no nó index."""
+        with self._lock:
+            self._origins[item] = time.time()
+            self._kinds[item] = kind
+            self._arrivals.setdefault(item, {})[index] = self._origins[item]
+    
+    def _arrived(self, event: Event, index: int):
+        """Assinante: o nó index aceitou o item (instante da publicação)."""
+        if event.type == EventType.NEW_BLOCK:
+            item = event.data.hash
+        else:
+            item = event.data.id
+        with self._lock:
+            self._arrivals.setdefault(item, {}).setdefault(index, event.timestamp)
+    
+    def report(self, duration: float) -> SimulationReport:
+        """Consolida as medições."""
+        n = len(self.nodes)
+        delays: dict[str, list[float]] = {"tx": [], "block": []}
+        coverage: dict[str, list[float]] = {"tx": [], "block": []}
+        
+        with self._lock:
+            for item, origin in self._origins.items():
+                kind = self._kinds[item]
+                arrivals = self._arrivals.get(item, {})
+                delays[kind].extend(at - origin for at in arrivals.values() if at > origin)
+                coverage[kind].append(len(arrivals) / n)
+            mined = list(self._mined)
+        
+        # Cadeia final: a mais longa (empate: o topo mais comum)
+        tips: dict[str, int] = {}
+        for node in self.nodes:
+            tips[node.blockchain.last_block.hash] = tips.get(node.blockchain.last_block.hash, 0) + 1
+        best = max(
+            self.nodes,
+            key=lambda node: (len(node.blockchain.chain), tips[node.blockchain.last_block.hash]),
+        )
+        canonical = {block.hash for block in best.blockchain.chain}
+        
+        accepted = [block_hash for _, block_hash, ok in mined if ok]
+        orphaned = sum(1 for block_hash in accepted if block_hash not in canonical)
+        
+        return SimulationReport(
+            nodes=n,
+            duration=duration,
+            transactions=len(coverage["tx"]),
+            tx_propagation=percentiles(delays["tx"]),
+            tx_coverage=_mean(coverage["tx"]),
+            blocks_mined=len(mined),
+            block_propagation=percentiles(delays["block"]),
+            block_coverage=_mean(coverage["block"]),
+            stale_blocks=len(mined) - len(accepted),
+            orphaned_blocks=orphaned,
+            fork_rate=orphaned / len(accepted) if accepted else 0.0,
+            final_height=len(best.blockchain.chain) - 1,
+            agreement=tips[best.blockchain.last_block.hash] / n,
+            cpu_time={node.address: node.cpu_time for node in self.nodes},
+            network=dict(self.transport.stats),
+        )
+
+
+def _mean(values: list[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+def main():
+    """Executa uma simulação pela linha de comando."""
+    parser = argparse.ArgumentParser(description="Simulador de rede em um único processo")
+    parser.add_argument("--nodes", type=int, default=20, help="Quantidade de nós")
+    parser.add_argument("--topology", choices=TOPOLOGIES, default="random", help="Topologia")
+    parser.add_argument("--degree", type=int, default=4, help="Vizinhos por nó (random)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Latência por mensagem (s)")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Variação da latência (s)")
+    parser.add_argument("--bandwidth", type=float, help="Banda por enlace (bytes/s)")
+    parser.add_argument("--loss", type=float, default=0.0, help="Probabilidade de perda de conexão")
+    parser.add_argument("--duration", type=float, default=10.0, help="Duração da carga (s)")
+    parser.add_argument("--tx-rate", type=float, default=5.0, help="Transações por segundo")
+    parser.add_argument("--block-interval", type=float, default=2.0, help="Intervalo médio entre blocos (s)")
+    parser.add_argument("--miners", type=int, default=3, help="Nós mineradores")
+    parser.add_argument("--discovery", action="store_true", help="Mantém descoberta de peers ativa")
+    parser.add_argument("--seed", type=int, help="Semente (reprodutibilidade)")
+    args = parser.parse_args()
+    
+    config = NetworkConfig(
+        nodes=args.nodes,
+        topology=args.topology,
+        degree=args.degree,
+        latency=args.latency,
+        jitter=args.jitter,
+        bandwidth=args.bandwidth,
+        loss=args.loss,
+        discovery=args.discovery,
+        seed=args.seed,
+    )
+    workload = Workload(
+        duration=args.duration,
+        tx_rate=args.tx_rate,
+        block_interval=args.block_interval,
+        miners=args.miners,
+    )
+    
+    print(Simulator(config, workload).run().format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Módulo de Snapshot do Livro-Razão
+"""
+
+import hashlib
+import hmac
+import json
+import os
+from typing import Any
+
+from .block import Block, BlockHeader
+
+
+class LedgerSnapshot:
+    """
+    Saldos de todos os endereços em uma determinada altura da cadeia.
+    
+    Usado no modo de poda: os blocos antigos são descartados e os saldos
+    confirmados até a altura podada passam a vir deste snapshot.
+    """
+    
+    def __init__(
+        self,
+        height: int = -1,
+        block_hash: str = "",
+        balances: dict[str, float] | None = None,
+    ):
+        self.height = height  # Último bloco incorporado (-1 = nenhum)
+        self.block_hash = block_hash
+        self.balances: dict[str, float] = balances or {}
+    
+    def apply_block(self, block: Block):
+        """Incorpora as transações do próximo bloco ao snapshot."""
+        if block.index != self.height + 1:
+            raise ValueError("Bloco fora de ordem para o snapshot")
+        
+        for tx in block.transactions:
+            self.balances[tx.destino] = self.balances.get(tx.destino, 0.0) + tx.valor
+            self.balances[tx.origem] = self.balances.get(tx.origem, 0.0) - tx.valor
+        
+        self.height = block.index
+        self.block_hash = block.hash
+    
+    def balance(self, address: str) -> float:
+        """Saldo de um endereço na altura do snapshot."""
+        return self.balances.get(address, 0.0)
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Converte snapshot para dicionário (serialização JSON)."""
+        return {
+            "height": self.height,
+            "block_hash": self.block_hash,
+            "balances": self.balances,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LedgerSnapshot":
+        """Cria snapshot a partir de dicionário."""
+        return cls(
+            height=data["height"],
+            block_hash=data["block_hash"],
+            balances=dict(data["balances"]),
+        )
+
+
+class ChainSnapshot:
+    """
+    Estado da cadeia para inicialização rápida de novos nós.
+    
+    Contém os saldos (LedgerSnapshot) na altura base, os cabeçalhos de
+    todos os blocos até a base e os blocos completos recentes acima dela.
+    O conteúdo é protegido por um digest SHA-256 e, opcionalmente,
+    assinado com HMAC-SHA256 usando uma chave compartilhada.
+    
+    Sem assinatura, o digest é calculado pelo próprio receptor e não
+    autentica nada: os saldos são aceitos por confiança no peer até o
+    histórico ser verificado (HistoryVerifier).
+    """
+    
+    def __init__(
+        self,
+        ledger: LedgerSnapshot,
+        headers: list[BlockHeader],
+        blocks: list[Block],
+        signature: str = "",
+    ):
+        self.ledger = ledger
+        self.headers = headers
+        self.blocks = blocks
+        self.signature = signature
+    
+    @property
+    def base_height(self) -> int:
+        """Altura do último bloco incorporado aos saldos."""
+        return self.ledger.height
+    
+    @property
+    def tip_height(self) -> int:
+        """Altura do último bloco do snapshot."""
+        return self.base_height + len(self.blocks)
+    
+    def _content(self) -> dict[str, Any]:
+        return {
+            "ledger": self.ledger.to_dict(),
+            "headers": [header.to_dict() for header in self.headers],
+            "blocks": [block.to_dict() for block in self.blocks],
+        }
+    
+    def digest(self) -> str:
+        """Calcula o digest SHA-256 do conteúdo do snapshot."""
+        content = json.dumps(self._content(), sort_keys=True)
+        return hashlib.sha256(content.encode()).hexdigest()
+    
+    def sign(self, key: str):
+        """Assina o snapshot com HMAC-SHA256 (chave compartilhada)."""
+        self.signature = self._hmac(key, self.digest())
+    
+    @staticmethod
+    def _hmac(key: str, digest: str) -> str:
+        return hmac.new(key.encode(), digest.encode(), hashlib.sha256).hexdigest()
+    
+    def verify(self, difficulty: str, key: str | None = None) -> bool:
+        """
+        Verifica a consistência do snapshot.
+        
+        Valida:
+        - Assinatura (se uma chave for informada)
+        - Bloco gênesis, encadeamento e Proof of Work dos cabeçalhos
+        - Saldos correspondentes ao último cabeçalho
+        - Encadeamento e hash dos blocos recentes
+        
+        O hash de um cabeçalho cobre as transações do bloco, que não vêm no
+        snapshot, então não pode ser recalculado aqui: para os cabeçalhos
+        só se confere o encadeamento e o prefixo de Proof of Work do hash
+        informado. Os hashes são conferidos pelo HistoryVerifier.
+        """
+        if key is not None:
+            expected = self._hmac(key, self.digest())
+            if not hmac.compare_digest(self.signature, expected):
+                return False
+        
+        if len(self.headers) != self.base_height + 1:
+            return False
+        if self.headers[0].hash != Block.create_genesis().hash:
+            return False
+        if self.ledger.block_hash != self.headers[-1].hash:
+            return False
+        
+        previous = self.headers[0]
+        for header in self.headers[1:]:
+            if header.index != previous.index + 1:
+                return False
+            if header.previous_hash != previous.hash:
+                return False
+            if not header.is_valid_hash(difficulty):
+                return False
+            previous = header
+        
+        for block in self.blocks:
+            if block.index != previous.index + 1:
+                return False
+            if block.previous_hash != previous.hash:
+                return False
+            if block.hash != block.calculate_hash() or not block.is_valid_hash(difficulty):
+                return False
+            previous = block
+        
+        return True
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Converte snapshot para dicionário (serialização JSON)."""
+        data = self._content()
+        data["digest"] = self.digest()
+        data["signature"] = self.signature
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ChainSnapshot":
+        """Cria snapshot a partir de dicionário, conferindo o digest."""
+        snapshot = cls(
+            ledger=LedgerSnapshot.from_dict(data["ledger"]),
+            headers=[BlockHeader.from_dict(h) for h in data["headers"]],
+            blocks=[Block.from_dict(b) for b in data["blocks"]],
+            signature=data.get("signature", ""),
+        )
+        if snapshot.digest() != data["digest"]:
+            raise ValueError("Digest do snapshot não confere")
+        return snapshot
+    
+    def save(self, path: str):
+        """Grava o snapshot em disco de forma atômica."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path: str) -> "ChainSnapshot":
+        """Carrega um snapshot gravado em disco."""
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+class HistoryVerifier:
+    """
+    Verifica em lotes o histórico anterior a um snapshot.
+    
+    Cada bloco recebido deve ter o hash do cabeçalho correspondente; ao
+    final, os saldos recalculados devem ser iguais aos do snapshot.
+    """
+    
+    def __init__(self, snapshot: ChainSnapshot):
+        self.snapshot = snapshot
+        self.ledger = LedgerSnapshot()
+    
+    @property
+    def next_height(self) -> int:
+        """Próxima altura esperada."""
+        return self.ledger.height + 1
+    
+    @property
+    def complete(self) -> bool:
+        """Indica se todo o histórico até a base já foi verificado."""
+        return self.ledger.height >= self.snapshot.base_height
+    
+    def feed(self, blocks: list[Block]) -> bool:
+        """
+        Verifica e incorpora um lote de blocos consecutivos.
+        
+        O lote inteiro é validado antes de ser incorporado; retorna False
+        (sem alterar o estado) se algum bloco não confere.
+        """
+        height = self.next_height
+        for block in blocks:
+            if block.index != height or height > self.snapshot.base_height:
+                return False
+            header = self.snapshot.headers[height]
+            if block.hash != header.hash or block.calculate_hash() != block.hash:
+                return False
+            height += 1
+        
+        for block in blocks:
+            self.ledger.apply_block(block)
+        return True
+    
+    def matches(self) -> bool:
+        """Compara os saldos recalculados com os do snapshot."""
+        return (
+            self.complete
+            and self.ledger.block_hash == self.snapshot.ledger.block_hash
+            and self.ledger.balances == self.snapshot.ledger.balances
+        )
@@ -0,0 +1,325 @@
+"""
+Módulo de Sincronização Paralela (download de blocos de vários peers)
+"""
+
+import heapq
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .block import Block, BlockHeader, LazyBlock
+from .blockchain import Blockchain
+from .protocol import Protocol, MessageType
+
+if TYPE_CHECKING:
+    from .node import Node
+
+
+@dataclass
+class PeerStats:
+    """Desempenho observado de um peer durante o download de blocos."""
+    latency: float = 0.0     # Média móvel do tempo por requisição (s)
+    throughput: float = 0.0  # Média móvel de blocos por segundo
+    requests: int = 0
+    failures: int = 0
+    
+    SMOOTHING = 0.3
+    
+    def record(self, blocks: int, elapsed: float):
+        """Registra uma requisição bem-sucedida."""
+        rate = blocks / elapsed if elapsed > 0 else float(blocks)
+        if self.requests == 0:
+            self.latency, self.throughput = elapsed, rate
+        else:
+            self.latency += self.SMOOTHING * (elapsed - self.latency)
+            self.throughput += self.SMOOTHING * (rate - self.throughput)
+        self.requests += 1
+    
+    def record_failure(self):
+        """Registra uma requisição que falhou, expirou ou veio incompleta."""
+        self.failures += 1
+        self.throughput *= 1 - self.SMOOTHING
+
+
+class SyncScheduler:
+    """
+    Sincroniza a cadeia baixando faixas de blocos de todos os peers em paralelo.
+    
+    Fluxo:
+    1. Consulta os cabeçalhos recentes de todos os peers em paralelo
+    2. Escolhe o peer com a cadeia mais longa e baixa seus cabeçalhos
+       a partir do ponto de divergência com a cadeia local
+    3. Divide as alturas faltantes em faixas; cada peer pede uma nova
+       faixa ao terminar a anterior (uma por vez), então a divisão só
+       acompanha a velocidade dos peers quando há mais faixas que peers
+    4. Faixas paradas há mais de STALL_TIMEOUT são reatribuídas
+    5. Blocos que chegam fora de ordem ficam em um buffer e são conectados
+       à cadeia em ordem; alturas que a cadeia já tem (mesmo hash) são
+       puladas
+    """
+    
+    RANGE_SIZE = 50
+    STALL_TIMEOUT = 5.0
+    MAX_FAILURES = 3
+    HEADER_LOOKBACK = 10
+    WINDOW = 1000  # Máximo de alturas à frente da próxima a conectar
+    
+    def __init__(self, node: "Node", stats: dict[str, PeerStats]):
+        self.node = node
+        self.blockchain = node.blockchain
+        self.stats = stats
+        self.logger = node.logger
+        
+        self._condition = threading.Condition()
+        self._pending: list[tuple[int, int]] = []  # Heap de faixas (início, fim)
+        self._in_flight: dict[tuple[int, int], tuple[str, float]] = {}
+        self._buffer: dict[int, Block] = {}
+        self._headers: dict[int, BlockHeader] = {}
+        self._next_height = 0
+        self._target = 0
+        self._active_workers = 0
+        self._done = False
+    
+    def run(self) -> bool | None:
+        """
+        Executa a sincronização.
+        
+        Returns:
+            True se a cadeia avançou, False se não havia o que baixar ou a
+            sincronização falhou, None se nenhum peer suporta download por
+            faixas ou a divergência é anterior à janela consultada (o
+            chamador deve usar a sincronização pela cadeia completa).
+        """
+        probes = self._probe_peers()
+        if not probes:
+            return None
+        
+        best = max(probes, key=lambda peer: probes[peer][1])
+        best_headers, best_tip = probes[best]
+        if best_tip <= len(self.blockchain.chain) - 1:
+            return False
+        
+        fork = self._find_fork(best_headers)
+        if fork is None:
+            return None
+        
+        if not self._download_headers(best, best_headers, fork, best_tip):
+            return False
+        
+        self._next_height = fork + 1
+        self._target = best_tip
+        for start in range(fork + 1, best_tip + 1, self.RANGE_SIZE):
+            heapq.heappush(self._pending, (start, min(start + self.RANGE_SIZE, best_tip + 1)))
+        
+        candidates = [peer for peer, (_, tip) in probes.items() if tip > fork]
+        candidates.sort(key=lambda peer: self.stats.get(peer, PeerStats()).throughput, reverse=True)
+        self.logger.info(
+            f"Sincronizando #{fork + 1}..#{best_tip} de {len(candidates)} peers em paralelo"
+        )
+        return self._download_blocks(candidates, fork)
+    
+    def _probe_peers(self) -> dict[str, tuple[list[BlockHeader], int]]:
+        """Consulta em paralelo os cabeçalhos recentes e o topo de cada peer."""
+        start = max(0, len(self.blockchain.chain) - 1 - self.HEADER_LOOKBACK)
+        results: dict[str, tuple[list[BlockHeader], int]] = {}
+        
+        def probe(peer: str):
+            request = Protocol.request_headers(start, start + self.node.MAX_HEADERS_PER_MESSAGE)
+            response = self.node._send_message(peer, request)
+            if response and response.type == MessageType.RESPONSE_HEADERS:
+                headers = [BlockHeader.from_dict(h) for h in response.payload["headers"]]
+                results[peer] = (headers, response.payload["tip"])
+        
+        threads = [threading.Thread(target=probe, args=(peer,)) for peer in list(self.node.peers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+    
+    def _find_fork(self, headers: list[BlockHeader]) -> int | None:
+        """Altura do último bloco em comum com os cabeçalhos do peer."""
+        chain = self.blockchain.chain
+        fork = None
+        for header in headers:
+            if header.index < len(chain) and chain[header.index].hash == header.hash:
+                fork = header.index
+            else:
+                break
+        return fork
+    
+    def _download_headers(
+        self, peer: str, headers: list[BlockHeader], fork: int, tip: int
+    ) -> bool:
+        """Baixa e valida os cabeçalhos do peer de fork + 1 até o topo."""
+        previous = self.blockchain.chain[fork]
+        headers = [h for h in headers if h.index > fork]
+        
+        while True:
+            for header in headers:
+                if header.index != previous.index + 1 or header.previous_hash != previous.hash:
+                    self.logger.warning(f"Cabeçalhos inválidos de {peer}")
+                    return False
+                if not header.is_valid_hash(Blockchain.DIFFICULTY):
+                    self.logger.warning(f"Cabeçalho sem Proof of Work de {peer}")
+                    return False
+                self._headers[header.index] = header
+                previous = header
+            
+            if previous.index >= tip:
+                return True
+            
+            start = previous.index + 1
+            request = Protocol.request_headers(start, start + self.node.MAX_HEADERS_PER_MESSAGE)
+            response = self.node._send_message(peer, request)
+            if not response or response.type != MessageType.RESPONSE_HEADERS:
+                return False
+            headers = [BlockHeader.from_dict(h) for h in response.payload["headers"]]
+            if not headers:
+                return False
+    
+    def _download_blocks(self, peers: list[str], fork: int) -> bool:
+        """Distribui as faixas entre os peers e conecta os blocos em ordem."""
+        reorg = fork < len(self.blockchain.chain) - 1
+        downloaded: list[Block] = []
+        
+        self._active_workers = len(peers)
+        for peer in peers:
+            worker = threading.Thread(target=self._worker, args=(peer,))
+            worker.daemon = True
+            worker.start()
+        
+        with self._condition:
+            while self._next_height <= self._target:
+                while self._next_height in self._buffer:
+                    block = self._buffer.pop(self._next_height)
+                    if reorg:
+                        downloaded.append(block)
+                    elif self._has_block(block):
+                        pass  # Já conectado por outro caminho (NEW_BLOCK durante o download)
+                    elif not self.blockchain.add_block(block):
+                        self.logger.warning(f"Bloco #{block.index} rejeitado na sincronização")
+                        self._finish()
+                        return False
+                    self._next_height += 1
+                
+                if self._next_height > self._target:
+                    break
+                if self._active_workers == 0:
+                    self.logger.warning(f"Sincronização parou em #{self._next_height}")
+                    self._finish()
+                    return self._next_height > fork + 1 and not reorg
+                
+                self._condition.notify_all()
+                self._condition.wait(timeout=0.5)
+            
+            self._finish()
+        
+        if reorg:
+            new_chain = self.blockchain.chain[:fork + 1] + downloaded
+            if not self.blockchain.replace_chain(new_chain):
+                self.logger.warning("Cadeia baixada recusada na reorganização")
+                return False
+        
+        self.logger.info(f"Sincronização concluída até #{self._target}")
+        return True
+    
+    def _has_block(self, block: Block) -> bool:
+        """Verifica se a cadeia local já tem este bloco na mesma altura."""
+        chain = self.blockchain.chain
+        return block.index < len(chain) and chain[block.index].hash == block.hash
+    
+    def _finish(self):
+        """Sinaliza aos workers que a sincronização terminou (com lock)."""
+        self._done = True
+        self._condition.notify_all()
+    
+    def _worker(self, peer: str):
+        """Baixa faixas de um peer até não haver mais trabalho."""
+        stats = self.stats.setdefault(peer, PeerStats())
+        failures = 0
+        try:
+            while True:
+                block_range = self._next_range(peer)
+                if block_range is None:
+                    return
+                
+                start, end = block_range
+                started = time.perf_counter()
+                response = self.node._send_message(peer, Protocol.request_blocks(start, end))
+                elapsed = time.perf_counter() - started
+                
+                blocks = self._validate_response(response, start, end)
+                with self._condition:
+                    self._in_flight.pop(block_range, None)
+                    for block in blocks:
+                        if block.index >= self._next_height:
+                            self._buffer.setdefault(block.index, block)
+                    
+                    if len(blocks) < end - start:
+                        missing = start + len(blocks)
+                        if missing >= self._next_height and not self._is_covered(missing, end):
+                            heapq.heappush(self._pending, (missing, end))
+                    self._condition.notify_all()
+                
+                if blocks:
+                    stats.record(len(blocks), elapsed)
+                if len(blocks) < end - start:
+                    stats.record_failure()
+                    failures += 1
+                    if failures >= self.MAX_FAILURES:
+                        self.logger.warning(f"Peer {peer} descartado da sincronização")
+                        return
+        finally:
+            with self._condition:
+                self._active_workers -= 1
+                self._condition.notify_all()
+    
+    def _next_range(self, peer: str) -> tuple[int, int] | None:
+        """Próxima faixa para o peer: pendente, ou uma faixa parada de outro peer."""
+        with self._condition:
+            while not self._done:
+                if self._pending and self._pending[0][0] <= self._next_height + self.WINDOW:
+                    block_range = heapq.heappop(self._pending)
+                    if block_range[1] <= self._next_height:
+                        continue  # Já conectada (entregue por outro peer)
+                    self._in_flight[block_range] = (peer, time.perf_counter())
+                    return block_range
+                
+                stalled = self._stalled_range(peer)
+                if stalled is not None:
+                    self._in_flight[stalled] = (peer, time.perf_counter())
+                    return stalled
+                
+                self._condition.wait(timeout=0.5)
+        return None
+    
+    def _stalled_range(self, peer: str) -> tuple[int, int] | None:
+        """Faixa mais antiga de outro peer em andamento há mais de STALL_TIMEOUT."""
+        now = time.perf_counter()
+        for block_range, (owner, started) in sorted(self._in_flight.items()):
+            if owner != peer and now - started > self.STALL_TIMEOUT:
+                if block_range[1] > self._next_height:
+                    return block_range
+        return None
+    
+    def _is_covered(self, start: int, end: int) -> bool:
+        """Verifica se todas as alturas da faixa já estão no buffer."""
+        return all(height in self._buffer for height in range(start, end))
+    
+    def _validate_response(self, response, start: int, end: int) -> list[Block]:
+        """Mantém o prefixo de blocos consecutivos que confere com os cabeçalhos."""
+        if not response or response.type != MessageType.RESPONSE_BLOCKS:
+            return []
+        
+        blocks = []
+        for height, block_data in zip(range(start, end), response.payload["blocks"]):
+            block = LazyBlock.from_dict(block_data)
+            header = self._headers.get(height)
+            if header is None or block.index != height or block.hash != header.hash:
+                break
+            if block.calculate_hash() != block.hash:
+                break
+            blocks.append(block)
+        return blocks
@@ -2,13 +2,15 @@
 Módulo de Transações
 """
 
+import hashlib
+import json
 import uuid
 import time
-from dataclasses import dataclass, field
 from typing import Any
 
+from .compact import intern_address, pack_id, unpack_id
+
 
-@dataclass
 class Transaction:
     """
     Representa uma transação na blockchain.
@@ -19,19 +21,50 @@ class Transaction:
     - destino: endereço de destino  
     - valor: quantidade transferida
     - timestamp: momento da criação
+    
+    Representação compacta: classe com __slots__ (sem __dict__), id UUID
+    guardado em 16 bytes e endereços internados.
     """
-    origem: str
-    destino: str
-    valor: float
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    timestamp: float = field(default_factory=time.time)
-    
-    def __post_init__(self):
-        """Valida a transação após criação."""
-        if self.valor <= 0:
+    
+    __slots__ = ("_id", "origem", "destino", "valor", "timestamp")
+    
+    def __init__(
+        self,
+        origem: str,
+        destino: str,
+        valor: float,
+        id: str | None = None,
+        timestamp: float | None = None,
+    ):
+        if valor <= 0:
             raise ValueError("Valor da transação deve ser positivo")
-        if not self.origem or not self.destino:
+        if not origem or not destino:
             raise ValueError("Origem e destino são obrigatórios")
+        
+        self.origem = intern_address(origem)
+        self.destino = intern_address(destino)
+        self.valor = valor
+        self._id = pack_id(id) if id is not None else uuid.uuid4().bytes
+        self.timestamp = time.time() if timestamp is None else timestamp
+    
+    @property
+    def id(self) -> str:
+        """Identificador único (str)."""
+        return unpack_id(self._id)
+    
+    @id.setter
+    def id(self, value: str):
+        self._id = pack_id(value)
+    
+    def calculate_hash(self) -> str:
+        """Calcula o hash SHA-256 da transação (folha da árvore de Merkle)."""
+        return self.hash_dict(self.to_dict())
+    
+    @staticmethod
+    def hash_dict(data: dict[str, Any]) -> str:
+        """Hash SHA-256 de uma transação já em forma de dicionário."""
+        tx_string = json.dumps(data, sort_keys=True)
+        return hashlib.sha256(tx_string.encode()).hexdigest()
     
     def to_dict(self) -> dict[str, Any]:
         """Converte transação para dicionário (serialização JSON)."""
@@ -55,9 +88,15 @@ class Transaction:
         )
     
     def __hash__(self):
-        return hash(self.id)
+        return hash(self._id)
     
     def __eq__(self, other):
         if isinstance(other, Transaction):
-            return self.id == other.id
+            return self._id == other._id
         return False
+    
+    def __repr__(self) -> str:
+        return (
+            f"Transaction(origem={self.origem!r}, destino={self.destino!r}, "
+            f"valor={self.valor!r}, id={self.id!r}, timestamp={self.timestamp!r})"
+        )
@@ -0,0 +1,266 @@
+"""
+Módulo de Transporte (TCP real ou rede simulada em memória)
+"""
+
+import random
+import socket
+import threading
+import time
+from collections import deque
+from typing import Callable, Protocol as Interface
+
+
+class Connection(Interface):
+    """Conexão no estilo socket usada pelo nó."""
+    
+    def settimeout(self, timeout: float | None): ...
+    def recv(self, size: int) -> bytes: ...
+    def sendall(self, data: bytes): ...
+    def close(self): ...
+    def __enter__(self) -> "Connection": ...
+    def __exit__(self, *exc) -> None: ...
+
+
+class Listener(Interface):
+    """Ponto de escuta que aceita conexões recebidas."""
+    
+    def accept(self) -> tuple[Connection, tuple]: ...
+    def close(self): ...
+
+
+class TcpTransport:
+    """Transporte padrão: sockets TCP reais."""
+    
+    BACKLOG = 10
+    
+    def listen(self, host: str, port: int) -> socket.socket:
+        """Abre o socket servidor em host:port."""
+        server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server_socket.bind((host, port))
+        server_socket.listen(self.BACKLOG)
+        return server_socket
+    
+    def connect(self, address: str, timeout: float, source: str = "") -> socket.socket:
+        """Abre uma conexão TCP com address (host:porta)."""
+        host, port = address.split(":")
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect((host, int(port)))
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+
+class _Pipe:
+    """Um sentido de uma conexão em memória; cada trecho só fica legível após o atraso."""
+    
+    def __init__(self):
+        self._chunks: deque[tuple[float, bytes]] = deque()  # (pronto em, dados)
+        self._condition = threading.Condition()
+        self._closed = False
+    
+    def write(self, data: bytes, delay: float):
+        """Enfileira dados que ficam legíveis após delay segundos."""
+        with self._condition:
+            if self._closed:
+                raise BrokenPipeError("Conexão fechada")
+            ready_at = time.monotonic() + delay
+            # Entrega em ordem: um trecho não ultrapassa o anterior
+            if self._chunks:
+                ready_at = max(ready_at, self._chunks[-1][0])
+            self._chunks.append((ready_at, data))
+            self._condition.notify_all()
+    
+    def read(self, size: int, timeout: float | None) -> bytes:
+        """Lê até size bytes já entregues (b"" se fechado, TimeoutError se expirar)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if self._chunks and self._chunks[0][0] <= now:
+                    ready_at, data = self._chunks.popleft()
+                    if len(data) > size:
+                        self._chunks.appendleft((ready_at, data[size:]))
+                        data = data[:size]
+                    return data
+                if self._closed and not self._chunks:
+                    return b""
+                
+                waits = []
+                if self._chunks:
+                    waits.append(self._chunks[0][0] - now)
+                if deadline is not None:
+                    if now >= deadline:
+                        raise TimeoutError("timed out")
+                    waits.append(deadline - now)
+                self._condition.wait(min(waits) if waits else None)
+    
+    def close(self):
+        """Fecha o sentido; dados já enviados ainda podem ser lidos."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+class MemoryConnection:
+    """Extremidade de uma conexão em memória (interface de socket)."""
+    
+    def __init__(self, inbound: _Pipe, outbound: _Pipe, delay: Callable[[int], float]):
+        self._inbound = inbound
+        self._outbound = outbound
+        self._delay = delay
+        self._timeout: float | None = None
+    
+    def settimeout(self, timeout: float | None):
+        """Define o tempo máximo de espera em recv()."""
+        self._timeout = timeout
+    
+    def recv(self, size: int) -> bytes:
+        """Lê até size bytes recebidos."""
+        return self._inbound.read(size, self._timeout)
+    
+    def sendall(self, data: bytes):
+        """Envia dados (entregues após o atraso do enlace)."""
+        self._outbound.write(bytes(data), self._delay(len(data)))
+    
+    def close(self):
+        """Fecha a conexão nos dois sentidos."""
+        self._outbound.close()
+        self._inbound.close()
+    
+    def __enter__(self) -> "MemoryConnection":
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MemoryListener:
+    """Ponto de escuta de um nó na rede em memória."""
+    
+    def __init__(self, transport: "InMemoryTransport", address: str):
+        self.transport = transport
+        self.address = address
+        self._pending: deque[tuple[MemoryConnection, tuple]] = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+    
+    def accept(self) -> tuple[MemoryConnection, tuple]:
+        """Aguarda a próxima conexão (OSError se o listener for fechado)."""
+        with self._condition:
+            while not self._pending and not self._closed:
+                self._condition.wait()
+            if self._closed:
+                raise OSError("Listener fechado")
+            return self._pending.popleft()
+    
+    def close(self):
+        """Para de aceitar conexões e sai da rede simulada."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self.transport._unregister(self.address)
+    
+    def _enqueue(self, connection: MemoryConnection, source: str):
+        """Entrega uma nova conexão ao listener."""
+        with self._condition:
+            if self._closed:
+                raise ConnectionRefusedError(f"{self.address} não está escutando")
+            host, _, port = source.rpartition(":")
+            self._pending.append((connection, (host, int(port) if port.isdigit() else 0)))
+            self._condition.notify_all()
+
+
+class InMemoryTransport:
+    """
+    Rede simulada em memória compartilhada por vários nós de um processo.
+    
+    Cada envio chega ao destino após latency (± jitter) mais o tempo de
+    transmissão (bytes / bandwidth). A banda é por enlace (origem ->
+    destino): envios simultâneos pelo mesmo enlace, mesmo em conexões
+    diferentes, esperam na fila a transmissão dos anteriores. Com
+    probabilidade loss a conexão é recusada, como um peer inalcançável; o
+    remetente vê o erro na hora.
+    latency_fn(origem, destino) permite latências por enlace (topologias
+    com regiões). Todas as métricas de tráfego ficam em stats.
+    """
+    
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        bandwidth: float | None = None,
+        loss: float = 0.0,
+        seed: int | None = None,
+        latency_fn: Callable[[str, str], float] | None = None,
+    ):
+        if not 0 <= loss < 1:
+            raise ValueError("Perda deve estar em [0, 1)")
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.loss = loss
+        self.latency_fn = latency_fn
+        
+        self._random = random.Random(seed)
+        self._listeners: dict[str, MemoryListener] = {}
+        self._link_free_at: dict[tuple[str, str], float] = {}  # Fim da transmissão em curso
+        self._lock = threading.Lock()
+        self.stats = {"connections": 0, "bytes": 0, "lost": 0, "refused": 0}
+    
+    def listen(self, host: str, port: int) -> MemoryListener:
+        """Registra o nó em host:port na rede simulada."""
+        address = f"{host}:{port}"
+        with self._lock:
+            if address in self._listeners:
+                raise OSError(f"Endereço em uso: {address}")
+            listener = self._listeners[address] = MemoryListener(self, address)
+        return listener
+    
+    def connect(self, address: str, timeout: float, source: str = "") -> MemoryConnection:
+        """Abre uma conexão simulada de source para address."""
+        with self._lock:
+            listener = self._listeners.get(address)
+            lost = self._random.random() < self.loss
+            self.stats["connections"] += 1
+            if listener is None:
+                self.stats["refused"] += 1
+            elif lost:
+                self.stats["lost"] += 1
+        if listener is None:
+            raise ConnectionRefusedError(f"{address} não está escutando")
+        if lost:
+            raise ConnectionResetError(f"Conexão com {address} perdida")
+        
+        to_server, to_client = _Pipe(), _Pipe()
+        client = MemoryConnection(to_client, to_server, lambda size: self._delay(source, address, size))
+        server = MemoryConnection(to_server, to_client, lambda size: self._delay(address, source, size))
+        client.settimeout(timeout)
+        listener._enqueue(server, source)
+        return client
+    
+    def _delay(self, source: str, destination: str, size: int) -> float:
+        """Atraso de entrega de size bytes no enlace source -> destination."""
+        if self.latency_fn is not None:
+            latency = self.latency_fn(source, destination)
+        else:
+            latency = self.latency
+        with self._lock:
+            self.stats["bytes"] += size
+            if self.jitter:
+                latency += self._random.uniform(-self.jitter, self.jitter)
+            if self.bandwidth:
+                now = time.monotonic()
+                link = (source, destination)
+                finish = max(now, self._link_free_at.get(link, now)) + size / self.bandwidth
+                self._link_free_at[link] = finish
+                latency = max(latency, 0.0) + finish - now
+        return max(latency, 0.0)
+    
+    def _unregister(self, address: str):
+        """Remove o listener de address da rede."""
+        with self._lock:
+            self._listeners.pop(address, None)